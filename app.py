@@ -4,7 +4,8 @@ import streamlit as st
 from scraping.noon_scraper import scrape_noon_food
 from scraping.talabat_scraper import scrape_talabat
 from processing.comparator import compare_restaurants
-from exporting.google_sheets_exporter import export_to_google_sheets
+from processing.match_store import MatchStore
+from exporting.google_sheets_exporter import export_sheets
 
 def main():
     st.set_page_config(page_title="Restaurant Listings Comparator", layout="wide")
@@ -39,12 +40,15 @@ def main():
             st.stop()
         
         with st.spinner("Comparing data..."):
-            comparison_results = compare_restaurants(noon_data, talabat_data)
+            with MatchStore() as store:
+                comparison_results = compare_restaurants(noon_data, talabat_data, store=store)
         
         with st.spinner("Exporting results to Google Sheets..."):
-            export_to_google_sheets(comparison_results['matched'], 'Matched')
-            export_to_google_sheets(comparison_results['noon_only'], 'Noon Only')
-            export_to_google_sheets(comparison_results['talabat_only'], 'Talabat Only')
+            export_sheets({
+                'Matched': comparison_results['matched'],
+                'Noon Only': comparison_results['noon_only'],
+                'Talabat Only': comparison_results['talabat_only']
+            })
         
         st.success("✅ Comparison complete and results exported to Google Sheets.")
         
@@ -0,0 +1,263 @@
+# batch_scrape.py
+
+"""
+Headless batch scraping over many areas.
+
+Examples:
+    python batch_scrape.py --emirate Fujairah
+    python batch_scrape.py kalba khorfakkan --platforms talabat --out results
+    python batch_scrape.py --emirate all --noon-workers 2 --talabat-workers 6
+    python batch_scrape.py --emirate Sharjah --format parquet --combine
+    python batch_scrape.py --emirate Fujairah --profile lean
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from itertools import chain
+
+from config.config import BROWSER_PROFILE
+from exporting.file_exporter import EXTENSIONS, FORMATS, RESULT_FIELDS, read_records, write_records, write_xlsx
+from scraping.area_mapping import AreaMapping
+
+PLATFORMS = ('noon', 'talabat')
+
+
+def canonical_areas(areas):
+    """
+    Resolve area inputs to catalogue keys, dropping repeats but keeping order.
+
+    "Al Faseel", "al-faseel" and "al_faseel" all become one 'al_faseel' job.
+    Unknown areas keep their normalised input as key, so their jobs still
+    report the failure.
+    """
+    keys = []
+    for area in areas:
+        area_info = AreaMapping.get_area_info(area)
+        if not area_info['is_valid']:
+            logging.warning(f"Unknown area: {area}")
+        keys.append(area_info['key'])
+    return list(dict.fromkeys(keys))
+
+
+def write_results(records, path, fmt='csv'):
+    """Write one job's records as CSV, Parquet or XLSX."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    write_records(records, path, fmt, fields=RESULT_FIELDS)
+
+
+def combine_results(summaries, out_dir, fmt='csv'):
+    """
+    Stream every job's output file into one dump, without loading them whole.
+
+    CSV and Parquet dumps are one table; an XLSX dump gets one sheet per platform.
+
+    Returns:
+        str: Path of the combined file, or None when no job produced output.
+    """
+    paths = {
+        platform: [s['path'] for s in sorted(summaries, key=lambda s: s['area'])
+                   if s['platform'] == platform and s['path']]
+        for platform in PLATFORMS
+    }
+    if not any(paths.values()):
+        return None
+
+    path = os.path.join(out_dir, f"all_restaurants{EXTENSIONS[fmt]}")
+    if fmt == 'xlsx':
+        write_xlsx({
+            platform.capitalize(): chain.from_iterable(read_records(p) for p in platform_paths)
+            for platform, platform_paths in paths.items() if platform_paths
+        }, path)
+    else:
+        records = chain.from_iterable(read_records(p) for platform_paths in paths.values() for p in platform_paths)
+        write_records(records, path, fmt, fields=RESULT_FIELDS)
+    return path
+
+
+def run_job(area, platform, out_dir, max_pages=26, talabat_engine='http', talabat_concurrency=1, fmt='csv',
+            profile=BROWSER_PROFILE):
+    """
+    Scrape one (area, platform) pair in a worker process and write its results.
+
+    The area is resolved to its catalogue key, which names the output file.
+
+    Returns:
+        dict: Job summary with 'area', 'platform', 'restaurants', 'seconds',
+            'path', 'stats' and 'error' (None on success).
+    """
+    # Imported here so each worker process starts its own driver pool
+    from scraping.noon_scraper import scrape_noon_food
+    from scraping.talabat_scraper import scrape_talabat
+
+    started = time.monotonic()
+    area = AreaMapping.get_area_info(area)['key']
+    stats = {}
+    summary = {'area': area, 'platform': platform, 'restaurants': 0, 'path': None, 'error': None}
+
+    try:
+        if platform == 'noon':
+            records = scrape_noon_food(area, max_pages=max_pages, stats=stats, profile=profile)
+        else:
+            records = scrape_talabat(
+                area, max_pages=max_pages, engine=talabat_engine,
+                concurrency=talabat_concurrency, stats=stats, profile=profile
+            )
+
+        path = os.path.join(out_dir, platform, f"{area}{EXTENSIONS[fmt]}")
+        write_results(records, path, fmt)
+        summary['restaurants'] = len(records)
+        summary['path'] = path
+        if stats.get('error'):
+            summary['error'] = stats['error']
+        elif not records:
+            summary['error'] = 'no restaurants scraped'
+    except Exception as e:
+        summary['error'] = str(e)
+
+    summary['seconds'] = time.monotonic() - started
+    summary['stats'] = {key: value for key, value in stats.items() if key in ('pages_fetched', 'pages_failed', 'bytes_transferred')}
+    return summary
+
+
+def run_batch(areas, platforms, out_dir, workers, max_pages=26, talabat_engine='http', talabat_concurrency=1,
+              fmt='csv', profile=BROWSER_PROFILE):
+    """
+    Run every (area, platform) job across one process pool per platform.
+
+    Args:
+        areas (list): Area keys to scrape, as returned by ``canonical_areas``.
+        platforms (list): Platforms to scrape, from ``PLATFORMS``.
+        out_dir (str): Directory receiving ``<platform>/<area>.<ext>`` files.
+        workers (dict): Maximum concurrent jobs per platform, which bounds the
+            load put on each site.
+        fmt (str): Output format, from ``exporting.file_exporter.FORMATS``.
+        profile (str): Browser profile, 'default' or 'lean'.
+
+    Returns:
+        list: Job summaries as returned by ``run_job``.
+    """
+    context = multiprocessing.get_context('spawn')
+    executors = {
+        platform: ProcessPoolExecutor(max_workers=workers[platform], mp_context=context)
+        for platform in platforms
+    }
+
+    summaries = []
+    try:
+        futures = {}
+        for area in areas:
+            for platform in platforms:
+                future = executors[platform].submit(
+                    run_job, area, platform, out_dir, max_pages, talabat_engine, talabat_concurrency, fmt, profile
+                )
+                futures[future] = (area, platform)
+
+        for future in as_completed(futures):
+            area, platform = futures[future]
+            try:
+                summary = future.result()
+            except Exception as e:
+                # The worker process itself died
+                summary = {'area': area, 'platform': platform, 'restaurants': 0,
+                           'seconds': 0.0, 'path': None, 'stats': {}, 'error': str(e)}
+            summaries.append(summary)
+
+            status = 'FAILED: ' + summary['error'] if summary['error'] else 'ok'
+            logging.info(
+                f"[{len(summaries)}/{len(futures)}] {platform} {area}: "
+                f"{summary['restaurants']} restaurants in {summary['seconds']:.1f}s ({status})"
+            )
+    finally:
+        for executor in executors.values():
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    return summaries
+
+
+def print_throughput(summaries, elapsed):
+    """Print areas/min, restaurants/s and the failed jobs of a batch run."""
+    areas = {summary['area'] for summary in summaries}
+    restaurants = sum(summary['restaurants'] for summary in summaries)
+    failures = [summary for summary in summaries if summary['error']]
+    minutes = elapsed / 60 if elapsed else 0
+
+    print("\n" + "=" * 50)
+    print(f"Jobs:            {len(summaries)} ({len(failures)} failed)")
+    print(f"Areas:           {len(areas)} in {elapsed:.1f}s")
+    print(f"Areas/min:       {len(areas) / minutes if minutes else 0:.2f}")
+    print(f"Restaurants:     {restaurants}")
+    print(f"Restaurants/s:   {restaurants / elapsed if elapsed else 0:.2f}")
+
+    for platform in PLATFORMS:
+        jobs = [summary for summary in summaries if summary['platform'] == platform]
+        if jobs:
+            busy = sum(summary['seconds'] for summary in jobs)
+            print(f"  {platform:<8} {len(jobs)} jobs, {sum(s['restaurants'] for s in jobs)} restaurants, "
+                  f"{busy / len(jobs):.1f}s per job")
+
+    if failures:
+        print("\nFailures:")
+        for summary in sorted(failures, key=lambda s: (s['platform'], s['area'])):
+            print(f"  {summary['platform']} {summary['area']}: {summary['error']}")
+    print("=" * 50)
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape many areas from Noon and Talabat in parallel.")
+    parser.add_argument('areas', nargs='*', help="Area keys or names, e.g. kalba al_faseel")
+    parser.add_argument('--emirate', help=f"Scrape every area of an emirate ({', '.join(AreaMapping.EMIRATES)} or 'all')")
+    parser.add_argument('--platforms', nargs='+', choices=PLATFORMS, default=list(PLATFORMS))
+    parser.add_argument('--out', default='batch_results', help="Output directory")
+    parser.add_argument('--max-pages', type=int, default=26)
+    parser.add_argument('--noon-workers', type=int, default=2, help="Concurrent Noon jobs")
+    parser.add_argument('--talabat-workers', type=int, default=4, help="Concurrent Talabat jobs")
+    parser.add_argument('--talabat-engine', choices=('http', 'selenium'), default='http')
+    parser.add_argument('--talabat-concurrency', type=int, default=1, help="Concurrent pages per Talabat job")
+    parser.add_argument('--format', choices=FORMATS, default='csv', help="Output file format")
+    parser.add_argument('--profile', choices=('default', 'lean'), default=BROWSER_PROFILE,
+                        help="Browser profile; 'lean' skips images, fonts and trackers")
+    parser.add_argument('--combine', action='store_true', help="Also write every job's results into one file")
+
+    args = parser.parse_args(argv)
+    if not args.areas and not args.emirate:
+        parser.error("give one or more areas or --emirate")
+    return args
+
+
+def main(argv=None):
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    args = parse_args(argv)
+
+    areas = list(args.areas)
+    if args.emirate:
+        areas += AreaMapping.get_emirate_areas(args.emirate)
+    areas = canonical_areas(areas)
+
+    workers = {'noon': args.noon_workers, 'talabat': args.talabat_workers}
+    logging.info(f"Scraping {len(areas)} area(s) on {', '.join(args.platforms)} into {args.out}")
+
+    started = time.monotonic()
+    summaries = run_batch(
+        areas, args.platforms, args.out, workers,
+        max_pages=args.max_pages,
+        talabat_engine=args.talabat_engine,
+        talabat_concurrency=args.talabat_concurrency,
+        fmt=args.format,
+        profile=args.profile
+    )
+    print_throughput(summaries, time.monotonic() - started)
+
+    if args.combine:
+        combined = combine_results(summaries, args.out, args.format)
+        if combined:
+            print(f"Combined results: {combined}")
+
+    return 1 if any(summary['error'] for summary in summaries) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,56 @@
 # config/config.py
 
+import os
+
 GOOGLE_SHEET_NAME = "Restaurant Comparison"
 CREDENTIALS_PATH = "credentials/google_sheets_credentials.json"
 
 # URLs or patterns can be added here if needed
+
+# Local cache directory for driver paths, sessions and results
+CACHE_DIR = os.environ.get("SCRAPER_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "scraper_t_n"))
+
+# Browser pool limits shared by all scrape runs in a process
+DRIVER_POOL_MAX_BROWSERS = 4
+DRIVER_MAX_PAGES = 50
+DRIVER_MAX_RSS_MB = 1500
+
+# 'default' loads pages fully; 'lean' (opt-in) skips images, media, fonts and trackers
+BROWSER_PROFILE = "default"
+BLOCK_CSS = False
+
+# How long a captured Noon delivery-location session is reused
+NOON_SESSION_TTL_SECONDS = 6 * 60 * 60
+
+# Distinct restaurant names kept in the normalization cache
+NAME_CACHE_SIZE = 65536
+
+# SQLite file holding match scores and review flags across runs
+MATCH_STORE_PATH = os.path.join(CACHE_DIR, "match_cache.sqlite3")
+# Pairs scoring below this are not written to the match store
+MATCH_STORE_MIN_SCORE = 70
+
+# Distinct offer strings kept parsed in memory
+OFFER_CACHE_SIZE = 50000
+
+# Streamlit terminal: entries kept on screen and minimum seconds between redraws
+LOG_MAX_ENTRIES = 500
+LOG_REFRESH_SECONDS = 0.25
+
+# Background scrape jobs shared by all Streamlit sessions
+JOB_MAX_WORKERS = 4
+JOB_RETENTION_SECONDS = 60 * 60
+JOB_POLL_SECONDS = 1.0
+
+# Scrape results shared across sessions, keyed by (area key, platform)
+RESULT_CACHE_TTL_SECONDS = 30 * 60
+RESULT_CACHE_MAX_ENTRIES = 200
+RESULT_CACHE_DIR = os.path.join(CACHE_DIR, "results")  # None keeps results in memory only
+
+# Records per batch when streaming exports (Parquet row groups, read-back chunks)
+EXPORT_CHUNK_SIZE = 5000
+
+# Google Sheets export: row-hash manifests of what was last written, and
+# the most cells sent in one batch update request
+SHEETS_MANIFEST_DIR = os.path.join(CACHE_DIR, "sheets_manifests")
+SHEETS_MAX_CELLS_PER_REQUEST = 50000
@@ -0,0 +1,277 @@
+# exporting/file_exporter.py
+
+import csv
+import io
+from itertools import chain, islice
+
+import pandas as pd
+import xlsxwriter
+
+from config.config import EXPORT_CHUNK_SIZE
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet export is unavailable without pyarrow
+    pa = pq = None
+
+FORMATS = ('csv', 'parquet', 'xlsx')
+EXTENSIONS = {'csv': '.csv', 'parquet': '.parquet', 'xlsx': '.xlsx'}
+MIME_TYPES = {
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+    'xlsx': 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+}
+RESULT_FIELDS = ['name', 'offer', 'platform', 'page']
+
+
+def _records(data):
+    """Iterate dict records from a list, generator or DataFrame without copying it whole."""
+    if isinstance(data, pd.DataFrame):
+        columns = list(data.columns)
+        return (dict(zip(columns, row)) for row in data.itertuples(index=False, name=None))
+    return iter(data)
+
+
+def _peek_fields(records, fields=None):
+    """Column names (from the first record unless given) and the untouched record stream."""
+    records = iter(records)
+    if fields is not None:
+        return list(fields), records
+    first = next(records, None)
+    if first is None:
+        return [], records
+    return list(first), chain([first], records)
+
+
+def _chunks(records, size):
+    while True:
+        chunk = list(islice(records, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def write_csv(records, target, fields=None):
+    """
+    Stream records into a CSV file, one row at a time.
+
+    Args:
+        records (iterable or DataFrame): Restaurant dicts.
+        target (str or file): Path or text buffer.
+        fields (list, optional): Columns; taken from the first record by default.
+
+    Returns:
+        int: Number of rows written.
+    """
+    fields, records = _peek_fields(_records(records), fields)
+    handle = open(target, 'w', newline='', encoding='utf-8') if isinstance(target, str) else target
+    try:
+        writer = csv.DictWriter(handle, fieldnames=fields, extrasaction='ignore')
+        writer.writeheader()
+        count = 0
+        for record in records:
+            writer.writerow(record)
+            count += 1
+        return count
+    finally:
+        if isinstance(target, str):
+            handle.close()
+
+
+def _parquet_schema(data, fields, first_chunk):
+    """
+    Arrow schema for a Parquet export.
+
+    Taken from the whole DataFrame's dtypes when one is given, otherwise
+    inferred from the first chunk. Columns with no values to infer from
+    (all None) are stored as strings rather than Arrow's null type, which
+    no later value could be cast to.
+    """
+    if isinstance(data, pd.DataFrame):
+        schema = pa.Schema.from_pandas(data[fields], preserve_index=False)
+    else:
+        schema = pa.schema([
+            (field, pa.array([record.get(field) for record in first_chunk], from_pandas=True).type) for field in fields
+        ])
+    return pa.schema([
+        pa.field(field.name, pa.string()) if pa.types.is_null(field.type) else field for field in schema
+    ]).remove_metadata()
+
+
+def _arrow_column(values, arrow_type):
+    """Convert one chunk's values to ``arrow_type``; NaN counts as missing."""
+    try:
+        return pa.array(values, type=arrow_type, from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # e.g. numbers in a column typed as strings
+        return pa.array(values, from_pandas=True).cast(arrow_type)
+
+
+def write_parquet(records, target, fields=None, chunk_size=EXPORT_CHUNK_SIZE, schema=None):
+    """
+    Stream records into a Parquet file, one row group per ``chunk_size`` records.
+
+    Unless ``schema`` (a ``pyarrow.Schema``) is given, it comes from the
+    DataFrame's dtypes or, for other record streams, the first chunk; every
+    chunk is cast to it.
+
+    Returns:
+        int: Number of rows written.
+    """
+    if pq is None:
+        raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+
+    data = records
+    fields, records = _peek_fields(_records(records), fields)
+    writer = None
+    count = 0
+    try:
+        for chunk in _chunks(records, chunk_size):
+            if writer is None:
+                schema = schema or _parquet_schema(data, fields, chunk)
+                writer = pq.ParquetWriter(target, schema)
+            writer.write_table(pa.table(
+                [_arrow_column([record.get(field) for record in chunk], column.type)
+                 for field, column in zip(fields, writer.schema)],
+                schema=writer.schema
+            ))
+            count += len(chunk)
+        if writer is None:
+            # Still produce a readable (empty) file
+            schema = schema or pa.schema([(field, pa.string()) for field in fields])
+            writer = pq.ParquetWriter(target, schema)
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def write_xlsx(sheets, target):
+    """
+    Write several record streams as sheets of one workbook.
+
+    Uses xlsxwriter's ``constant_memory`` mode, which flushes each row to
+    disk as it is written, so sheets are filled one after the other.
+
+    Args:
+        sheets (dict): Sheet name -> records (iterable or DataFrame).
+        target (str or file): Path or binary buffer.
+
+    Returns:
+        dict: Rows written per sheet.
+    """
+    # Buffers need in_memory, which xlsxwriter lets override constant_memory
+    workbook = xlsxwriter.Workbook(target, {'constant_memory': True, 'in_memory': not isinstance(target, str)})
+    header_format = workbook.add_format({'bold': True})
+    counts = {}
+    try:
+        for name, data in sheets.items():
+            worksheet = workbook.add_worksheet(name[:31])
+            fields, records = _peek_fields(_records(data))
+            worksheet.write_row(0, 0, fields, header_format)
+            count = 0
+            for count, record in enumerate(records, start=1):
+                worksheet.write_row(count, 0, [_cell(record.get(field)) for field in fields])
+            counts[name] = count
+    finally:
+        workbook.close()
+    return counts
+
+
+def _cell(value):
+    # xlsxwriter writes NaN/None as errors or blanks inconsistently
+    if value is None or (isinstance(value, float) and value != value):
+        return ''
+    return value
+
+
+def write_records(records, target, fmt, fields=None):
+    """Write one record stream as CSV, Parquet or a single-sheet workbook."""
+    if fmt == 'csv':
+        return write_csv(records, target, fields)
+    if fmt == 'parquet':
+        return write_parquet(records, target, fields)
+    if fmt == 'xlsx':
+        return write_xlsx({'Restaurants': records}, target)['Restaurants']
+    raise ValueError(f"Unknown export format: {fmt}. Choose from {', '.join(FORMATS)}")
+
+
+def read_records(path, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Stream records back from a file written by this module.
+
+    Parquet is read one batch at a time and workbooks in read-only mode, so
+    large dumps are never loaded whole.
+    """
+    if path.endswith('.csv'):
+        with open(path, newline='', encoding='utf-8') as f:
+            yield from csv.DictReader(f)
+    elif path.endswith('.parquet'):
+        if pq is None:
+            raise RuntimeError("Parquet export needs pyarrow (pip install pyarrow)")
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield from batch.to_pylist()
+    elif path.endswith('.xlsx'):
+        from openpyxl import load_workbook
+
+        workbook = load_workbook(path, read_only=True)
+        try:
+            for worksheet in workbook.worksheets:
+                rows = worksheet.iter_rows(values_only=True)
+                header = next(rows, None)
+                if header:
+                    yield from (dict(zip(header, row)) for row in rows)
+        finally:
+            workbook.close()
+    else:
+        raise ValueError(f"Cannot read records from {path}")
+
+
+def _with_source(records, source):
+    for record in records:
+        yield {**record, 'Source': source}
+
+
+def export_results(target, fmt, noon_results, talabat_results, comparison=None):
+    """
+    Export a scrape (and optionally its comparison) in one format.
+
+    CSV and Parquet hold the Noon and Talabat records in one table with a
+    'Source' column. XLSX gets one sheet each for raw Noon, raw Talabat and,
+    with ``comparison`` (``compare_restaurants`` output), matched, Noon-only
+    and Talabat-only restaurants.
+
+    Args:
+        target (str or file): Path, or a buffer (text for CSV, binary otherwise).
+        fmt (str): 'csv', 'parquet' or 'xlsx'.
+        noon_results (iterable): Noon records.
+        talabat_results (iterable): Talabat records.
+        comparison (dict, optional): Result of ``compare_restaurants``.
+    """
+    if fmt == 'xlsx':
+        sheets = {'Noon': noon_results, 'Talabat': talabat_results}
+        if comparison is not None:
+            sheets.update({
+                'Matched': comparison['matched'],
+                'Noon Only': comparison['noon_only'],
+                'Talabat Only': comparison['talabat_only'],
+            })
+        return write_xlsx(sheets, target)
+
+    records = chain(_with_source(noon_results, 'Noon'), _with_source(talabat_results, 'Talabat'))
+    return write_records(records, target, fmt, fields=RESULT_FIELDS + ['Source'])
+
+
+def export_bytes(fmt, noon_results, talabat_results, comparison=None):
+    """``export_results`` into memory, e.g. for a download button."""
+    buffer = io.BytesIO()
+    if fmt == 'csv':
+        # Encode rows as they are written instead of building the whole text first
+        text = io.TextIOWrapper(buffer, encoding='utf-8', newline='')
+        export_results(text, fmt, noon_results, talabat_results, comparison)
+        text.flush()
+        text.detach()
+    else:
+        export_results(buffer, fmt, noon_results, talabat_results, comparison)
+    return buffer.getvalue()
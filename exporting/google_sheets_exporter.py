@@ -0,0 +1,321 @@
+# exporting/google_sheets_exporter.py
+
+import hashlib
+import json
+import logging
+import os
+import re
+
+import pandas as pd
+
+from config.config import CREDENTIALS_PATH, GOOGLE_SHEET_NAME, SHEETS_MANIFEST_DIR, SHEETS_MAX_CELLS_PER_REQUEST
+
+try:
+    import gspread
+except ImportError:  # Only the local backend is available without gspread
+    gspread = None
+
+_A1_CELL = re.compile(r"^'(?P<title>(?:[^']|'')+)'!(?P<column>[A-Z]+)(?P<row>\d+)$")
+
+
+def _column_letters(column):
+    """Column letters of a 1-based column number, e.g. 28 -> 'AB'."""
+    letters = ''
+    while column:
+        column, remainder = divmod(column - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _a1(title, row, column=1):
+    """A1 reference of a cell, e.g. ``'Noon Only'!A5``."""
+    return "'{}'!{}{}".format(title.replace("'", "''"), _column_letters(column), row)
+
+
+class GspreadBackend:
+    """Google Sheets spreadsheet accessed through gspread with a service account."""
+
+    def __init__(self, sheet_name=GOOGLE_SHEET_NAME, credentials_path=CREDENTIALS_PATH):
+        if gspread is None:
+            raise RuntimeError("Google Sheets export needs gspread (pip install gspread)")
+        self.name = sheet_name
+        self.spreadsheet = gspread.service_account(filename=credentials_path).open(sheet_name)
+
+    def ensure_sheets(self, sizes):
+        """
+        Create missing worksheets and grow grids too small for the data.
+
+        New sheets default to 1000 x 26 cells, and writing past a sheet's
+        grid fails, so every sheet is sized up front in one batch update.
+
+        Args:
+            sizes (dict): Title -> ``(rows, columns)`` the export needs.
+
+        Returns:
+            int: API requests made.
+        """
+        metadata = self.spreadsheet.fetch_sheet_metadata()
+        existing = {sheet['properties']['title']: sheet['properties'] for sheet in metadata.get('sheets', [])}
+
+        requests = []
+        for title, (rows, columns) in sizes.items():
+            properties = existing.get(title)
+            if properties is None:
+                requests.append({'addSheet': {'properties': {
+                    'title': title, 'gridProperties': {'rowCount': rows, 'columnCount': columns}
+                }}})
+                continue
+            grid = properties.get('gridProperties', {})
+            row_count, column_count = grid.get('rowCount', 0), grid.get('columnCount', 0)
+            if rows > row_count or columns > column_count:
+                requests.append({'updateSheetProperties': {
+                    'properties': {'sheetId': properties['sheetId'], 'gridProperties': {
+                        'rowCount': max(rows, row_count), 'columnCount': max(columns, column_count)
+                    }},
+                    'fields': 'gridProperties.rowCount,gridProperties.columnCount'
+                }})
+
+        if requests:
+            self.spreadsheet.batch_update({'requests': requests})
+        return 1 + bool(requests)
+
+    def batch_update(self, data):
+        self.spreadsheet.values_batch_update({'valueInputOption': 'RAW', 'data': data})
+
+    def batch_clear(self, ranges):
+        self.spreadsheet.values_batch_clear(body={'ranges': ranges})
+
+
+class FakeSheetsBackend:
+    """
+    In-memory stand-in for a spreadsheet, for tests and dry runs.
+
+    Stores cells per sheet and counts the API requests that a real backend
+    would have made.
+    """
+
+    def __init__(self, name='local'):
+        self.name = name
+        self.sheets = {}
+        self.grids = {}
+        self.requests = 0
+        self.cells_written = 0
+
+    def add_sheet(self, title, rows=1000, columns=26):
+        """Create a sheet with the grid Google Sheets gives new sheets by default."""
+        self.sheets.setdefault(title, {})
+        self.grids[title] = (rows, columns)
+
+    def ensure_sheets(self, sizes):
+        # One metadata read, plus one batch update when a sheet is added or grown
+        self.requests += 1
+        changed = False
+        for title, (rows, columns) in sizes.items():
+            row_count, column_count = self.grids.get(title, (0, 0))
+            if title not in self.grids or rows > row_count or columns > column_count:
+                self.add_sheet(title, max(rows, row_count), max(columns, column_count))
+                changed = True
+        self.requests += changed
+        return 1 + changed
+
+    def _parse(self, reference):
+        match = _A1_CELL.match(reference)
+        if match is None:
+            raise ValueError(f"Unsupported range: {reference}")
+        column = 0
+        for letter in match.group('column'):
+            column = column * 26 + ord(letter) - ord('A') + 1
+        return match.group('title').replace("''", "'"), int(match.group('row')), column
+
+    def _check_grid(self, title, last_row, last_column, reference):
+        if title not in self.grids:
+            raise ValueError(f"Unable to parse range: {reference}")
+        rows, columns = self.grids[title]
+        if last_row > rows or last_column > columns:
+            raise ValueError(f"Range {reference} exceeds grid limits. Max rows: {rows}, max columns: {columns}")
+
+    def batch_update(self, data):
+        self.requests += 1
+        for update in data:
+            title, row, column = self._parse(update['range'])
+            width = max((len(values) for values in update['values']), default=0)
+            self._check_grid(title, row + len(update['values']) - 1, column + width - 1, update['range'])
+            cells = self.sheets[title]
+            for r, values in enumerate(update['values'], start=row):
+                for c, value in enumerate(values, start=column):
+                    cells[(r, c)] = value
+                    self.cells_written += 1
+
+    def batch_clear(self, ranges):
+        self.requests += 1
+        for reference in ranges:
+            start, end = reference.split(':')
+            title, first_row, first_column = self._parse(start)
+            _, last_row, last_column = self._parse(f"{start.rsplit('!', 1)[0]}!{end}")
+            self._check_grid(title, last_row, last_column, reference)
+            cells = self.sheets[title]
+            for key in [key for key in cells
+                        if first_row <= key[0] <= last_row and first_column <= key[1] <= last_column]:
+                del cells[key]
+
+    def values(self, title):
+        """Sheet contents as a list of rows, like the Sheets UI shows them."""
+        cells = self.sheets.get(title, {})
+        if not cells:
+            return []
+        rows = max(r for r, _ in cells)
+        columns = max(c for _, c in cells)
+        return [[cells.get((r, c), '') for c in range(1, columns + 1)] for r in range(1, rows + 1)]
+
+
+def _sheet_rows(df):
+    """Header and JSON-safe rows of a DataFrame; missing values become empty cells."""
+    if df is None or df.empty:
+        return [], []
+    header = [str(column) for column in df.columns]
+    values = df.astype(object).where(pd.notna(df), '')
+    rows = [[value.item() if hasattr(value, 'item') else value for value in row]
+            for row in values.itertuples(index=False, name=None)]
+    return header, rows
+
+
+def _row_hash(row):
+    return hashlib.sha1(json.dumps(row, default=str).encode('utf-8')).hexdigest()[:16]
+
+
+def _manifest_path(backend):
+    slug = re.sub(r'[^a-z0-9]+', '_', str(backend.name).lower()).strip('_') or 'sheet'
+    return os.path.join(SHEETS_MANIFEST_DIR, f"{slug}.json")
+
+
+def _load_manifest(path):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _save_manifest(path, manifest):
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(manifest, f)
+    except OSError as e:
+        logging.warning(f"Could not save Google Sheets manifest {path}: {e}")
+
+
+def _changed_runs(hashes, previous):
+    """Contiguous runs ``(start, end)`` of row indexes whose hash changed."""
+    runs = []
+    for i, row_hash in enumerate(hashes):
+        if i < len(previous) and previous[i] == row_hash:
+            continue
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    return runs
+
+
+def _split(update, max_cells):
+    """Split one range update into pieces of at most ``max_cells`` cells."""
+    values = update['values']
+    width = max((len(row) for row in values), default=1) or 1
+    step = max(1, max_cells // width)
+    for offset in range(0, len(values), step):
+        yield {'title': update['title'], 'row': update['row'] + offset, 'values': values[offset:offset + step]}
+
+
+def export_sheets(sheets, backend=None, manifest_path=None, force=False,
+                  max_cells_per_request=SHEETS_MAX_CELLS_PER_REQUEST):
+    """
+    Write several DataFrames to their worksheets in as few requests as possible.
+
+    Each row's hash is compared with a manifest of what the last export
+    wrote, so only changed rows go out; rows past the new end are cleared.
+    Missing worksheets are added and grids too small for the data grown
+    first, in one spreadsheet update. All sheets then share one values
+    batch update, split only when it would exceed ``max_cells_per_request``
+    cells.
+
+    Args:
+        sheets (dict): Worksheet title -> DataFrame.
+        backend (optional): ``GspreadBackend`` (default) or ``FakeSheetsBackend``.
+        manifest_path (str, optional): Manifest file; one per spreadsheet by default.
+        force (bool): Ignore the manifest and rewrite every row.
+        max_cells_per_request (int): Cells per batch update request.
+
+    Returns:
+        dict: 'requests', 'rows_written', 'rows_unchanged' and 'rows_cleared'.
+    """
+    backend = backend if backend is not None else GspreadBackend()
+    manifest_path = manifest_path or _manifest_path(backend)
+    manifest = {} if force else _load_manifest(manifest_path)
+    stats = {'requests': 0, 'rows_written': 0, 'rows_unchanged': 0, 'rows_cleared': 0}
+
+    updates, clears, sizes, new_manifest = [], [], {}, dict(manifest)
+    for title, df in sheets.items():
+        header, rows = _sheet_rows(df)
+        sizes[title] = (len(rows) + 1, max(len(header), 1))
+        hashes = [_row_hash(row) for row in rows]
+        previous = manifest.get(title, {})
+        previous_count = len(previous.get('rows', []))
+        header_changed = header != previous.get('header')
+        # Clears stay inside what the last export wrote, which is inside the grid
+        previous_end = f"{_column_letters(len(previous.get('header') or ['']))}{previous_count + 1}"
+
+        if header_changed and previous.get('header'):
+            # Different columns: wipe what the last export wrote, then rewrite
+            clears.append(f"{_a1(title, 1)}:{previous_end}")
+        elif previous_count > len(rows):
+            clears.append(f"{_a1(title, len(rows) + 2)}:{previous_end}")
+        stats['rows_cleared'] += max(0, previous_count - len(rows))
+
+        if header_changed and header:
+            updates.append({'title': title, 'row': 1, 'values': [header]})
+        runs = _changed_runs(hashes, [] if header_changed else previous['rows'])
+        for start, end in runs:
+            # Row 1 is the header
+            updates.append({'title': title, 'row': start + 2, 'values': rows[start:end]})
+        written = sum(end - start for start, end in runs)
+        stats['rows_written'] += written
+        stats['rows_unchanged'] += len(rows) - written
+        new_manifest[title] = {'header': header, 'rows': hashes}
+
+    if updates or clears:
+        stats['requests'] += backend.ensure_sheets(sizes)
+
+    if clears:
+        backend.batch_clear(clears)
+        stats['requests'] += 1
+
+    request, request_cells = [], 0
+    for update in updates:
+        for piece in _split(update, max_cells_per_request):
+            cells = sum(len(row) for row in piece['values'])
+            if request and request_cells + cells > max_cells_per_request:
+                backend.batch_update(request)
+                stats['requests'] += 1
+                request, request_cells = [], 0
+            request.append({'range': _a1(piece['title'], piece['row']), 'values': piece['values']})
+            request_cells += cells
+    if request:
+        backend.batch_update(request)
+        stats['requests'] += 1
+
+    _save_manifest(manifest_path, new_manifest)
+    logging.info(
+        f"Exported {len(sheets)} sheet(s) to {backend.name}: {stats['rows_written']} row(s) written, "
+        f"{stats['rows_unchanged']} unchanged, {stats['rows_cleared']} cleared in {stats['requests']} request(s)"
+    )
+    return stats
+
+
+def export_to_google_sheets(df, sheet_title, backend=None):
+    """
+    Export one DataFrame to a worksheet of ``GOOGLE_SHEET_NAME``.
+
+    Prefer ``export_sheets`` for several sheets, so they share one request.
+    """
+    return export_sheets({sheet_title: df}, backend=backend)
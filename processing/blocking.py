@@ -0,0 +1,122 @@
+# processing/blocking.py
+
+import re
+
+import numpy as np
+from scipy import sparse
+
+from .matching import score_matrix
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def name_grams(name, n=3):
+    """
+    Character n-grams of a name, lowercased with punctuation collapsed to spaces.
+
+    The name is padded with a space on each side so short names still
+    produce grams and word boundaries count.
+    """
+    text = ' ' + _NON_WORD.sub(' ', str(name).lower()).strip() + ' '
+    if len(text) <= n:
+        return {text}
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class NgramIndex:
+    """
+    Inverted index from character n-grams to the names containing them.
+
+    Built once over one platform's names. ``candidate_pairs`` then finds,
+    for every name of the other platform, the names sharing enough grams
+    to be worth scoring, using one sparse matrix product.
+
+    Grams found in more than ``max_df`` of the indexed names (e.g. " al")
+    carry no signal and are left out.
+    """
+
+    def __init__(self, names, n=3, max_df=0.25):
+        self.n = n
+        self.size = len(names)
+
+        document_grams = [name_grams(name, n) for name in names]
+        frequency = {}
+        for grams in document_grams:
+            for gram in grams:
+                frequency[gram] = frequency.get(gram, 0) + 1
+
+        limit = max(1, int(max_df * self.size)) if self.size >= 20 else self.size
+        self.vocabulary = {
+            gram: i for i, gram in enumerate(sorted(g for g, count in frequency.items() if count <= limit))
+        }
+        self.matrix = self._gram_matrix(document_grams)
+
+    def _gram_matrix(self, grams_per_name):
+        """Binary names x grams matrix over the index vocabulary."""
+        rows, columns = [], []
+        for row, grams in enumerate(grams_per_name):
+            for gram in grams:
+                column = self.vocabulary.get(gram)
+                if column is not None:
+                    rows.append(row)
+                    columns.append(column)
+        data = np.ones(len(rows), dtype=np.float32)
+        return sparse.csr_matrix(
+            (data, (rows, columns)), shape=(len(grams_per_name), len(self.vocabulary))
+        )
+
+    def candidate_pairs(self, queries, min_overlap=0.3):
+        """
+        Find the indexed names worth scoring against each query.
+
+        Args:
+            queries (list): Names from the other platform.
+            min_overlap (float): Fraction of a query's (indexed) grams a
+                candidate must share with it, at least one gram.
+
+        Returns:
+            tuple: ``(query_positions, index_positions)`` arrays of candidate pairs,
+                sorted by query then index position.
+        """
+        query_matrix = self._gram_matrix([name_grams(query, self.n) for query in queries])
+        shared = (query_matrix @ self.matrix.T).tocoo()
+
+        gram_counts = np.asarray(query_matrix.sum(axis=1)).ravel()
+        required = np.maximum(1, np.ceil(min_overlap * gram_counts))
+        keep = shared.data >= required[shared.row]
+
+        rows, columns = shared.row[keep], shared.col[keep]
+        order = np.lexsort((columns, rows))
+        return rows[order].astype(np.intp), columns[order].astype(np.intp)
+
+
+def pruning_ratio(pair_count, query_count, index_count):
+    """Share of the full query x index comparison that blocking skipped."""
+    total = query_count * index_count
+    return 1.0 - pair_count / total if total else 0.0
+
+
+def blocking_recall(queries, index_names, threshold=90, n=3, min_overlap=0.3, max_df=0.25):
+    """
+    Measure how many above-threshold pairs survive blocking.
+
+    Scores every pair exhaustively to find the true matches, so this is an
+    evaluation helper for tuning ``min_overlap`` and ``max_df`` on a sample,
+    not something to run on every comparison.
+
+    Returns:
+        dict: 'recall', 'pruning_ratio', 'candidate_pairs' and 'true_pairs'.
+    """
+    index = NgramIndex(index_names, n=n, max_df=max_df)
+    rows, columns = index.candidate_pairs(queries, min_overlap=min_overlap)
+
+    true_rows, true_columns = np.nonzero(score_matrix(queries, index_names) >= threshold)
+    true_pairs = set(zip(true_rows.tolist(), true_columns.tolist()))
+    found = true_pairs & set(zip(rows.tolist(), columns.tolist()))
+
+    return {
+        'recall': len(found) / len(true_pairs) if true_pairs else 1.0,
+        'pruning_ratio': pruning_ratio(len(rows), len(queries), len(index_names)),
+        'candidate_pairs': len(rows),
+        'true_pairs': len(true_pairs),
+    }
@@ -1,65 +1,217 @@
 # processing/comparator.py
 
+import numpy as np
 import pandas as pd
-from utils.helpers import fuzzy_match
+from .blocking import NgramIndex, pruning_ratio
+from .normalization import normalize_names
+from .matching import (
+    assign_matches, assign_pair_matches, best_matches, best_pair_matches, score_matrix, score_pairs
+)
 
-def compare_restaurants(noon_data, talabat_data, threshold=90):
+MATCH_METHODS = ('greedy', 'assignment')
+
+
+def records_frame(data):
+    """Build a DataFrame that always has 'name' and 'offer' columns."""
+    df = pd.DataFrame(data)
+    for column in ('name', 'offer'):
+        if column not in df.columns:
+            df[column] = pd.Series(dtype=object)
+    return df.reset_index(drop=True)
+
+
+def side_frame(df, positions, suffix):
+    """Select rows by position as ``name_<suffix>`` / ``offer_<suffix>`` columns."""
+    if len(positions) == 0:
+        return pd.DataFrame()
+    return pd.DataFrame({
+        f'name_{suffix}': df['name'].to_numpy()[positions],
+        f'offer_{suffix}': df['offer'].to_numpy()[positions]
+    })
+
+
+def _match_dense(noon_names, talabat_names, threshold, method):
+    scores = score_matrix(noon_names, talabat_names)
+    if method == 'greedy':
+        columns, best_scores, is_match = best_matches(scores, threshold)
+        return np.flatnonzero(is_match), columns[is_match], best_scores[is_match]
+    return assign_matches(scores, threshold)
+
+
+def _blocked_pairs(noon_names, talabat_names, stats):
+    index = NgramIndex(talabat_names)
+    rows, columns = index.candidate_pairs(noon_names)
+
+    if stats is not None:
+        stats['candidate_pairs'] = len(rows)
+        stats['pruning_ratio'] = pruning_ratio(len(rows), len(noon_names), len(talabat_names))
+    return rows, columns
+
+
+def _scores_above(queries, choices, min_score, blocking=False):
+    """``(rows, columns, scores)`` of the query x choice pairs scoring at least ``min_score``."""
+    if blocking:
+        rows, columns = NgramIndex(choices).candidate_pairs(queries)
+        scores = score_pairs(queries, choices, rows, columns)
+        keep = scores >= min_score
+        return rows[keep], columns[keep], scores[keep]
+    scores = score_matrix(queries, choices)
+    rows, columns = np.nonzero(scores >= min_score)
+    return rows.astype(np.intp), columns.astype(np.intp), scores[rows, columns]
+
+
+def _key_positions(names):
+    positions = {}
+    for position, name in enumerate(names):
+        positions.setdefault(name, []).append(position)
+    return positions
+
+
+def _match_stored(noon_names, talabat_names, threshold, method, blocking, store, stats):
+    """
+    Match through a ``MatchStore``: only pairs with names new to the store are
+    scored, and only the stored pairs between the current names are read back.
+    """
+    noon_positions = _key_positions(noon_names)
+    talabat_positions = _key_positions(talabat_names)
+
+    if threshold >= store.min_score:
+        counts = store.add_names(
+            noon_positions, talabat_positions,
+            lambda queries, choices, min_score: _scores_above(queries, choices, min_score, blocking),
+            blocked=blocking
+        )
+        known = store.scores_between(noon_positions, talabat_positions)
+    else:
+        # The store holds nothing below min_score, so score this run directly and only apply reviews
+        noon_keys, talabat_keys = list(noon_positions), list(talabat_positions)
+        rows, columns, scores = _scores_above(noon_keys, talabat_keys, threshold, blocking)
+        known = {
+            (noon_keys[row], talabat_keys[column]): score
+            for row, column, score in zip(rows.tolist(), columns.tolist(), scores.tolist())
+        }
+        known.update(store.scores_between(noon_keys, talabat_keys, reviewed_only=True))
+        counts = {'cached_pairs': 0, 'scored_pairs': len(noon_keys) * len(talabat_keys)}
+
+    if stats is not None:
+        stats.update(counts)
+
+    # Expand key pairs to row positions, as duplicate names are matched independently
+    rows, columns, pair_scores = [], [], []
+    for (noon, talabat), score in known.items():
+        for row in noon_positions[noon]:
+            for column in talabat_positions[talabat]:
+                rows.append(row)
+                columns.append(column)
+                pair_scores.append(score)
+    rows = np.asarray(rows, dtype=np.intp)
+    columns = np.asarray(columns, dtype=np.intp)
+    pair_scores = np.asarray(pair_scores, dtype=np.float32)
+
+    if method == 'greedy':
+        return best_pair_matches(rows, columns, pair_scores, threshold)
+    return assign_pair_matches(rows, columns, pair_scores, threshold)
+
+
+def _match_pairs(noon_names, talabat_names, threshold, method, stats):
+    rows, columns = _blocked_pairs(noon_names, talabat_names, stats)
+    pair_scores = score_pairs(noon_names, talabat_names, rows, columns)
+
+    if method == 'greedy':
+        return best_pair_matches(rows, columns, pair_scores, threshold)
+    return assign_pair_matches(rows, columns, pair_scores, threshold)
+
+
+def compare_restaurants(noon_data, talabat_data, threshold=90, method='greedy', blocking=False, stats=None,
+                        normalize=True, store=None):
     """
     Compare restaurant data from Noon Food and Talabat UAE.
 
+    Names are scored on their normalized keys (see
+    ``processing.normalization``), so "KFC - Kalba" matches "KFC"; the
+    output keeps the original display names.
+
+    The full Noon x Talabat similarity matrix is computed in a single
+    ``rapidfuzz.process.cdist`` call. With ``blocking``, an n-gram index over
+    the Talabat names limits scoring to candidate pairs instead, for
+    catalogues too large for the full matrix. With a ``store``
+    (``processing.match_store.MatchStore``), only pairs involving names the
+    store has not seen are scored (with blocking, only their candidate
+    pairs) and the likely matches are read back from it. Scores are then
+    turned into matches:
+
+    - ``'greedy'``: each Noon restaurant takes its best-scoring Talabat name,
+      even if another Noon restaurant took it too. A Talabat name used by
+      any match is not listed as Talabat-only.
+    - ``'assignment'``: one-to-one matches that maximise the total
+      similarity (linear-sum assignment). Rows are tracked by position, so
+      duplicate names on either side are matched independently.
+
     Args:
         noon_data (list): List of restaurants from Noon Food.
         talabat_data (list): List of restaurants from Talabat UAE.
         threshold (int): Similarity threshold for fuzzy matching.
+        method (str): 'greedy' or 'assignment'.
+        blocking (bool): Score only pairs sharing enough character trigrams.
+        stats (dict, optional): With blocking alone, filled with 'candidate_pairs'
+            and 'pruning_ratio' (share of all pairs never scored).
+        normalize (bool): Score normalized keys instead of raw display names.
+        store (MatchStore, optional): Persistent score cache; with ``stats``,
+            'cached_pairs' counts pairs of this run needing no scoring and
+            'scored_pairs' the pairs scored now.
 
     Returns:
         dict: Dictionary containing matched, noon_only, and talabat_only dataframes.
     """
-    noon_df = pd.DataFrame(noon_data)
-    talabat_df = pd.DataFrame(talabat_data)
-    
+    if method not in MATCH_METHODS:
+        raise ValueError(f"Unknown match method: {method}. Choose from {', '.join(MATCH_METHODS)}")
+
+    noon_df = records_frame(noon_data)
+    talabat_df = records_frame(talabat_data)
+
     noon_names = noon_df['name'].tolist()
     talabat_names = talabat_df['name'].tolist()
-    
-    matched = []
-    noon_only = []
-    talabat_only = []
-    
-    # Create a copy of Talabat data to track unmatched entries
-    talabat_unmatched = talabat_df.copy()
-    
-    for index, noon_row in noon_df.iterrows():
-        match, score = fuzzy_match(noon_row['name'], talabat_names, threshold)
-        if match:
-            talabat_offer = talabat_df[talabat_df['name'] == match]['offer'].values[0]
-            matched.append({
-                'name_noon': noon_row['name'],
-                'offer_noon': noon_row['offer'],
-                'name_talabat': match,
-                'offer_talabat': talabat_offer,
-                'similarity': score
-            })
-            # Remove the matched Talabat entry to prevent duplicate matches
-            talabat_unmatched = talabat_unmatched[talabat_unmatched['name'] != match]
-        else:
-            noon_only.append({
-                'name_noon': noon_row['name'],
-                'offer_noon': noon_row['offer']
-            })
-    
-    # Remaining Talabat entries are unmatched
-    for index, talabat_row in talabat_unmatched.iterrows():
-        talabat_only.append({
-            'name_talabat': talabat_row['name'],
-            'offer_talabat': talabat_row['offer']
-        })
-    
-    matched_df = pd.DataFrame(matched)
-    noon_only_df = pd.DataFrame(noon_only)
-    talabat_only_df = pd.DataFrame(talabat_only)
-    
+    if normalize:
+        noon_names = normalize_names(noon_names)
+        talabat_names = normalize_names(talabat_names)
+
+    if store is not None:
+        noon_positions, talabat_positions, pair_scores = _match_stored(
+            noon_names, talabat_names, threshold, method, blocking, store, stats
+        )
+    elif blocking:
+        noon_positions, talabat_positions, pair_scores = _match_pairs(
+            noon_names, talabat_names, threshold, method, stats
+        )
+    else:
+        noon_positions, talabat_positions, pair_scores = _match_dense(
+            noon_names, talabat_names, threshold, method
+        )
+
+    if method == 'greedy':
+        # Talabat names taken by any Noon match are no longer listed as exclusive
+        matched_names = set(talabat_df['name'].to_numpy()[talabat_positions])
+        talabat_unmatched = np.flatnonzero(~talabat_df['name'].isin(matched_names).to_numpy())
+    else:
+        talabat_taken = np.zeros(len(talabat_df), dtype=bool)
+        talabat_taken[talabat_positions] = True
+        talabat_unmatched = np.flatnonzero(~talabat_taken)
+
+    noon_taken = np.zeros(len(noon_df), dtype=bool)
+    noon_taken[noon_positions] = True
+    noon_unmatched = np.flatnonzero(~noon_taken)
+
+    if len(noon_positions):
+        matched_df = pd.concat([
+            side_frame(noon_df, noon_positions, 'noon'),
+            side_frame(talabat_df, talabat_positions, 'talabat')
+        ], axis=1)
+        matched_df['similarity'] = pair_scores.astype(float)
+    else:
+        matched_df = pd.DataFrame()
+
     return {
         'matched': matched_df,
-        'noon_only': noon_only_df,
-        'talabat_only': talabat_only_df
+        'noon_only': side_frame(noon_df, noon_unmatched, 'noon'),
+        'talabat_only': side_frame(talabat_df, talabat_unmatched, 'talabat')
     }
@@ -0,0 +1,248 @@
+# processing/match_store.py
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+from config.config import MATCH_STORE_MIN_SCORE, MATCH_STORE_PATH
+from .normalization import normalize_name
+
+CONFIRMED = 'confirmed'
+REJECTED = 'rejected'
+STATUSES = (CONFIRMED, REJECTED)
+
+# How a name's pairs were scored: against every name, or only blocking candidates
+DENSE = 'dense'
+BLOCKED = 'blocked'
+
+# Score a reviewed pair is treated as having, whatever fuzz.ratio says
+STATUS_SCORES = {CONFIRMED: 100.0, REJECTED: 0.0}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS pair_scores (
+    noon_key TEXT NOT NULL,
+    talabat_key TEXT NOT NULL,
+    score REAL,
+    status TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (noon_key, talabat_key)
+);
+CREATE TABLE IF NOT EXISTS scored_names (
+    side TEXT NOT NULL,
+    key TEXT NOT NULL,
+    mode TEXT NOT NULL DEFAULT 'blocked',
+    PRIMARY KEY (side, key)
+);
+"""
+
+
+class MatchStore:
+    """
+    Persistent (noon key, talabat key) -> score cache shared across runs.
+
+    Keys are the names as the comparator scores them (normalized keys by
+    default). The store remembers every name it has seen on each side and
+    keeps the invariant that all pairs of seen names have been scored (for
+    names scored with blocking, all candidate pairs), but
+    only pairs scoring at least ``min_score`` are written; any other pair
+    of seen names is known to fall below it. A run therefore only scores
+    the pairs involving names new to the store, and the database grows
+    with the number of likely matches rather than with N x M.
+
+    A pair can also carry a review flag: confirmed pairs always match and
+    rejected pairs never do.
+
+    Usage:
+        with MatchStore() as store:
+            compare_restaurants(noon_data, talabat_data, store=store)
+    """
+
+    def __init__(self, path=MATCH_STORE_PATH, min_score=MATCH_STORE_MIN_SCORE):
+        if path != ':memory:':
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.min_score = min_score
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        with self._conn:
+            if path != ':memory:':
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(SCHEMA)
+            columns = {row[1] for row in self._conn.execute("PRAGMA table_info(scored_names)")}
+            if 'mode' not in columns:
+                # Stores from before the mode column may hold blocked names, so dense runs rescore them
+                self._conn.execute("ALTER TABLE scored_names ADD COLUMN mode TEXT NOT NULL DEFAULT 'blocked'")
+
+    def _side_keys(self, side, blocked):
+        """
+        Names seen on one side, and those whose pairs are complete for the
+        scoring mode: any seen name for blocked scoring, only names scored
+        densely for dense scoring.
+        """
+        seen, complete = set(), set()
+        for key, mode in self._conn.execute("SELECT key, mode FROM scored_names WHERE side = ?", (side,)):
+            seen.add(key)
+            if blocked or mode == DENSE:
+                complete.add(key)
+        return seen, complete
+
+    def _snapshot(self, blocked):
+        return self._side_keys('noon', blocked) + self._side_keys('talabat', blocked)
+
+    def add_names(self, noon_keys, talabat_keys, score_above, blocked=False):
+        """
+        Make sure every pair among the given and already seen names is scored.
+
+        Only pairs involving a name new to the store are scored, in at most
+        two calls: new Noon names against every Talabat name, and the
+        previously seen Noon names against the new Talabat names. Each name
+        records whether it was scored densely or with blocking; a blocked
+        name counts as new again for a dense run, since its non-candidate
+        pairs were never scored.
+
+        Scoring runs before the write transaction. If another run added
+        names in the meantime, the pairs between those and this run's new
+        names are scored and the write is retried.
+
+        Args:
+            noon_keys (iterable): Noon keys of the current run.
+            talabat_keys (iterable): Talabat keys of the current run.
+            score_above (callable): ``score_above(queries, choices, min_score)``
+                returning ``(rows, columns, scores)`` of the pairs scoring at
+                least ``min_score``.
+            blocked (bool): ``score_above`` only scores blocking candidates.
+
+        Returns:
+            dict: 'scored_pairs' (pairs scored now) and 'cached_pairs'
+                (pairs of the current names that needed no scoring).
+        """
+        noon_keys, talabat_keys = set(noon_keys), set(talabat_keys)
+        with self._lock:
+            seen_noon, complete_noon, seen_talabat, complete_talabat = self._snapshot(blocked)
+        new_noon, new_talabat = noon_keys - complete_noon, talabat_keys - complete_talabat
+        blocks = [(new_noon, seen_talabat | new_talabat), (seen_noon - new_noon, new_talabat)]
+        cached = len(noon_keys & complete_noon) * len(talabat_keys & complete_talabat)
+
+        rows_written, scored = [], 0
+        while True:
+            for queries, choices in blocks:
+                queries, choices = sorted(queries), sorted(choices)
+                if not queries or not choices:
+                    continue
+                scored += len(queries) * len(choices)
+                rows, columns, scores = score_above(queries, choices, self.min_score)
+                rows_written += [
+                    (queries[row], choices[column], float(score))
+                    for row, column, score in zip(rows.tolist(), columns.tolist(), scores.tolist())
+                ]
+
+            with self._lock:
+                self._conn.execute("BEGIN IMMEDIATE")
+                try:
+                    now_noon, complete_noon, now_talabat, complete_talabat = self._snapshot(blocked)
+                    new_noon, new_talabat = noon_keys - complete_noon, talabat_keys - complete_talabat
+                    if now_noon == seen_noon and now_talabat == seen_talabat:
+                        self._write(rows_written, new_noon, new_talabat, BLOCKED if blocked else DENSE)
+                        self._conn.commit()
+                        break
+                    self._conn.rollback()
+                except BaseException:
+                    self._conn.rollback()
+                    raise
+
+            # Names another run added since the snapshot still need pairing with ours
+            blocks = [(new_noon, now_talabat - seen_talabat), (now_noon - seen_noon, new_talabat)]
+            seen_noon, seen_talabat = now_noon, now_talabat
+
+        return {'cached_pairs': cached, 'scored_pairs': scored}
+
+    def _write(self, rows_written, new_noon, new_talabat, mode):
+        now = time.time()
+        self._conn.executemany(
+            "INSERT INTO pair_scores (noon_key, talabat_key, score, updated_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (noon_key, talabat_key) DO UPDATE SET score = excluded.score, "
+            "updated_at = excluded.updated_at",
+            [(noon, talabat, score, now) for noon, talabat, score in rows_written]
+        )
+        self._conn.executemany(
+            "INSERT INTO scored_names (side, key, mode) VALUES (?, ?, ?) "
+            "ON CONFLICT (side, key) DO UPDATE SET mode = excluded.mode",
+            [('noon', key, mode) for key in new_noon] + [('talabat', key, mode) for key in new_talabat]
+        )
+
+    def scores_between(self, noon_keys, talabat_keys, reviewed_only=False):
+        """
+        Fetch the stored pairs between two sets of keys.
+
+        Args:
+            noon_keys (iterable): Noon keys.
+            talabat_keys (iterable): Talabat keys.
+            reviewed_only (bool): Only return pairs carrying a review flag.
+
+        Returns:
+            dict: ``(noon_key, talabat_key) -> score`` for stored pairs, with
+                review flags already applied.
+        """
+        noon_keys, talabat_keys = list(noon_keys), list(talabat_keys)
+        if not noon_keys or not talabat_keys:
+            return {}
+        query = (
+            "SELECT p.noon_key, p.talabat_key, p.score, p.status FROM pair_scores p "
+            "JOIN wanted_noon n ON p.noon_key = n.key JOIN wanted_talabat t ON p.talabat_key = t.key"
+        )
+        if reviewed_only:
+            query += " WHERE p.status IS NOT NULL"
+        with self._lock, self._conn:
+            for table, keys in (('wanted_noon', noon_keys), ('wanted_talabat', talabat_keys)):
+                self._conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {table} (key TEXT PRIMARY KEY)")
+                self._conn.execute(f"DELETE FROM {table}")
+                self._conn.executemany(f"INSERT OR IGNORE INTO {table} VALUES (?)", ((key,) for key in keys))
+            rows = self._conn.execute(query).fetchall()
+
+        known = {}
+        for noon, talabat, score, status in rows:
+            if status is not None:
+                known[(noon, talabat)] = STATUS_SCORES[status]
+            elif score is not None:
+                known[(noon, talabat)] = score
+        return known
+
+    def set_status(self, noon_name, talabat_name, status, normalize=True):
+        """
+        Confirm or reject a pair, or clear its flag with ``status=None``.
+
+        Args:
+            noon_name (str): Noon display name (or key with ``normalize=False``).
+            talabat_name (str): Talabat display name (or key).
+            status (str or None): 'confirmed', 'rejected' or None.
+            normalize (bool): Normalize the names as the comparator does.
+        """
+        if status is not None and status not in STATUSES:
+            raise ValueError(f"Unknown match status: {status}. Choose from {', '.join(STATUSES)}")
+        if normalize:
+            noon_name, talabat_name = normalize_name(noon_name), normalize_name(talabat_name)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO pair_scores (noon_key, talabat_key, score, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?) ON CONFLICT (noon_key, talabat_key) DO UPDATE SET "
+                "status = excluded.status, updated_at = excluded.updated_at",
+                (noon_name, talabat_name, None, status, time.time())
+            )
+        logging.info(f"Marked match {noon_name!r} / {talabat_name!r} as {status or 'unreviewed'}")
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM pair_scores").fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
@@ -0,0 +1,158 @@
+# processing/matching.py
+
+import numpy as np
+from rapidfuzz import fuzz, process
+from scipy import sparse
+from scipy.optimize import linear_sum_assignment
+from scipy.sparse.csgraph import connected_components
+
+
+def score_matrix(queries, choices, scorer=fuzz.ratio, workers=-1):
+    """
+    Score every query against every choice in one call.
+
+    Args:
+        queries (list): Names to match (rows).
+        choices (list): Names to match against (columns).
+        scorer (callable): rapidfuzz scorer, ``fuzz.ratio`` by default.
+        workers (int): Threads used by rapidfuzz; -1 uses all cores.
+
+    Returns:
+        numpy.ndarray: ``len(queries) x len(choices)`` float32 similarity matrix.
+    """
+    if len(queries) == 0 or len(choices) == 0:
+        return np.zeros((len(queries), len(choices)), dtype=np.float32)
+    return process.cdist(queries, choices, scorer=scorer, dtype=np.float32, workers=workers)
+
+
+def best_matches(scores, threshold):
+    """
+    Pick the best-scoring column for every row of a similarity matrix.
+
+    Ties go to the first column, as with ``process.extractOne``.
+
+    Args:
+        scores (numpy.ndarray): Similarity matrix from ``score_matrix``.
+        threshold (float): Minimum score for a match.
+
+    Returns:
+        tuple: ``(columns, best_scores, matched)`` arrays, one entry per row;
+            ``matched`` is a boolean mask of rows whose best score reaches the threshold.
+    """
+    rows = scores.shape[0]
+    if scores.shape[1] == 0:
+        return np.zeros(rows, dtype=np.intp), np.zeros(rows, dtype=np.float32), np.zeros(rows, dtype=bool)
+
+    columns = scores.argmax(axis=1)
+    best_scores = scores[np.arange(rows), columns]
+    return columns, best_scores, best_scores >= threshold
+
+
+def assign_matches(scores, threshold):
+    """
+    Resolve one-to-one matches that maximise the total similarity.
+
+    Pairs below the threshold are zeroed before a linear-sum assignment, so
+    they never displace a valid pair, and are dropped from the result. Each
+    row and each column is used at most once, so duplicate names on either
+    side are matched to distinct rows.
+
+    Args:
+        scores (numpy.ndarray): Similarity matrix from ``score_matrix``.
+        threshold (float): Minimum score for a match.
+
+    Returns:
+        tuple: ``(rows, columns, pair_scores)`` arrays of the accepted pairs, ordered by row.
+    """
+    if scores.size == 0:
+        empty = np.zeros(0, dtype=np.intp)
+        return empty, empty, np.zeros(0, dtype=np.float32)
+
+    eligible = np.where(scores >= threshold, scores, 0)
+    rows, columns = linear_sum_assignment(eligible, maximize=True)
+    pair_scores = scores[rows, columns]
+    keep = pair_scores >= threshold
+    return rows[keep], columns[keep], pair_scores[keep]
+
+
+def score_pairs(queries, choices, rows, columns, scorer=fuzz.ratio, workers=-1):
+    """
+    Score only the given (query, choice) pairs, e.g. the candidates left by blocking.
+
+    Returns:
+        numpy.ndarray: float32 score per pair.
+    """
+    if len(rows) == 0:
+        return np.zeros(0, dtype=np.float32)
+    queries = np.asarray(queries, dtype=object)
+    choices = np.asarray(choices, dtype=object)
+    return process.cpdist(
+        queries[rows].tolist(), choices[columns].tolist(), scorer=scorer, dtype=np.float32, workers=workers
+    )
+
+
+def best_pair_matches(rows, columns, pair_scores, threshold):
+    """
+    Sparse counterpart of ``best_matches``: the best-scoring pair per row.
+
+    Ties go to the lowest column, as with the dense version.
+
+    Returns:
+        tuple: ``(rows, columns, pair_scores)`` of the accepted pairs, ordered by row.
+    """
+    keep = pair_scores >= threshold
+    rows, columns, pair_scores = rows[keep], columns[keep], pair_scores[keep]
+
+    order = np.lexsort((columns, -pair_scores, rows))
+    rows, columns, pair_scores = rows[order], columns[order], pair_scores[order]
+    first = np.ones(len(rows), dtype=bool)
+    first[1:] = rows[1:] != rows[:-1]
+    return rows[first], columns[first], pair_scores[first]
+
+
+def assign_pair_matches(rows, columns, pair_scores, threshold):
+    """
+    Sparse counterpart of ``assign_matches``.
+
+    Above-threshold pairs form a bipartite graph; each connected component
+    is solved with its own small linear-sum assignment, which gives the same
+    total as one assignment over the whole matrix.
+
+    Returns:
+        tuple: ``(rows, columns, pair_scores)`` of the accepted pairs, ordered by row.
+    """
+    keep = pair_scores >= threshold
+    rows, columns, pair_scores = rows[keep], columns[keep], pair_scores[keep]
+    if len(rows) == 0:
+        return rows, columns, pair_scores
+
+    # Relabel to compact ids; columns are placed after rows in one graph
+    row_ids, row_local = np.unique(rows, return_inverse=True)
+    column_ids, column_local = np.unique(columns, return_inverse=True)
+    n_rows, n_columns = len(row_ids), len(column_ids)
+    graph = sparse.coo_matrix(
+        (np.ones(len(rows)), (row_local, n_rows + column_local)),
+        shape=(n_rows + n_columns, n_rows + n_columns)
+    )
+    _, labels = connected_components(graph, directed=False)
+
+    pair_labels = labels[row_local]
+    order = np.argsort(pair_labels, kind='stable')
+    boundaries = np.flatnonzero(np.diff(pair_labels[order])) + 1
+
+    matched_rows, matched_columns, matched_scores = [], [], []
+    for component in np.split(order, boundaries):
+        component_rows, r = np.unique(row_local[component], return_inverse=True)
+        component_columns, c = np.unique(column_local[component], return_inverse=True)
+        block = np.zeros((len(component_rows), len(component_columns)), dtype=np.float32)
+        block[r, c] = pair_scores[component]
+
+        block_rows, block_columns = linear_sum_assignment(block, maximize=True)
+        accepted = block[block_rows, block_columns] >= threshold
+        matched_rows.append(row_ids[component_rows[block_rows[accepted]]])
+        matched_columns.append(column_ids[component_columns[block_columns[accepted]]])
+        matched_scores.append(block[block_rows[accepted], block_columns[accepted]])
+
+    rows = np.concatenate(matched_rows)
+    order = np.argsort(rows, kind='stable')
+    return rows[order], np.concatenate(matched_columns)[order], np.concatenate(matched_scores)[order]
@@ -0,0 +1,93 @@
+# processing/normalization.py
+
+import re
+import unicodedata
+from functools import lru_cache
+
+from config.config import NAME_CACHE_SIZE
+
+# Words that say what kind of place it is, not which one
+GENERIC_WORDS = {
+    'restaurant', 'restaurants', 'resturant', 'restaurent', 'cafe', 'cafeteria', 'kitchen',
+    'the', 'and', 'llc', 'branch', 'co',
+    'مطعم', 'مقهى', 'كافيه', 'كافتيريا', 'فرع',
+}
+
+# Article spellings folded to a single form ("El Fanar", "Al-Fanar" -> "al fanar")
+ARTICLES = {'el': 'al', 'ال': 'al'}
+
+# Arabic letter variants folded to one form before comparison
+ARABIC_FOLD = str.maketrans({
+    'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ٱ': 'ا',
+    'ة': 'ه', 'ى': 'ي', 'ؤ': 'و', 'ئ': 'ي',
+    'ـ': None,
+})
+
+# Rough Arabic -> Latin transliteration so Arabic and English spellings
+# of the same name land close together ("الفنار" -> "al fnar" ~ "al fanar")
+ARABIC_TO_LATIN = str.maketrans({
+    'ا': 'a', 'ب': 'b', 'ت': 't', 'ث': 'th', 'ج': 'j', 'ح': 'h', 'خ': 'kh', 'د': 'd',
+    'ذ': 'dh', 'ر': 'r', 'ز': 'z', 'س': 's', 'ش': 'sh', 'ص': 's', 'ض': 'd', 'ط': 't',
+    'ظ': 'z', 'ع': 'a', 'غ': 'gh', 'ف': 'f', 'ق': 'q', 'ك': 'k', 'ل': 'l', 'م': 'm',
+    'ن': 'n', 'ه': 'h', 'و': 'w', 'ي': 'y', 'ء': None,
+})
+
+# Tashkeel (short vowel marks)
+_ARABIC_MARKS = re.compile(r'[ً-ٰٟ]')
+# Branch / area suffix: "KFC - Kalba", "KFC | Al Majaz", "KFC (Al Nahda)"
+_BRANCH_SUFFIX = re.compile(r'\s+[-|–—]\s+.*$|\s*\(.*?\)')
+_ARABIC_ARTICLE = re.compile(r'(?<!\S)ال(?=\S)')
+_APOSTROPHES = re.compile(r"['’`]")
+_NON_WORD = re.compile(r'[\W_]+')
+
+
+def _fold_characters(text):
+    """Strip Latin accents and fold Arabic letter variants."""
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    text = _ARABIC_MARKS.sub('', text)
+    return text.translate(ARABIC_FOLD)
+
+
+@lru_cache(maxsize=NAME_CACHE_SIZE)
+def normalize_name(name):
+    """
+    Build the comparison key for a restaurant name.
+
+    Lowercases, drops branch/area suffixes and generic words like
+    "restaurant" or "cafe", folds accents, Arabic letter variants and
+    "al"/"el" articles, transliterates Arabic to Latin, then sorts the tokens so word order does not matter.
+    Results are memoized (LRU), so each distinct name is processed once per
+    process.
+
+    Args:
+        name (str): Display name as scraped.
+
+    Returns:
+        str: Normalized key; the lowercased name if nothing else is left.
+    """
+    text = _BRANCH_SUFFIX.sub('', str(name)) or str(name)
+    text = _fold_characters(text.lower())
+    text = _ARABIC_ARTICLE.sub('ال ', _APOSTROPHES.sub('', text))
+
+    tokens = [ARTICLES.get(token, token) for token in _NON_WORD.sub(' ', text).split()]
+    tokens = [token.translate(ARABIC_TO_LATIN) for token in tokens if token not in GENERIC_WORDS]
+    if not tokens:
+        return str(name).strip().lower()
+    return ' '.join(sorted(tokens))
+
+
+def normalize_names(names):
+    """
+    Normalize a list of names, processing each distinct name once.
+
+    Returns:
+        list: Normalized keys, aligned with ``names``.
+    """
+    keys = {name: normalize_name(name) for name in dict.fromkeys(names)}
+    return [keys[name] for name in names]
+
+
+def normalization_cache_info():
+    """Hit/miss counters of the name cache (``functools.lru_cache`` info)."""
+    return normalize_name.cache_info()
@@ -0,0 +1,119 @@
+# processing/offers.py
+
+import threading
+
+import numpy as np
+import pandas as pd
+
+from config.config import OFFER_CACHE_SIZE
+
+OFFER_FIELDS = ('discount_pct', 'flat_amount', 'min_order', 'free_delivery', 'promo_type')
+
+_NUMBER = r'(\d+(?:\.\d+)?)'
+_CURRENCY = r'(?:aed|dhs?|dirhams?)'
+
+PERCENT_PATTERN = _NUMBER + r'\s*%'
+# "AED 10 off" or "10 AED off"
+FLAT_PATTERNS = (
+    _CURRENCY + r'\.?\s*' + _NUMBER + r'\s*off',
+    _NUMBER + r'\s*' + _CURRENCY + r'\.?\s*off',
+)
+MIN_ORDER_PATTERN = (
+    r'(?:above|over|min(?:imum)?(?:\s+order)?(?:\s+of)?|orders?\s+of)\s*' + _CURRENCY + r'?\.?\s*' + _NUMBER
+)
+FREE_DELIVERY_PATTERN = r'free\s+delivery|delivery\s+(?:is\s+)?free|\$0\s+delivery'
+BOGO_PATTERN = r'buy\s*\d+\s*get\s*\d+|\bbogo\b|\b1\s*\+\s*1\b'
+NO_OFFER_PATTERN = r'^\s*(?:no\s+offers?)?\s*$'
+
+_cache_lock = threading.Lock()
+_cache = pd.DataFrame(columns=list(OFFER_FIELDS))
+
+
+def _parse_distinct(offers):
+    """Parse an index of distinct offer strings with vectorized regexes."""
+    text = pd.Series(offers, index=offers, dtype=object).fillna('').astype(str).str.lower()
+
+    discount = pd.to_numeric(text.str.extract(PERCENT_PATTERN, expand=False), errors='coerce')
+    flat = pd.to_numeric(text.str.extract(FLAT_PATTERNS[0], expand=False), errors='coerce')
+    flat = flat.fillna(pd.to_numeric(text.str.extract(FLAT_PATTERNS[1], expand=False), errors='coerce'))
+    min_order = pd.to_numeric(text.str.extract(MIN_ORDER_PATTERN, expand=False), errors='coerce')
+    free_delivery = text.str.contains(FREE_DELIVERY_PATTERN, regex=True)
+    bogo = text.str.contains(BOGO_PATTERN, regex=True)
+    no_offer = text.str.match(NO_OFFER_PATTERN)
+
+    promo_type = np.select(
+        [no_offer, discount.notna(), flat.notna(), bogo, free_delivery],
+        ['none', 'percentage', 'flat', 'bogo', 'free_delivery'],
+        default='other'
+    )
+    return pd.DataFrame({
+        'discount_pct': discount,
+        'flat_amount': flat,
+        'min_order': min_order,
+        'free_delivery': free_delivery,
+        'promo_type': promo_type
+    }, index=text.index)
+
+
+def parse_offers(offers):
+    """
+    Turn a column of free-text offers into typed fields.
+
+    Only offer strings not parsed before are run through the regexes, once
+    per distinct string; the rest come from an in-memory cache (reset to the
+    current call's offers when it outgrows ``OFFER_CACHE_SIZE``).
+
+    Args:
+        offers (Series or list): Offer texts such as "20% off" or
+            "AED 10 off on orders above 50".
+
+    Returns:
+        DataFrame: One row per offer, aligned with the input, with
+            'discount_pct', 'flat_amount', 'min_order' (float, NaN when
+            absent), 'free_delivery' (bool) and 'promo_type' ('none',
+            'percentage', 'flat', 'bogo', 'free_delivery' or 'other').
+    """
+    global _cache
+    offers = pd.Series(offers, dtype=object) if not isinstance(offers, pd.Series) else offers
+    keys = offers.fillna('').astype(str)
+    distinct = pd.Index(keys.unique())
+
+    with _cache_lock:
+        missing = distinct.difference(_cache.index)
+        # Read the cached rows out before an eviction can drop them
+        fields = _cache.loc[distinct.intersection(_cache.index)]
+        if len(missing):
+            parsed = _parse_distinct(missing)
+            fields = pd.concat([fields, parsed]) if len(fields) else parsed
+            if len(_cache) + len(parsed) > OFFER_CACHE_SIZE:
+                # Keep this call's offers, the likeliest to come up again
+                _cache = fields.iloc[-OFFER_CACHE_SIZE:]
+            else:
+                _cache = pd.concat([_cache, parsed]) if len(_cache) else parsed
+
+    result = fields.reindex(keys.to_numpy())
+    result.index = offers.index
+    return result
+
+
+def offer_gaps(matched_df):
+    """
+    Compare the parsed Noon and Talabat offers of matched restaurants.
+
+    Args:
+        matched_df (DataFrame): 'matched' frame from ``compare_restaurants``.
+
+    Returns:
+        DataFrame: ``matched_df`` plus the offer fields suffixed ``_noon`` /
+            ``_talabat``, 'discount_gap' (Noon minus Talabat discount %, no
+            discount counting as 0) and 'same_promo_type'.
+    """
+    if matched_df.empty:
+        return matched_df.copy()
+
+    noon = parse_offers(matched_df['offer_noon']).add_suffix('_noon')
+    talabat = parse_offers(matched_df['offer_talabat']).add_suffix('_talabat')
+    result = pd.concat([matched_df, noon, talabat], axis=1)
+    result['discount_gap'] = result['discount_pct_noon'].fillna(0) - result['discount_pct_talabat'].fillna(0)
+    result['same_promo_type'] = result['promo_type_noon'] == result['promo_type_talabat']
+    return result
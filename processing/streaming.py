@@ -0,0 +1,123 @@
+# processing/streaming.py
+
+import itertools
+import threading
+
+import numpy as np
+import pandas as pd
+
+from .comparator import records_frame, side_frame
+from .matching import score_matrix
+from .normalization import normalize_names
+
+PLATFORMS = ('noon', 'talabat')
+
+
+class StreamingComparator:
+    """
+    Incremental Noon/Talabat comparison fed one scraped page at a time.
+
+    Each side keeps a live pool of records that have no match yet. A new
+    batch is scored only against the other side's pool (one ``cdist``
+    call); each record takes its best unmatched counterpart at or above the
+    threshold. Otherwise it joins its own pool to wait for later pages.
+    Matches are one-to-one and final once made, so ``finalize`` only
+    assembles the frames and does no scoring.
+
+    Safe to feed from several scraper threads.
+
+    Usage:
+        comparator = StreamingComparator(threshold=90)
+        for update in comparator.add('noon', page_records):
+            ...
+        results = comparator.finalize()
+    """
+
+    def __init__(self, threshold=90, normalize=True):
+        self.threshold = threshold
+        self.normalize = normalize
+        self._lock = threading.Lock()
+        self._ids = itertools.count()
+        # platform -> {record id: (key, record)}, in arrival order
+        self._unmatched = {platform: {} for platform in PLATFORMS}
+        self._matches = []
+
+    def _keys(self, records):
+        names = [str(record.get('name', '')) for record in records]
+        return normalize_names(names) if self.normalize else names
+
+    def add(self, platform, records):
+        """
+        Feed a batch of records scraped from one platform.
+
+        Args:
+            platform (str): 'noon' or 'talabat'.
+            records (list): Restaurant dicts with 'name' and 'offer'.
+
+        Returns:
+            list: Updates, in order. ``{'type': 'match', 'noon', 'talabat',
+                'similarity'}`` for each new match, and ``{'type': 'unmatched',
+                'platform', 'record'}`` for each record left waiting.
+        """
+        platform = platform.lower()
+        if platform not in PLATFORMS:
+            raise ValueError(f"Unknown platform: {platform}. Choose from {', '.join(PLATFORMS)}")
+        other = PLATFORMS[1 - PLATFORMS.index(platform)]
+        keys = self._keys(records)
+
+        with self._lock:
+            pool_ids = list(self._unmatched[other])
+            pool_keys = [self._unmatched[other][record_id][0] for record_id in pool_ids]
+            scores = score_matrix(keys, pool_keys)
+            taken = np.zeros(len(pool_ids), dtype=bool)
+
+            updates = []
+            for row, (key, record) in enumerate(zip(keys, records)):
+                column = None
+                if pool_ids:
+                    candidates = np.where(taken, -1, scores[row])
+                    column = int(candidates.argmax())
+                if column is not None and candidates[column] >= self.threshold:
+                    taken[column] = True
+                    _, counterpart = self._unmatched[other].pop(pool_ids[column])
+                    updates.append(self._match(platform, record, counterpart, float(scores[row, column])))
+                else:
+                    self._unmatched[platform][next(self._ids)] = (key, record)
+                    updates.append({'type': 'unmatched', 'platform': platform, 'record': record})
+        return updates
+
+    def _match(self, platform, record, counterpart, similarity):
+        noon, talabat = (record, counterpart) if platform == 'noon' else (counterpart, record)
+        match = {'type': 'match', 'noon': noon, 'talabat': talabat, 'similarity': similarity}
+        self._matches.append(match)
+        return match
+
+    def finalize(self):
+        """
+        Build the comparison from the current state.
+
+        Returns:
+            dict: 'matched', 'noon_only' and 'talabat_only' DataFrames, shaped
+                like ``compare_restaurants`` output.
+        """
+        with self._lock:
+            matches = list(self._matches)
+            pending = {platform: [record for _, record in pool.values()]
+                       for platform, pool in self._unmatched.items()}
+
+        if matches:
+            matched_df = pd.DataFrame([{
+                'name_noon': match['noon'].get('name'),
+                'offer_noon': match['noon'].get('offer'),
+                'name_talabat': match['talabat'].get('name'),
+                'offer_talabat': match['talabat'].get('offer'),
+                'similarity': match['similarity']
+            } for match in matches])
+        else:
+            matched_df = pd.DataFrame()
+
+        results = {'matched': matched_df}
+        for platform in PLATFORMS:
+            df = records_frame(pending[platform])
+            results[f'{platform}_only'] = side_frame(df, np.arange(len(df)), platform)
+        return results
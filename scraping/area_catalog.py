@@ -0,0 +1,152 @@
+# scraping/area_catalog.py
+
+import re
+import unicodedata
+
+# One entry per area: canonical key -> emirate, platform identifiers and
+# extra spellings users type. Keys, Noon names and Talabat codes are
+# aliases too, so they are not repeated under 'aliases'.
+AREAS = {
+    # Fujairah and East Coast
+    'kalba': {'emirate': 'Fujairah', 'talabat_code': '3862', 'noon_name': 'Kalba',
+              'aliases': ['kalba city', 'كلباء', 'khor kalba', 'kalba corniche']},
+    'khorfakkan': {'emirate': 'Fujairah', 'talabat_code': '3863', 'noon_name': 'Khorfakkan',
+                   'aliases': ['khor fakkan', 'khorfakan', 'خورفكان']},
+    'fujairah': {'emirate': 'Fujairah', 'talabat_code': '3864', 'noon_name': 'Fujairah City',
+                 'aliases': ['fujeirah', 'الفجيرة']},
+    'dibba': {'emirate': 'Fujairah', 'talabat_code': '3865', 'noon_name': 'Dibba Al Fujairah',
+              'aliases': ['dibba fujairah', 'diba', 'دبا']},
+    'al_faseel': {'emirate': 'Fujairah', 'talabat_code': '3866', 'noon_name': 'Al Faseel',
+                  'aliases': ['faseel', 'al fasseel', 'الفصيل', 'fujairah faseel']},
+    'al_owaid': {'emirate': 'Fujairah', 'talabat_code': '3867', 'noon_name': 'Al Owaid', 'aliases': []},
+    'mirbah': {'emirate': 'Fujairah', 'talabat_code': '3868', 'noon_name': 'Mirbah', 'aliases': ['مربح']},
+    'aqah': {'emirate': 'Fujairah', 'talabat_code': '3869', 'noon_name': 'Aqah', 'aliases': []},
+    'merashid': {'emirate': 'Fujairah', 'talabat_code': '3870', 'noon_name': 'Merashid', 'aliases': []},
+    'bidiya': {'emirate': 'Fujairah', 'talabat_code': '3871', 'noon_name': 'Bidiya', 'aliases': ['bidiyah']},
+    'dhadna': {'emirate': 'Fujairah', 'talabat_code': '3872', 'noon_name': 'Dhadna', 'aliases': []},
+    'qidfa': {'emirate': 'Fujairah', 'talabat_code': '3873', 'noon_name': 'Qidfa', 'aliases': []},
+    'sakamkam': {'emirate': 'Fujairah', 'talabat_code': '3874', 'noon_name': 'Sakamkam', 'aliases': []},
+    'murbah': {'emirate': 'Fujairah', 'talabat_code': '3875', 'noon_name': 'Murbah', 'aliases': []},
+    'ghurfah': {'emirate': 'Fujairah', 'talabat_code': '3876', 'noon_name': 'Ghurfah', 'aliases': []},
+    'zubarah': {'emirate': 'Fujairah', 'talabat_code': '3877', 'noon_name': 'Zubarah', 'aliases': []},
+
+    # Sharjah
+    'sharjah_city': {'emirate': 'Sharjah', 'talabat_code': '3850', 'noon_name': 'Sharjah City',
+                     'aliases': ['sharjah', 'الشارقة']},
+    'al_nahda_sharjah': {'emirate': 'Sharjah', 'talabat_code': '3851', 'noon_name': 'Al Nahda Sharjah',
+                         'aliases': ['al nahda', 'النهدة']},
+    'al_majaz': {'emirate': 'Sharjah', 'talabat_code': '3852', 'noon_name': 'Al Majaz', 'aliases': ['المجاز']},
+    'al_qasimia': {'emirate': 'Sharjah', 'talabat_code': '3853', 'noon_name': 'Al Qasimia',
+                   'aliases': ['al qasimiya', 'القاسمية']},
+    'al_taawun': {'emirate': 'Sharjah', 'talabat_code': '3854', 'noon_name': 'Al Taawun', 'aliases': ['التعاون']},
+    'al_khan': {'emirate': 'Sharjah', 'talabat_code': '3855', 'noon_name': 'Al Khan', 'aliases': ['الخان']},
+    'abu_shagara': {'emirate': 'Sharjah', 'talabat_code': '3856', 'noon_name': 'Abu Shagara',
+                    'aliases': ['abu shagarah']},
+    'al_mamzar': {'emirate': 'Sharjah', 'talabat_code': '3857', 'noon_name': 'Al Mamzar', 'aliases': ['الممزر']},
+
+    # Ajman
+    'ajman_city': {'emirate': 'Ajman', 'talabat_code': '3840', 'noon_name': 'Ajman City',
+                   'aliases': ['ajman', 'عجمان']},
+    'al_nuaimia': {'emirate': 'Ajman', 'talabat_code': '3841', 'noon_name': 'Al Nuaimia',
+                   'aliases': ['al nuaimiya', 'النعيمية']},
+    'al_rashidiya': {'emirate': 'Ajman', 'talabat_code': '3842', 'noon_name': 'Al Rashidiya',
+                     'aliases': ['الراشدية']},
+    'al_jurf': {'emirate': 'Ajman', 'talabat_code': '3843', 'noon_name': 'Al Jurf', 'aliases': ['الجرف']},
+    'mushairef': {'emirate': 'Ajman', 'talabat_code': '3844', 'noon_name': 'Mushairef', 'aliases': ['mushairif']},
+    'al_zahra': {'emirate': 'Ajman', 'talabat_code': '3845', 'noon_name': 'Al Zahra', 'aliases': []},
+
+    # Ras Al Khaimah
+    'ras_al_khaimah_city': {'emirate': 'RAK', 'talabat_code': '3830', 'noon_name': 'Ras Al Khaimah City',
+                            'aliases': ['ras al khaimah', 'rak', 'رأس الخيمة']},
+    'al_nakheel': {'emirate': 'RAK', 'talabat_code': '3831', 'noon_name': 'Al Nakheel', 'aliases': ['النخيل']},
+    'al_dhait': {'emirate': 'RAK', 'talabat_code': '3832', 'noon_name': 'Al Dhait', 'aliases': []},
+    'al_mamourah': {'emirate': 'RAK', 'talabat_code': '3833', 'noon_name': 'Al Mamourah', 'aliases': []},
+    'al_rams': {'emirate': 'RAK', 'talabat_code': '3834', 'noon_name': 'Al Rams', 'aliases': ['الرمس']},
+    'khuzam': {'emirate': 'RAK', 'talabat_code': '3835', 'noon_name': 'Khuzam', 'aliases': []},
+    'al_hamra': {'emirate': 'RAK', 'talabat_code': '3836', 'noon_name': 'Al Hamra', 'aliases': ['الحمراء']},
+
+    # Umm Al Quwain
+    'umm_al_quwain_city': {'emirate': 'UAQ', 'talabat_code': '3820', 'noon_name': 'Umm Al Quwain City',
+                           'aliases': ['umm al quwain', 'uaq', 'أم القيوين']},
+    'al_raudah': {'emirate': 'UAQ', 'talabat_code': '3821', 'noon_name': 'Al Raudah', 'aliases': []},
+    'al_riqqah': {'emirate': 'UAQ', 'talabat_code': '3822', 'noon_name': 'Al Riqqah', 'aliases': []},
+    'al_salama': {'emirate': 'UAQ', 'talabat_code': '3823', 'noon_name': 'Al Salama', 'aliases': ['السلامة']},
+}
+
+# Area keys grouped by emirate, in catalogue order
+EMIRATES = {}
+for _key, _area in AREAS.items():
+    EMIRATES.setdefault(_area['emirate'], []).append(_key)
+
+_ARABIC_FOLD = str.maketrans({'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ة': 'ه', 'ى': 'ي'})
+_SEPARATORS = re.compile(r"[\s\-_/,.'’]+")
+
+
+def normalize_alias(text):
+    """Lowercase, fold Arabic letter variants and collapse hyphens, underscores and spaces."""
+    text = unicodedata.normalize('NFKC', str(text)).lower().translate(_ARABIC_FOLD)
+    return _SEPARATORS.sub(' ', text).strip()
+
+
+def _area_aliases(key, area):
+    return [key, area['noon_name'], area['talabat_code']] + list(area['aliases'])
+
+
+def _build_alias_index():
+    """
+    Map every normalized alias to its area key.
+
+    Spaced forms ("al faseel") are registered before compact ones
+    ("alfaseel"), so a compact form never shadows a real alias.
+    """
+    index = {}
+    for key, area in AREAS.items():
+        for alias in _area_aliases(key, area):
+            index.setdefault(normalize_alias(alias), key)
+    for key, area in AREAS.items():
+        for alias in _area_aliases(key, area):
+            index.setdefault(normalize_alias(alias).replace(' ', ''), key)
+    return index
+
+
+ALIAS_INDEX = _build_alias_index()
+
+
+def resolve_area(area_input):
+    """
+    Resolve user input to an area with both platform identifiers.
+
+    Accepts the area key, Noon name, Talabat code or any alias, in any case
+    and with hyphens, underscores or spaces, via a single dict lookup.
+
+    Args:
+        area_input (str): User input area name
+
+    Returns:
+        dict: 'key', 'alternatives', 'talabat_code', 'noon_name', 'emirate',
+            'original_input' and 'is_valid'. Unknown input gives
+            ``is_valid=False`` and None identifiers.
+    """
+    alias = normalize_alias(area_input)
+    key = ALIAS_INDEX.get(alias) or ALIAS_INDEX.get(alias.replace(' ', ''))
+    if key is None:
+        return {
+            'key': alias.replace(' ', '_'),
+            'alternatives': [],
+            'talabat_code': None,
+            'noon_name': None,
+            'emirate': None,
+            'original_input': area_input,
+            'is_valid': False
+        }
+
+    area = AREAS[key]
+    return {
+        'key': key,
+        'alternatives': list(area['aliases']),
+        'talabat_code': area['talabat_code'],
+        'noon_name': area['noon_name'],
+        'emirate': area['emirate'],
+        'original_input': area_input,
+        'is_valid': True
+    }
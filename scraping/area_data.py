@@ -1,99 +1,34 @@
-# Platform-specific area codes/identifiers
+from .area_catalog import AREAS, resolve_area
+
+# Platform-specific area codes/identifiers, derived from the area catalogue
 PLATFORM_CODES = {
-    'talabat': {
-        # Fujairah and East Coast
-        'al_faseel': '3866',
-        'kalba': '3862',
-        'khorfakkan': '3863',
-        'fujairah': '3864',
-        'dibba': '3865',
-        'al_owaid': '3867',
-        'mirbah': '3868',
-        'aqah': '3869',
-        # ... (keep other area codes)
-    },
-    'noon': {
-        # Standardized names for Noon
-        'al_faseel': 'Al Faseel',
-        'kalba': 'Kalba',
-        'khorfakkan': 'Khorfakkan',
-        'fujairah': 'Fujairah City',
-        'dibba': 'Dibba Al Fujairah',
-        'al_owaid': 'Al Owaid',
-        'mirbah': 'Mirbah',
-        'aqah': 'Aqah',
-        # ... (keep other area names)
-    }
+    'talabat': {key: area['talabat_code'] for key, area in AREAS.items()},
+    'noon': {key: area['noon_name'] for key, area in AREAS.items()}
 }
 
-# Update UAE_AREAS with correct structure
 UAE_AREAS = {
-    'al_faseel': {
-        'alternatives': [
-            'faseel',
-            'al fasseel',
-            'الفصيل',
-            'fujairah faseel',
-            'al-faseel'  # Added hyphenated version
-        ],
-        'talabat_code': PLATFORM_CODES['talabat']['al_faseel'],
-        'noon_name': PLATFORM_CODES['noon']['al_faseel']
-    },
-    'kalba': {
-        'alternatives': [
-            'kalba city',
-            'كلباء',
-            'khor kalba',
-            'kalba corniche'
-        ],
-        'talabat_code': PLATFORM_CODES['talabat']['kalba'],
-        'noon_name': PLATFORM_CODES['noon']['kalba']
-    },
-    # ... (continue for other areas)
+    key: {
+        'alternatives': area['aliases'],
+        'talabat_code': area['talabat_code'],
+        'noon_name': area['noon_name']
+    }
+    for key, area in AREAS.items()
 }
 
 def get_area_info(area_input):
     """
     Get all information about an area including platform-specific codes.
-    
+
+    Resolved through the shared alias index in ``area_catalog``, so this
+    and ``AreaMapping.get_area_info`` always agree.
+
     Args:
         area_input (str): User input area name
-        
+
     Returns:
         dict: Area information including alternatives and platform codes
     """
-    # Normalize input
-    area_key = area_input.lower().replace('-', '_').replace(' ', '_')
-    
-    # Direct match
-    if area_key in UAE_AREAS:
-        return {
-            'key': area_key,
-            'alternatives': UAE_AREAS[area_key]['alternatives'],
-            'talabat_code': UAE_AREAS[area_key]['talabat_code'],
-            'noon_name': UAE_AREAS[area_key]['noon_name'],
-            'is_valid': True
-        }
-    
-    # Search through alternatives
-    for key, data in UAE_AREAS.items():
-        if any(area_input.lower() in alt.lower() for alt in data['alternatives']):
-            return {
-                'key': key,
-                'alternatives': data['alternatives'],
-                'talabat_code': data['talabat_code'],
-                'noon_name': data['noon_name'],
-                'is_valid': True
-            }
-    
-    # No match found
-    return {
-        'key': area_key,
-        'alternatives': [],
-        'talabat_code': None,
-        'noon_name': None,
-        'is_valid': False
-    }
+    return resolve_area(area_input)
 
 def get_all_uae_areas():
     """Returns a structured dictionary of all UAE areas"""
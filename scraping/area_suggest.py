@@ -0,0 +1,129 @@
+# scraping/area_suggest.py
+
+from .area_catalog import AREAS, normalize_alias
+
+# Results kept per trie node; suggestion limits above this fall back to fuzzy hits
+MAX_PREFIX_RESULTS = 20
+
+
+def _grams(text, n=3):
+    text = f' {text} '
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class AreaSuggester:
+    """
+    Ranked area suggestions for partial, misspelled input.
+
+    Built once over every area's Noon name, key and aliases:
+
+    - a prefix trie over the start of every word of every alias, whose
+      nodes already hold their best-ranked areas, so a prefix lookup is a
+      walk of ``len(partial)`` steps;
+    - a trigram index used to fill the remaining slots with typo-tolerant
+      matches ranked by Dice similarity.
+
+    Suggestions are area display names (Noon names), best first.
+    """
+
+    def __init__(self, areas=AREAS):
+        self.names = {key: area['noon_name'] for key, area in areas.items()}
+        self._trie = {}
+        self._grams = {}
+        self._alias_grams = []
+
+        aliases = []
+        for key, area in areas.items():
+            aliases.append((0, normalize_alias(area['noon_name']), key))
+            for alias in [key] + list(area['aliases']):
+                aliases.append((1, normalize_alias(alias), key))
+
+        # Insert whole-alias prefixes before later-word ones, display names
+        # before aliases and short before long, so nodes keep the best areas
+        suffixes = []
+        for kind, alias, key in aliases:
+            words = alias.split(' ')
+            for start in range(len(words)):
+                suffixes.append((start > 0, kind, len(alias), ' '.join(words[start:]), key))
+        for *_, text, key in sorted(suffixes):
+            self._insert(text, key)
+
+        for _, alias, key in aliases:
+            grams = _grams(alias)
+            position = len(self._alias_grams)
+            self._alias_grams.append((key, len(grams)))
+            for gram in grams:
+                self._grams.setdefault(gram, []).append(position)
+
+        # Grams shared by a large share of aliases (" al", "al ") would make
+        # every fuzzy lookup walk most of the catalogue; they only count
+        # toward the Dice denominator
+        common = max(100, len(self._alias_grams) // 20)
+        self._grams = {gram: positions for gram, positions in self._grams.items() if len(positions) <= common}
+
+    def _insert(self, text, key):
+        node = self._trie
+        for char in text:
+            node = node.setdefault(char, {})
+            ranked = node.setdefault('', [])
+            if key not in ranked and len(ranked) < MAX_PREFIX_RESULTS:
+                ranked.append(key)
+
+    def _prefix_keys(self, partial):
+        node = self._trie
+        for char in partial:
+            node = node.get(char)
+            if node is None:
+                return []
+        return node.get('', [])
+
+    def _fuzzy_keys(self, partial, min_similarity):
+        grams = _grams(partial)
+        shared = {}
+        for gram in grams:
+            for position in self._grams.get(gram, ()):
+                shared[position] = shared.get(position, 0) + 1
+
+        best = {}
+        for position, count in shared.items():
+            key, alias_gram_count = self._alias_grams[position]
+            similarity = 2 * count / (len(grams) + alias_gram_count)
+            if similarity >= min_similarity and similarity > best.get(key, 0):
+                best[key] = similarity
+        return sorted(best, key=lambda key: -best[key])
+
+    def suggest(self, partial_input, limit=10, min_similarity=0.4):
+        """
+        Suggest area names for partial or misspelled input.
+
+        Args:
+            partial_input (str): What the user typed so far.
+            limit (int): Maximum number of suggestions.
+            min_similarity (float): Minimum trigram Dice similarity for fuzzy hits.
+
+        Returns:
+            list: Noon area names, prefix matches first, then fuzzy matches.
+        """
+        partial = normalize_alias(partial_input)
+        if not partial:
+            return []
+
+        keys = list(self._prefix_keys(partial)[:limit])
+        if len(keys) < limit and len(partial) >= 3:
+            for key in self._fuzzy_keys(partial, min_similarity):
+                if key not in keys:
+                    keys.append(key)
+                    if len(keys) == limit:
+                        break
+        return [self.names[key] for key in keys]
+
+
+_suggester = None
+
+
+def get_area_suggester():
+    """Shared suggester, built on first use."""
+    global _suggester
+    if _suggester is None:
+        _suggester = AreaSuggester()
+    return _suggester
@@ -0,0 +1,154 @@
+# scraping/browser_profile.py
+
+import logging
+import threading
+
+from selenium import webdriver
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+
+# URL patterns the lean profile never downloads; the scrapers only read text
+BLOCKED_RESOURCE_PATTERNS = [
+    # Images and media
+    '*.png', '*.jpg', '*.jpeg', '*.gif', '*.webp', '*.avif', '*.svg', '*.ico',
+    '*.mp4', '*.webm', '*.mp3',
+    # Web fonts
+    '*.woff', '*.woff2', '*.ttf', '*.otf', '*.eot',
+]
+
+BLOCKED_HOSTS = [
+    'google-analytics.com', 'googletagmanager.com', 'doubleclick.net',
+    'facebook.net', 'connect.facebook.com', 'hotjar.com', 'clarity.ms',
+    'segment.io', 'segment.com', 'braze.com', 'appsflyer.com', 'onelink.me',
+    'newrelic.com', 'nr-data.net', 'datadoghq.com', 'browser-intake-datadoghq.com',
+    'optimizely.com', 'branch.io', 'sentry.io', 'tiktok.com', 'snapchat.com',
+]
+
+CSS_PATTERNS = ['*.css']
+
+_stats_lock = threading.Lock()
+
+# Sums the bytes fetched for the current document and its subresources
+PAGE_METRICS_SCRIPT = """
+const navigation = performance.getEntriesByType('navigation')[0];
+const resources = performance.getEntriesByType('resource');
+let bytes = navigation ? navigation.transferSize : 0;
+resources.forEach((entry) => { bytes += entry.transferSize || 0; });
+return {
+    bytes: bytes,
+    resources: resources.length,
+    seconds: navigation ? navigation.duration / 1000 : null
+};
+"""
+
+
+def blocked_url_patterns(block_css=False):
+    """URL patterns blocked by the lean profile."""
+    patterns = BLOCKED_RESOURCE_PATTERNS + [f'*{host}*' for host in BLOCKED_HOSTS]
+    if block_css:
+        patterns += CSS_PATTERNS
+    return patterns
+
+
+def build_options(browser, profile='default', block_css=False):
+    """
+    Build headless browser options.
+
+    Args:
+        browser (str): 'chrome' or 'firefox'.
+        profile (str): 'default' for a stock browser, or 'lean' to skip
+            images, media, fonts and trackers and stop at DOMContentLoaded.
+        block_css (bool): With the lean profile, also skip stylesheets.
+
+    Returns:
+        Options: Options for ``webdriver.Chrome`` or ``webdriver.Firefox``.
+    """
+    if profile not in ('default', 'lean'):
+        raise ValueError(f"Unknown browser profile: {profile}")
+
+    if browser == 'chrome':
+        options = ChromeOptions()
+    elif browser == 'firefox':
+        options = webdriver.FirefoxOptions()
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+
+    options.add_argument('--headless')
+    options.add_argument('--no-sandbox')
+    options.add_argument('--disable-dev-shm-usage')
+
+    if profile == 'default':
+        return options
+
+    # Return from driver.get() once the DOM is ready; readiness waits do the rest
+    options.page_load_strategy = 'eager'
+
+    if browser == 'chrome':
+        content_settings = {'images': 2, 'media_stream': 2, 'plugins': 2}
+        if block_css:
+            content_settings['stylesheets'] = 2
+        options.add_experimental_option('prefs', {
+            f'profile.managed_default_content_settings.{name}': value
+            for name, value in content_settings.items()
+        })
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument('--mute-audio')
+    else:
+        options.set_preference('permissions.default.image', 2)
+        options.set_preference('gfx.downloadable_fonts.enabled', False)
+        options.set_preference('media.autoplay.default', 5)
+        options.set_preference('media.mediasource.enabled', False)
+        options.set_preference('privacy.trackingprotection.enabled', True)
+        options.set_preference('privacy.trackingprotection.socialtracking.enabled', True)
+        options.set_preference('browser.cache.disk.enable', False)
+        if block_css:
+            options.set_preference('permissions.default.stylesheet', 2)
+
+    return options
+
+
+def apply_request_blocking(driver, browser, profile='default', block_css=False):
+    """
+    Block fonts, media and third-party hosts on a started driver.
+
+    Chrome blocks by URL pattern over DevTools. Firefox has no such hook, so
+    it relies on the preferences set in ``build_options`` and its built-in
+    tracking protection list.
+    """
+    if profile != 'lean' or browser != 'chrome':
+        return
+    try:
+        driver.execute_cdp_cmd('Network.enable', {})
+        driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': blocked_url_patterns(block_css)})
+    except Exception as e:
+        logging.warning(f"Could not enable request blocking: {e}")
+
+
+def record_page_metrics(driver, stats, page):
+    """
+    Add the current page's transferred bytes and load time to ``stats``.
+
+    Updates ``stats['bytes_transferred']`` and appends to ``stats['pages']``.
+    Cross-origin resources without Timing-Allow-Origin report 0 bytes, so the
+    total is a lower bound.
+    """
+    if stats is None:
+        return
+    try:
+        metrics = driver.execute_script(PAGE_METRICS_SCRIPT) or {}
+    except Exception as e:
+        logging.debug(f"Could not read page metrics: {e}")
+        return
+    add_page_metrics(stats, page, metrics.get('bytes') or 0, metrics.get('seconds'))
+
+
+def add_page_metrics(stats, page, bytes_transferred, seconds):
+    """Record one page's transfer size and load time in ``stats``."""
+    if stats is None:
+        return
+    with _stats_lock:
+        stats['bytes_transferred'] = stats.get('bytes_transferred', 0) + int(bytes_transferred)
+        stats.setdefault('pages', []).append({
+            'page': page,
+            'bytes': int(bytes_transferred),
+            'seconds': round(seconds, 3) if seconds is not None else None
+        })
@@ -0,0 +1,343 @@
+# scraping/driver_pool.py
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.webdriver.chrome.service import Service as ChromeService
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from config.config import (
+    BLOCK_CSS, BROWSER_PROFILE, CACHE_DIR, DRIVER_MAX_PAGES, DRIVER_MAX_RSS_MB, DRIVER_POOL_MAX_BROWSERS
+)
+from .browser_profile import apply_request_blocking, build_options
+
+try:
+    import psutil
+except ImportError:  # RSS-based recycling is skipped without psutil
+    psutil = None
+
+DRIVER_PATHS_FILE = os.path.join(CACHE_DIR, 'driver_paths.json')
+
+_driver_paths_lock = threading.Lock()
+
+CLEAR_STORAGE_SCRIPT = """
+try { window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage.clear(); } catch (e) {}
+"""
+
+
+def _install_driver(browser):
+    if browser == 'chrome':
+        from webdriver_manager.chrome import ChromeDriverManager
+        return ChromeDriverManager().install()
+    if browser == 'firefox':
+        from webdriver_manager.firefox import GeckoDriverManager
+        return GeckoDriverManager().install()
+    raise ValueError(f"Unsupported browser: {browser}")
+
+
+def resolve_driver_path(browser):
+    """
+    Return the driver binary path for a browser, resolving it only once.
+
+    Paths found by webdriver_manager are stored in ``DRIVER_PATHS_FILE`` so
+    later processes start without a network lookup.
+
+    Args:
+        browser (str): 'chrome' or 'firefox'.
+
+    Returns:
+        str: Path to chromedriver or geckodriver.
+    """
+    with _driver_paths_lock:
+        try:
+            with open(DRIVER_PATHS_FILE) as f:
+                paths = json.load(f)
+        except (OSError, ValueError):
+            paths = {}
+
+        path = paths.get(browser)
+        if path and os.path.exists(path):
+            return path
+
+        path = _install_driver(browser)
+        paths[browser] = path
+        try:
+            os.makedirs(os.path.dirname(DRIVER_PATHS_FILE), exist_ok=True)
+            with open(DRIVER_PATHS_FILE, 'w') as f:
+                json.dump(paths, f, indent=2)
+        except OSError as e:
+            logging.warning(f"Could not cache driver path: {e}")
+        return path
+
+
+def create_driver(browser, profile=BROWSER_PROFILE, block_css=BLOCK_CSS):
+    """
+    Start a headless Chrome or Firefox driver.
+
+    Args:
+        browser (str): 'chrome' or 'firefox'.
+        profile (str): Browser profile, see ``browser_profile.build_options``.
+        block_css (bool): With the lean profile, also skip stylesheets.
+    """
+    options = build_options(browser, profile, block_css)
+
+    if browser == 'chrome':
+        driver = webdriver.Chrome(service=ChromeService(resolve_driver_path('chrome')), options=options)
+    else:
+        driver = webdriver.Firefox(service=FirefoxService(resolve_driver_path('firefox')), options=options)
+
+    apply_request_blocking(driver, browser, profile, block_css)
+    return driver
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception as e:
+        logging.warning(f"Error closing driver: {e}")
+
+
+def _reset(driver):
+    """
+    Wipe a driver's cookies and storage and park it on a blank page.
+
+    Returns False when the driver did not respond and should be discarded.
+    """
+    try:
+        # Storage is per origin, so clear it before leaving the last page
+        driver.execute_script(CLEAR_STORAGE_SCRIPT)
+        if hasattr(driver, 'execute_cdp_cmd'):
+            # Chromium can drop cookies of every domain, not just the current one
+            driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+        driver.delete_all_cookies()
+        driver.get("about:blank")
+        return True
+    except Exception as e:
+        logging.warning(f"Could not reset driver: {e}")
+        return False
+
+
+def driver_rss_mb(driver):
+    """Resident memory of the driver and its browser processes, or None when unknown."""
+    if psutil is None:
+        return None
+    try:
+        process = psutil.Process(driver.service.process.pid)
+        processes = [process] + process.children(recursive=True)
+        return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class DriverPool:
+    """
+    Process-wide pool of warm browser drivers.
+
+    Drivers are kept per (browser, profile), checked out with
+    ``acquire``/``release`` (or the ``driver`` context manager) and reused
+    across scrape runs. The number of live
+    browsers is capped; a driver is recycled once it has served
+    ``max_pages`` pages or its processes exceed ``max_rss_mb``.
+
+    The lock only guards the pool's bookkeeping; health checks, resets and
+    ``quit`` calls talk to the browser outside it, so one slow driver does
+    not hold up the threads checking out others.
+    """
+
+    def __init__(self, max_browsers=DRIVER_POOL_MAX_BROWSERS, max_pages=DRIVER_MAX_PAGES,
+                 max_rss_mb=DRIVER_MAX_RSS_MB, factory=None):
+        self.max_browsers = max_browsers
+        self.max_pages = max_pages
+        self.max_rss_mb = max_rss_mb
+        self._factory = factory or create_driver
+        self._condition = threading.Condition()
+        self._idle = {}  # (browser, profile) -> list of idle drivers
+        self._meta = {}  # id(driver) -> {'key', 'pages', 'created'}
+        self._closed = False
+
+    @property
+    def size(self):
+        """Number of live browsers, idle or checked out."""
+        with self._condition:
+            return len(self._meta)
+
+    def _is_healthy(self, driver):
+        try:
+            return driver.execute_script("return 1;") == 1
+        except Exception:
+            return False
+
+    def _needs_recycle(self, driver, browser, pages):
+        if self.max_pages and pages >= self.max_pages:
+            logging.info(f"Recycling {browser} driver after {pages} pages")
+            return True
+        rss = driver_rss_mb(driver) if self.max_rss_mb else None
+        if rss is not None and rss > self.max_rss_mb:
+            logging.info(f"Recycling {browser} driver at {rss:.0f} MB RSS")
+            return True
+        return False
+
+    def _forget(self, driver):
+        """Free a driver's slot. Must be called with the lock held; quit the driver after releasing it."""
+        self._meta.pop(id(driver), None)
+        self._condition.notify_all()
+
+    def _discard(self, driver):
+        """Free a driver's slot and quit it. Must be called without the lock."""
+        with self._condition:
+            self._forget(driver)
+        _quit(driver)
+
+    def _evict_idle_other(self, key):
+        """Free a slot held by an idle driver of another browser or profile; returns that driver."""
+        for other, drivers in self._idle.items():
+            if other != key and drivers:
+                driver = drivers.pop()
+                self._forget(driver)
+                return driver
+        return None
+
+    def acquire(self, browser, timeout=None, profile=BROWSER_PROFILE):
+        """
+        Check out a driver, reusing an idle one when possible.
+
+        Args:
+            browser (str): 'chrome' or 'firefox'.
+            timeout (float, optional): Seconds to wait for a free slot.
+            profile (str): 'default' or 'lean', see ``browser_profile``.
+
+        Returns:
+            WebDriver: A healthy driver owned by the caller until released.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        key = (browser, profile)
+
+        while True:
+            driver = evicted = None
+            with self._condition:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("Driver pool is closed")
+
+                    idle = self._idle.setdefault(key, [])
+                    if idle:
+                        driver = idle.pop()
+                        break
+
+                    if len(self._meta) >= self.max_browsers:
+                        evicted = self._evict_idle_other(key)
+                    if len(self._meta) < self.max_browsers:
+                        # Reserve the slot before starting the browser outside the lock
+                        placeholder = object()
+                        self._meta[id(placeholder)] = {'key': key, 'pages': 0, 'created': time.time()}
+                        break
+
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"No {browser} driver available within {timeout}s")
+                    self._condition.wait(remaining)
+
+            if evicted is not None:
+                _quit(evicted)
+            if driver is None:
+                break
+            if self._is_healthy(driver):
+                return driver
+            logging.warning(f"Discarding unhealthy {browser} driver")
+            self._discard(driver)
+
+        try:
+            driver = self._factory(browser, profile)
+        except Exception:
+            with self._condition:
+                self._meta.pop(id(placeholder), None)
+                self._condition.notify_all()
+            raise
+
+        with self._condition:
+            self._meta[id(driver)] = self._meta.pop(id(placeholder))
+        logging.info(f"Started {profile} {browser} driver ({self.size}/{self.max_browsers} browsers)")
+        return driver
+
+    def note_pages(self, driver, count=1):
+        """Count pages served by a checked-out driver towards its recycle limit."""
+        with self._condition:
+            meta = self._meta.get(id(driver))
+            if meta is not None:
+                meta['pages'] += count
+
+    def release(self, driver, discard=False):
+        """
+        Return a checked-out driver to the pool.
+
+        The driver's cookies and storage are wiped first, so one run's
+        delivery location or session never leaks into the next.
+
+        Args:
+            driver (WebDriver): Driver obtained from ``acquire``.
+            discard (bool): Quit the driver instead of keeping it warm, e.g.
+                after an error that may have left it in a bad state.
+        """
+        with self._condition:
+            meta = self._meta.get(id(driver))
+            if meta is not None:
+                key, pages = meta['key'], meta['pages']
+                discard = discard or self._closed
+
+        if meta is None:
+            _quit(driver)
+            return
+        if discard or self._needs_recycle(driver, key[0], pages) or not _reset(driver):
+            self._discard(driver)
+            return
+
+        with self._condition:
+            if not self._closed:
+                self._idle.setdefault(key, []).append(driver)
+                self._condition.notify_all()
+                return
+        self._discard(driver)
+
+    @contextmanager
+    def driver(self, browser, timeout=None, profile=BROWSER_PROFILE):
+        """Context manager around ``acquire``/``release``; errors discard the driver."""
+        driver = self.acquire(browser, timeout, profile)
+        try:
+            yield driver
+        except Exception:
+            self.release(driver, discard=True)
+            raise
+        else:
+            self.release(driver)
+
+    def close(self):
+        """Quit all idle drivers; checked-out drivers are quit when released."""
+        with self._condition:
+            self._closed = True
+            drivers = [driver for idle in self._idle.values() for driver in idle]
+            self._idle.clear()
+            for driver in drivers:
+                self._forget(driver)
+        for driver in drivers:
+            _quit(driver)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_driver_pool():
+    """Return the process-wide driver pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool()
+            atexit.register(_pool.close)
+        return _pool
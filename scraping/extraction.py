@@ -0,0 +1,95 @@
+# scraping/extraction.py
+
+from bs4 import BeautifulSoup
+
+# CSS selectors for the vendor cards of each platform
+SELECTORS = {
+    'talabat': {
+        'platform': 'Talabat',
+        'card': '.fFuryH .vendor-card',
+        'name': '.content h2',
+        'offer': '.offer-text',
+    },
+    'noon': {
+        'platform': 'Noon',
+        'card': 'a.drpCiq',
+        'name': 'p.title',
+        'offer': 'span.hBQSxC',
+    },
+}
+
+# Collects every card on the page in a single WebDriver round trip
+EXTRACT_CARDS_SCRIPT = """
+const [cardSelector, nameSelector, offerSelector] = arguments;
+const cards = [];
+document.querySelectorAll(cardSelector).forEach((card) => {
+    const name = card.querySelector(nameSelector);
+    if (!name) {
+        return;
+    }
+    const offer = card.querySelector(offerSelector);
+    cards.push({
+        name: name.innerText.trim(),
+        offer: offer ? offer.innerText.trim() : null
+    });
+});
+return cards;
+"""
+
+
+def _record(platform, name, offer, page):
+    return {
+        'name': name,
+        'offer': offer if offer is not None else "No Offer",
+        'platform': SELECTORS[platform]['platform'],
+        'page': page
+    }
+
+
+def extract_cards(driver, platform, page):
+    """
+    Extract all vendor cards on the current page with one ``execute_script`` call.
+
+    Args:
+        driver (WebDriver): Driver showing a listing page.
+        platform (str): Key into ``SELECTORS`` ('talabat' or 'noon').
+        page (int): Page number stored on each record.
+
+    Returns:
+        list: List of dictionaries with restaurant data.
+    """
+    selectors = SELECTORS[platform]
+    cards = driver.execute_script(
+        EXTRACT_CARDS_SCRIPT, selectors['card'], selectors['name'], selectors['offer']
+    ) or []
+    return [_record(platform, card['name'], card['offer'], page) for card in cards if card['name']]
+
+
+def parse_cards(html, platform, page):
+    """
+    Extract all vendor cards from page source parsed once with BeautifulSoup.
+
+    Args:
+        html (str or BeautifulSoup): Page source, or an already parsed document.
+        platform (str): Key into ``SELECTORS`` ('talabat' or 'noon').
+        page (int): Page number stored on each record.
+
+    Returns:
+        list: List of dictionaries with restaurant data.
+    """
+    selectors = SELECTORS[platform]
+    soup = html if isinstance(html, BeautifulSoup) else BeautifulSoup(html, 'html.parser')
+
+    restaurants = []
+    for card in soup.select(selectors['card']):
+        name_element = card.select_one(selectors['name'])
+        if name_element is None:
+            continue
+        name = name_element.get_text(strip=True)
+        if not name:
+            continue
+        offer_element = card.select_one(selectors['offer'])
+        offer = offer_element.get_text(strip=True) if offer_element is not None else None
+        restaurants.append(_record(platform, name, offer, page))
+
+    return restaurants
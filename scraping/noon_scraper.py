@@ -1,34 +1,107 @@
 # scraping/noon_scraper.py
 
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
+from selenium.common.exceptions import TimeoutException
 import logging
+from config.config import BROWSER_PROFILE
 from .area_mapping import AreaMapping
+from .browser_profile import record_page_metrics
+from .driver_pool import create_driver, get_driver_pool
+from .extraction import SELECTORS, extract_cards
+from .pagination import find_last_page, paginate, report_error
+from .noon_session import capture_session, inject_session, invalidate_session, load_session, save_session
+from .readiness import PageReadiness
+
+NOON_HOME_URL = "https://food.noon.com/"
+NOON_SEARCH_URL = "https://food.noon.com/search/"
 
 def setup_driver():
-    chrome_options = Options()
-    chrome_options.add_argument('--headless')
-    chrome_options.add_argument('--no-sandbox')
-    chrome_options.add_argument('--disable-dev-shm-usage')
+    """Start a standalone Chrome driver (scrape_noon_food uses the shared pool)."""
+    return create_driver('chrome')
+
+def _select_location(driver, ready, area_name):
+    """Pick the delivery location through the Noon UI and open the restaurant list."""
+    # Load the main page
+    logging.info("Loading main page...")
+    driver.get(NOON_HOME_URL)
+    
+    # Find and interact with the search box
+    search_box = ready.until('search_box', EC.element_to_be_clickable(
+        (By.CSS_SELECTOR, "input[placeholder='Search your location']")
+    ), timeout=15)
+    search_box.clear()
+    search_box.send_keys(area_name)
+    
+    # Wait for the suggestion list to finish filling in
+    ready.element_count_stable('location_suggestions', ".bJaVll .kinJyI", timeout=10)
+    suggestions_container = driver.find_element(By.CSS_SELECTOR, ".bJaVll")
+    
+    # Find the first suggestion using the specific class
+    first_suggestion = suggestions_container.find_element(By.CSS_SELECTOR, ".kinJyI")
+    logging.info(f"Found first suggestion: {first_suggestion.text}")
     
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-    return driver
+    # Click the first suggestion
+    driver.execute_script("arguments[0].click();", first_suggestion)
+    
+    # After location selection, wait for and click the "View Restaurants" button
+    view_restaurants_button = ready.until(
+        'view_restaurants_button',
+        EC.element_to_be_clickable((By.CSS_SELECTOR, ".jaMInw")),
+        timeout=10
+    )
+    logging.info("Clicking View Restaurants button")
+    driver.execute_script("arguments[0].click();", view_restaurants_button)
+
+def _restore_location(driver, ready, area_name):
+    """
+    Open page 1 of the restaurant list with the cached session for an area.
 
-def scrape_noon_food(area, max_pages=26):
+    Returns False when there is no usable cached session; a session Noon
+    no longer accepts is dropped from the cache.
+    """
+    session = load_session(area_name)
+    if session is None:
+        return False
+    
+    logging.info(f"Reusing cached Noon session for {area_name}")
+    try:
+        inject_session(driver, session, NOON_HOME_URL)
+        driver.get(f"{NOON_SEARCH_URL}?page=1&type=outlet")
+        ready.element_count_stable('cached_session_cards', SELECTORS['noon']['card'], timeout=10)
+        return True
+    except Exception as e:
+        logging.warning(f"Cached Noon session rejected, selecting location again: {e}")
+        invalidate_session(area_name)
+        driver.delete_all_cookies()
+        return False
+
+def scrape_noon_food(area, max_pages=26, stats=None, profile=BROWSER_PROFILE, should_stop=None,
+                     use_session_cache=True, on_page=None, keep_records=True):
     """
     Scrape restaurant names and offers from Noon Food based on the area.
     
+    The delivery location is picked through the Noon UI once per area; the
+    resulting cookies and local storage are cached (see ``noon_session``) and
+    later runs go straight to the search pages.
+    
     Args:
         area (str): The area name to search for
         max_pages (int): Maximum number of pages to scrape
+        stats (dict, optional): Filled with pagination stats ('last_page',
+            'pages_fetched', 'pages_skipped'), per-step wait times ('waits'),
+            transfer size and load time per page ('bytes_transferred', 'pages')
+            whether a cached session was used ('session_cached') and, when
+            the scrape failed, why ('error')
+        profile (str): Chrome profile: 'lean' skips images, fonts and
+            trackers, 'default' loads pages fully
+        should_stop (callable, optional): Checked before every step and page;
+            return True to end the scrape early with the pages collected so far
+        use_session_cache (bool): Reuse and store cached location sessions
+        on_page (callable, optional): Called as ``on_page(page, records)``
+            with each page's records as soon as they are extracted
+        keep_records (bool): Also collect and return all records; pass False
+            with ``on_page`` to stream pages without holding them
     """
     # Initialize restaurants list at the start
     restaurants = []
@@ -36,118 +109,99 @@ def scrape_noon_food(area, max_pages=26):
     # Get area information using AreaMapping
     area_info = AreaMapping.get_area_info(area)
     if not area_info['is_valid']:
-        logging.error(f"Invalid area: {area}")
+        report_error(stats, f"Invalid area: {area}")
         return []
         
     area_name = area_info['noon_name']
     if not area_name:
-        logging.error(f"No Noon name found for area: {area}")
+        report_error(stats, f"No Noon name found for area: {area}")
         return []
         
     logging.info(f"Searching for restaurants in: {area_name}")
     
+    def stop_requested():
+        if should_stop is not None and should_stop():
+            logging.warning("Stop requested, ending Noon scrape")
+            return True
+        return False
+    
+    if stop_requested():
+        return []
+    
+    pool = get_driver_pool()
+    failed = False
+    
     try:
-        driver = setup_driver()
-        wait = WebDriverWait(driver, 10)
-        
-        # Load the main page
-        logging.info("Loading main page...")
-        driver.get("https://food.noon.com/")
-        time.sleep(5)
+        driver = pool.acquire('chrome', profile=profile)
+        ready = PageReadiness(driver, stats)
         
-        # Find and interact with the search box
-        search_box = wait.until(EC.presence_of_element_located(
-            (By.CSS_SELECTOR, "input[placeholder='Search your location']")
-        ))
-        search_box.clear()
-        search_box.send_keys(area_name)
-        time.sleep(2)
+        session_cached = use_session_cache and _restore_location(driver, ready, area_name)
+        if stats is not None:
+            stats['session_cached'] = session_cached
         
         try:
-            # Wait for suggestions container
-            suggestions_container = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, ".bJaVll")))
-            
-            # Find the first suggestion using the specific class
-            first_suggestion = suggestions_container.find_element(By.CSS_SELECTOR, ".kinJyI")
-            logging.info(f"Found first suggestion: {first_suggestion.text}")
-            
-            # Click the first suggestion
-            driver.execute_script("arguments[0].click();", first_suggestion)
-            time.sleep(2)
-            
-            # After location selection, wait for and click the "View Restaurants" button
-            view_restaurants_button = wait.until(
-                EC.element_to_be_clickable((By.CSS_SELECTOR, ".jaMInw"))
-            )
-            logging.info("Clicking View Restaurants button")
-            driver.execute_script("arguments[0].click();", view_restaurants_button)
-            time.sleep(5)  # Wait for restaurants page to load
-            
-            # After clicking View Restaurants button and initial page load
-            base_url = "https://food.noon.com/search/"
-            
-            # Now proceed with pagination and scraping
-            for page in range(1, max_pages + 1):
+            if not session_cached:
+                _select_location(driver, ready, area_name)
+            if stop_requested():
+                return restaurants
+
+            def fetch_page(page):
+                pool.note_pages(driver)
                 try:
                     if page > 1:
                         # Construct URL for pages 2 onwards
-                        current_url = f"{base_url}?page={page}&type=outlet"
+                        current_url = f"{NOON_SEARCH_URL}?page={page}&type=outlet"
                         logging.info(f"Navigating to page {page}: {current_url}")
                         driver.get(current_url)
-                        time.sleep(3)  # Wait for page load
                     
                     # Wait for restaurants to load
-                    restaurant_selector = "a.drpCiq"
-                    restaurants_present = wait.until(
-                        EC.presence_of_all_elements_located((By.CSS_SELECTOR, restaurant_selector))
-                    )
-                    
-                    if not restaurants_present:
-                        logging.info(f"No restaurants found on page {page}, might be the last page")
-                        break
-                    
-                    logging.info(f"Found {len(restaurants_present)} restaurants on page {page}")
+                    restaurant_selector = SELECTORS['noon']['card']
+                    ready.element_count_stable(f'page_{page}_cards', restaurant_selector, timeout=10)
                     
                     # Scroll through the page to load all elements
                     driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                    time.sleep(2)
+                    ready.scroll_height_stable(f'page_{page}_scroll', timeout=5)
+                    ready.element_count_stable(f'page_{page}_lazy_cards', restaurant_selector, timeout=5)
                     
-                    for element in restaurants_present:
-                        try:
-                            name = element.find_element(By.CSS_SELECTOR, "p.title").text
-                            try:
-                                offer = element.find_element(By.CSS_SELECTOR, "span.hBQSxC").text
-                            except NoSuchElementException:
-                                offer = "No Offer"
-                                
-                            restaurants.append({
-                                'name': name,
-                                'offer': offer,
-                                'platform': 'Noon',
-                                'page': page
-                            })
-                            logging.info(f"Scraped restaurant: {name} with offer: {offer}")
-                            
-                        except Exception as e:
-                            logging.warning(f"Error processing restaurant: {str(e)}")
-                            continue
+                    # Read every restaurant card in one round trip
+                    page_restaurants = extract_cards(driver, 'noon', page)
+                    record_page_metrics(driver, stats, page)
                     
                 except TimeoutException:
-                    logging.error(f"Timeout waiting for restaurants to load on page {page}")
-                    break
+                    # Pages past the end render no restaurant cards at all
+                    logging.info(f"No restaurant cards appeared on page {page}")
+                    return [], None
                 except Exception as e:
+                    # Skip the page rather than mistaking it for the end of the listing
                     logging.error(f"Error on page {page}: {str(e)}")
-                    break
+                    return None, None
+
+                last_page = find_last_page(driver.page_source, len(page_restaurants)) if page == 1 else None
+                if page == 1 and page_restaurants and use_session_cache and not session_cached:
+                    # The location worked; let later runs skip the UI flow
+                    save_session(area_name, capture_session(driver))
+                return page_restaurants, last_page
+
+            # Now proceed with pagination and scraping
+            restaurants = paginate(
+                fetch_page, max_pages, stats=stats, should_stop=should_stop,
+                on_page=on_page, keep_records=keep_records
+            )
                     
         except Exception as e:
-            logging.error(f"Error during area search: {str(e)}")
+            # A failed location flow can leave the page in any state; do not reuse the driver
+            failed = True
+            report_error(stats, f"Error during area search: {str(e)}")
             
     except Exception as e:
-        logging.error(f"Error scraping Noon: {str(e)}")
+        failed = True
+        report_error(stats, f"Error scraping Noon: {str(e)}")
         if 'driver' in locals():
             driver.save_screenshot("final_error.png")
     finally:
         if 'driver' in locals():
-            driver.quit()
+            pool.release(driver, discard=failed)
     
+    if stats is not None and 'bytes_transferred' in stats:
+        logging.info(f"Transferred {stats['bytes_transferred'] / 1024:.0f} KB over {len(stats['pages'])} page(s)")
     return restaurants
@@ -0,0 +1,116 @@
+# scraping/noon_session.py
+
+import json
+import logging
+import os
+import re
+import time
+
+from config.config import CACHE_DIR, NOON_SESSION_TTL_SECONDS
+
+SESSION_DIR = os.path.join(CACHE_DIR, 'noon_sessions')
+
+# Cookie fields accepted by WebDriver's add_cookie
+COOKIE_FIELDS = ('name', 'value', 'path', 'domain', 'secure', 'httpOnly', 'expiry', 'sameSite')
+
+READ_LOCAL_STORAGE_SCRIPT = """
+const items = {};
+for (let i = 0; i < window.localStorage.length; i++) {
+    const key = window.localStorage.key(i);
+    items[key] = window.localStorage.getItem(key);
+}
+return items;
+"""
+
+WRITE_LOCAL_STORAGE_SCRIPT = """
+const items = arguments[0];
+Object.keys(items).forEach((key) => window.localStorage.setItem(key, items[key]));
+"""
+
+
+def _session_path(area_name):
+    slug = re.sub(r'[^a-z0-9]+', '_', area_name.lower()).strip('_')
+    return os.path.join(SESSION_DIR, f"{slug}.json")
+
+
+def capture_session(driver):
+    """
+    Capture the cookies and local storage holding the selected delivery location.
+
+    Returns:
+        dict: Session with 'cookies', 'local_storage' and 'captured_at'.
+    """
+    return {
+        'cookies': driver.get_cookies(),
+        'local_storage': driver.execute_script(READ_LOCAL_STORAGE_SCRIPT) or {},
+        'captured_at': time.time()
+    }
+
+
+def save_session(area_name, session):
+    """Store a captured session for an area."""
+    path = _session_path(area_name)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            json.dump(session, f)
+        logging.info(f"Cached Noon session for {area_name}")
+    except OSError as e:
+        logging.warning(f"Could not cache Noon session for {area_name}: {e}")
+
+
+def load_session(area_name, ttl=NOON_SESSION_TTL_SECONDS):
+    """
+    Load the cached session for an area.
+
+    Returns:
+        dict or None: The session, or None when missing, unreadable or older than ``ttl``.
+    """
+    path = _session_path(area_name)
+    try:
+        with open(path) as f:
+            session = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    age = time.time() - session.get('captured_at', 0)
+    if age > ttl:
+        logging.info(f"Cached Noon session for {area_name} expired ({age / 3600:.1f}h old)")
+        invalidate_session(area_name)
+        return None
+    return session
+
+
+def invalidate_session(area_name):
+    """Drop the cached session for an area, e.g. after Noon rejected it."""
+    try:
+        os.remove(_session_path(area_name))
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logging.warning(f"Could not remove Noon session for {area_name}: {e}")
+
+
+def inject_session(driver, session, origin_url):
+    """
+    Restore a captured session into a driver.
+
+    Cookies and local storage can only be set for the page's origin, so the
+    driver first opens ``origin_url``.
+    """
+    driver.get(origin_url)
+
+    for cookie in session.get('cookies', []):
+        cookie = {key: value for key, value in cookie.items() if key in COOKIE_FIELDS}
+        if 'expiry' in cookie:
+            cookie['expiry'] = int(cookie['expiry'])
+        if cookie.get('sameSite') not in (None, 'Strict', 'Lax', 'None'):
+            cookie.pop('sameSite')
+        try:
+            driver.add_cookie(cookie)
+        except Exception as e:
+            logging.debug(f"Skipping cookie {cookie.get('name')}: {e}")
+
+    local_storage = session.get('local_storage') or {}
+    if local_storage:
+        driver.execute_script(WRITE_LOCAL_STORAGE_SCRIPT, local_storage)
@@ -0,0 +1,303 @@
+# scraping/pagination.py
+
+import json
+import logging
+import math
+import queue
+import re
+import threading
+
+from bs4 import BeautifulSoup
+
+PAGE_LINK_PATTERN = re.compile(r'[?&]page=(\d+)')
+
+# Keys in embedded page state that hold the listing's paging object
+PAGING_OBJECT_KEYS = ('pagination', 'paging', 'pageInfo', 'pager')
+# Keys of a paging object that hold the page count or the total result count
+PAGE_COUNT_KEYS = ('totalPages', 'pageCount', 'lastPage', 'total_pages')
+RESULT_COUNT_KEYS = ('totalVendors', 'totalCount', 'totalResults', 'total_count')
+
+# Containers of the pagination control; page links elsewhere are ignored
+PAGINATION_SELECTORS = (
+    '.pagination', '[class*="Pagination"]', '[class*="pagination"]',
+    'nav[aria-label*="agination"]', '[data-testid*="pagination"]',
+)
+
+
+def _find_paging_object(node):
+    """Return the first paging object (e.g. ``{"pagination": {...}}``) in nested JSON."""
+    if isinstance(node, dict):
+        for key in PAGING_OBJECT_KEYS:
+            if isinstance(node.get(key), dict):
+                return node[key]
+        children = node.values()
+    elif isinstance(node, list):
+        children = node
+    else:
+        return None
+
+    for child in children:
+        found = _find_paging_object(child)
+        if found is not None:
+            return found
+    return None
+
+
+def _positive_int(paging, keys):
+    for key in keys:
+        value = paging.get(key)
+        if isinstance(value, int) and not isinstance(value, bool) and value > 0:
+            return value
+    return None
+
+
+def find_last_page(html, page_size=None):
+    """
+    Estimate how many listing pages exist from the first page's source.
+
+    The listing's paging object in the embedded ``__NEXT_DATA__`` state is
+    checked for a page count, then for a result count (divided by
+    ``page_size``). Otherwise the highest ``?page=N`` link inside the
+    pagination control is used. A windowed pager ("1 2 3 ... 5") can
+    under-report, so callers treat the result as a hint, not a limit.
+
+    Args:
+        html (str): Source of the first listing page.
+        page_size (int, optional): Number of records on a full page.
+
+    Returns:
+        int or None: Estimated last page number, or None when it cannot be determined.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+
+    state_script = soup.find('script', id='__NEXT_DATA__')
+    if state_script and state_script.string:
+        try:
+            state = json.loads(state_script.string)
+        except ValueError:
+            state = None
+
+        paging = _find_paging_object(state) if state is not None else None
+        if paging is not None:
+            page_count = _positive_int(paging, PAGE_COUNT_KEYS)
+            if page_count:
+                return page_count
+
+            result_count = _positive_int(paging, RESULT_COUNT_KEYS)
+            if result_count and page_size:
+                return math.ceil(result_count / page_size)
+
+    pages = [
+        int(match.group(1))
+        for container in soup.select(', '.join(PAGINATION_SELECTORS))
+        for link in container.find_all('a', href=True)
+        for match in [PAGE_LINK_PATTERN.search(link['href'])]
+        if match
+    ]
+    return max(pages) if pages else None
+
+
+def page_signature(records):
+    """Identify a page by the names on it, to detect a site serving the same page again."""
+    return tuple(record['name'] for record in records)
+
+
+def report_error(stats, message):
+    """
+    Log why a scrape failed and record it as ``stats['error']``.
+
+    The scrapers return an empty list on failure; the error lets callers
+    tell "no restaurants" apart from "the scrape failed".
+    """
+    logging.error(message)
+    if stats is not None:
+        stats['error'] = message
+
+
+def paginate(fetch_page, max_pages, concurrency=1, executor=None, stats=None, should_stop=None,
+             on_page=None, keep_records=True):
+    """
+    Collect records page by page, stopping as soon as the listing runs out.
+
+    ``fetch_page(page)`` returns ``(records, last_page)``: ``records`` is None
+    when the page failed to load (it is skipped), and ``last_page`` is the page
+    count discovered on that page, if any. Page 1 is always fetched first.
+    The walk ends at the first empty page, at a page identical to one already
+    seen, or at ``max_pages``.
+
+    With an executor, the remaining pages are fetched in waves of
+    ``concurrency`` and results are kept in page order. A discovered page
+    count only sizes the waves: past it, pages are fetched one at a time
+    until the listing runs out.
+
+    ``should_stop`` is checked before every page (or wave), so a cancelled
+    run ends after the page in flight and keeps what it has collected.
+
+    ``on_page(page, records)`` is called for every accepted page as soon as
+    it is in, so callers can show results while the walk goes on. With
+    ``keep_records=False`` the records are only handed to ``on_page`` and
+    not accumulated, keeping memory flat on long walks.
+
+    Args:
+        fetch_page (callable): Page fetcher, see above.
+        max_pages (int): Upper bound on pages to walk.
+        concurrency (int): Wave size when an executor is given.
+        executor (Executor, optional): Pool used to fetch a wave at once.
+        stats (dict, optional): Filled with 'last_page' (page count the
+            listing reported, or None), 'pages_fetched', 'pages_failed'
+            (pages that failed to load and were skipped), 'pages_skipped'
+            (pages below ``max_pages`` never requested) and 'stopped'
+            (whether ``should_stop`` ended the walk).
+        should_stop (callable, optional): Returns True to stop early.
+        on_page (callable, optional): Called with each accepted page's records.
+        keep_records (bool): Accumulate and return the records.
+
+    Returns:
+        list: Records from all pages, in page order (empty with ``keep_records=False``).
+    """
+    restaurants = []
+    seen_pages = set()
+    pages_fetched = 0
+    pages_failed = 0
+    stopped = False
+
+    def stop_requested():
+        nonlocal stopped
+        if should_stop is not None and should_stop():
+            logging.warning(f"Stop requested, ending after {pages_fetched} page(s)")
+            stopped = True
+        return stopped
+
+    def accept(page, page_restaurants):
+        """Add a page's records; returns False when the walk should stop."""
+        nonlocal pages_failed
+        if page_restaurants is None:
+            logging.warning(f"Page {page} failed to load, skipping it")
+            pages_failed += 1
+            return True
+        if not page_restaurants:
+            logging.info(f"No restaurants found on page {page}, reached the last page")
+            return False
+
+        signature = page_signature(page_restaurants)
+        if signature in seen_pages:
+            logging.info(f"Page {page} repeats an earlier page, reached the last page")
+            return False
+        seen_pages.add(signature)
+
+        logging.info(f"Found {len(page_restaurants)} restaurants on page {page}")
+        for restaurant in page_restaurants:
+            logging.info(f"Scraped restaurant: {restaurant['name']} with offer: {restaurant['offer']}")
+        if on_page is not None:
+            on_page(page, page_restaurants)
+        if keep_records:
+            restaurants.extend(page_restaurants)
+        return True
+
+    first_page, last_page = None, None
+    if not stop_requested():
+        first_page, last_page = fetch_page(1)
+        pages_fetched += 1
+    if last_page:
+        logging.info(f"Listing reports about {last_page} page(s)")
+
+    if not stopped and accept(1, first_page):
+        if executor is None:
+            for page in range(2, max_pages + 1):
+                if stop_requested():
+                    break
+                page_restaurants, _ = fetch_page(page)
+                pages_fetched += 1
+                if not accept(page, page_restaurants):
+                    break
+        else:
+            next_page = 2
+            while next_page <= max_pages and not stop_requested():
+                # Full waves up to the reported page count, then one page at a
+                # time, since pages past it are most likely empty
+                if last_page is None:
+                    size = concurrency
+                elif next_page <= last_page:
+                    size = min(concurrency, last_page - next_page + 1)
+                else:
+                    size = 1
+                pages = range(next_page, min(next_page + size, max_pages + 1))
+                results = list(executor.map(fetch_page, pages))
+                pages_fetched += len(pages)
+                next_page += len(pages)
+
+                if not all(accept(page, page_restaurants) for page, (page_restaurants, _) in zip(pages, results)):
+                    break
+
+    pages_skipped = max_pages - pages_fetched
+    logging.info(f"Fetched {pages_fetched} page(s), skipped {pages_skipped} of {max_pages}")
+    if stats is not None:
+        stats['last_page'] = last_page
+        stats['pages_fetched'] = pages_fetched
+        stats['pages_failed'] = pages_failed
+        stats['pages_skipped'] = pages_skipped
+        stats['stopped'] = stopped
+
+    return restaurants
+
+
+def iter_pages(scrape, *args, should_stop=None, buffer_pages=4, **kwargs):
+    """
+    Run a scraper in a background thread and yield its pages as they come in.
+
+    ``scrape`` is ``scrape_noon_food`` or ``scrape_talabat``; it is called
+    with ``on_page`` and ``keep_records=False``, so the scraper holds no
+    records itself. At most ``buffer_pages`` pages wait for the consumer;
+    beyond that the scraper pauses between pages. Closing the generator
+    early (e.g. ``break``) stops the scrape before its next page. A failed
+    scrape (``stats['error']`` set by the scraper) raises ``RuntimeError``
+    once the pages it did produce have been yielded.
+
+    Usage:
+        for page, records in iter_pages(scrape_talabat, 'kalba', engine='http'):
+            ...
+
+    Yields:
+        tuple: ``(page, records)`` in page order.
+    """
+    # The scrapers report failures through stats instead of raising
+    stats = kwargs.setdefault('stats', {})
+    pages = queue.Queue(maxsize=buffer_pages)
+    closed = threading.Event()
+    finished = object()
+    errors = []
+
+    def stop_requested():
+        return closed.is_set() or (should_stop is not None and should_stop())
+
+    def put(item):
+        # Gives up once the consumer is gone, so the thread never blocks forever
+        while not closed.is_set():
+            try:
+                pages.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def run():
+        try:
+            scrape(*args, should_stop=stop_requested, on_page=lambda page, records: put((page, records)),
+                   keep_records=False, **kwargs)
+            if stats.get('error'):
+                errors.append(RuntimeError(stats['error']))
+        except Exception as e:
+            errors.append(e)
+        finally:
+            put(finished)
+
+    threading.Thread(target=run, name="page-stream", daemon=True).start()
+    try:
+        while True:
+            item = pages.get()
+            if item is finished:
+                break
+            yield item
+        if errors:
+            raise errors[0]
+    finally:
+        closed.set()
@@ -0,0 +1,100 @@
+# scraping/readiness.py
+
+import logging
+import time
+
+from selenium.common.exceptions import TimeoutException
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+class PageReadiness:
+    """
+    Wait on concrete page signals instead of fixed sleeps.
+
+    Every wait has its own timeout and is recorded in ``stats['waits']`` as
+    ``{'step', 'seconds', 'ready'}``, so slow steps show up per run.
+    """
+
+    def __init__(self, driver, stats=None, poll_interval=0.1):
+        self.driver = driver
+        self.stats = stats
+        self.poll_interval = poll_interval
+
+    def _record(self, step, started, ready):
+        elapsed = time.monotonic() - started
+        if self.stats is not None:
+            self.stats.setdefault('waits', []).append({
+                'step': step,
+                'seconds': round(elapsed, 3),
+                'ready': ready
+            })
+        logging.debug(f"Wait '{step}' took {elapsed:.2f}s (ready={ready})")
+        return elapsed
+
+    def _wait_until_stable(self, step, probe, timeout, settle, accept=lambda value: True):
+        """
+        Poll ``probe()`` until it returns the same accepted value for ``settle``
+        seconds. Returns the last value, or raises TimeoutException when no
+        accepted value was ever seen within ``timeout``.
+        """
+        started = time.monotonic()
+        deadline = started + timeout
+        last_value = None
+        stable_since = None
+        seen_accepted = False
+
+        while True:
+            value = probe()
+            now = time.monotonic()
+
+            if accept(value):
+                seen_accepted = True
+                if value != last_value or stable_since is None:
+                    stable_since = now
+                elif now - stable_since >= settle:
+                    self._record(step, started, True)
+                    return value
+            else:
+                stable_since = None
+            last_value = value
+
+            if now >= deadline:
+                self._record(step, started, False)
+                if seen_accepted:
+                    # Still changing at the deadline; use what is there
+                    return value
+                raise TimeoutException(f"'{step}' not ready after {timeout}s")
+
+            time.sleep(self.poll_interval)
+
+    def until(self, step, condition, timeout=10):
+        """Wait on a Selenium expected condition and return its result."""
+        started = time.monotonic()
+        try:
+            result = WebDriverWait(self.driver, timeout, poll_frequency=self.poll_interval).until(condition)
+        except TimeoutException:
+            self._record(step, started, False)
+            raise
+        self._record(step, started, True)
+        return result
+
+    def element_count_stable(self, step, css_selector, timeout=20, settle=0.5, min_count=1):
+        """Wait until at least ``min_count`` elements match and their number stops changing."""
+        script = "return document.querySelectorAll(arguments[0]).length;"
+        return self._wait_until_stable(
+            step,
+            lambda: self.driver.execute_script(script, css_selector),
+            timeout,
+            settle,
+            accept=lambda count: count >= min_count
+        )
+
+    def scroll_height_stable(self, step, timeout=10, settle=0.5):
+        """Wait until lazily loaded content stops growing the page."""
+        script = "return document.body ? document.body.scrollHeight : 0;"
+        return self._wait_until_stable(
+            step,
+            lambda: self.driver.execute_script(script),
+            timeout,
+            settle
+        )
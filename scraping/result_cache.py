@@ -0,0 +1,213 @@
+# scraping/result_cache.py
+
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from config.config import RESULT_CACHE_DIR, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL_SECONDS
+
+FRESH = 'fresh'
+CACHED = 'cached'
+SHARED = 'shared'  # Joined a scrape another caller had already started
+PARTIAL = 'partial'  # Stopped early; never cached
+
+
+class ResultCache:
+    """
+    Process-wide cache of scrape results keyed by (area key, platform).
+
+    Entries expire after ``ttl`` seconds and the least recently used ones
+    are dropped beyond ``max_entries``. With ``persist_dir`` results are
+    also written to disk, so a restarted server starts warm. Concurrent
+    ``get_or_fetch`` calls for the same key share one scrape.
+    """
+
+    def __init__(self, ttl=RESULT_CACHE_TTL_SECONDS, max_entries=RESULT_CACHE_MAX_ENTRIES,
+                 persist_dir=RESULT_CACHE_DIR):
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.persist_dir = persist_dir
+        self._entries = OrderedDict()
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        area_key, platform = key
+        return os.path.join(self.persist_dir, platform, f"{area_key}.json")
+
+    def _load(self, key):
+        if not self.persist_dir:
+            return None
+        try:
+            with open(self._path(key)) as f:
+                entry = json.load(f)
+            return entry['records'], entry['fetched_at']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def _save(self, key, records, fetched_at):
+        if not self.persist_dir:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                json.dump({'records': records, 'fetched_at': fetched_at}, f)
+        except (OSError, TypeError) as e:
+            logging.warning(f"Could not persist cached results for {key}: {e}")
+
+    def _lookup(self, key):
+        # Called with _lock held
+        entry = self._entries.get(key)
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, *entry)
+        if entry is None:
+            return None
+        if time.time() - entry[1] > self.ttl:
+            self._entries.pop(key, None)
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def _remember(self, key, records, fetched_at):
+        # Called with _lock held
+        self._entries[key] = (records, fetched_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, area_key, platform):
+        """
+        Cached records for an area and platform.
+
+        Returns:
+            tuple or None: ``(records, fetched_at)``, or None when missing or expired.
+        """
+        with self._lock:
+            return self._lookup((area_key, platform.lower()))
+
+    def put(self, area_key, platform, records, fetched_at=None):
+        key = (area_key, platform.lower())
+        fetched_at = time.time() if fetched_at is None else fetched_at
+        with self._lock:
+            self._remember(key, records, fetched_at)
+        self._save(key, records, fetched_at)
+
+    def invalidate(self, area_key, platform):
+        key = (area_key, platform.lower())
+        with self._lock:
+            self._entries.pop(key, None)
+        if self.persist_dir:
+            try:
+                os.remove(self._path(key))
+            except FileNotFoundError:
+                pass
+
+    def get_or_fetch(self, area_key, platform, fetch, force=False, should_store=bool, should_stop=None,
+                     is_partial=None, poll_interval=0.5):
+        """
+        Return cached records, or scrape them with ``fetch()``.
+
+        A call that finds a scrape of the same key in flight waits for it
+        instead of starting another, checking its own ``should_stop`` every
+        ``poll_interval`` seconds. A scrape ended early by its caller's
+        ``should_stop``, or one ``is_partial`` reports as missing pages, is
+        partial: it is never cached, and callers that were waiting on it
+        scrape again rather than take the partial records.
+
+        Args:
+            area_key (str): Canonical area key (see ``area_catalog``).
+            platform (str): 'noon' or 'talabat'.
+            fetch (callable): Scrapes and returns the records.
+            force (bool): Skip the cache and scrape again (still joins a
+                scrape already in flight for the same key).
+            should_store (callable): Whether fetched records may be cached;
+                by default only non-empty results are.
+            should_stop (callable, optional): Returns True once this caller
+                wants to stop; a waiting caller then returns no records.
+            is_partial (callable, optional): Called with the fetched records;
+                returns True when the scrape skipped pages.
+            poll_interval (float): Seconds between ``should_stop`` checks while waiting.
+
+        Returns:
+            dict: 'records', 'fetched_at', 'source' ('fresh', 'cached' or
+                'shared') and 'partial' (the scrape was stopped early or
+                skipped pages).
+        """
+        key = (area_key, platform.lower())
+
+        def stopped():
+            return should_stop is not None and should_stop()
+
+        while True:
+            with self._lock:
+                if not force:
+                    entry = self._lookup(key)
+                    if entry is not None:
+                        return {'records': entry[0], 'fetched_at': entry[1], 'source': CACHED, 'partial': False}
+                future = self._inflight.get(key)
+                leader = future is None
+                if leader:
+                    future = Future()
+                    self._inflight[key] = future
+
+            if leader:
+                break
+
+            while True:
+                if stopped():
+                    return {'records': [], 'fetched_at': None, 'source': SHARED, 'partial': True}
+                try:
+                    records, fetched_at, partial = future.result(timeout=poll_interval)
+                    break
+                except FutureTimeoutError:
+                    continue
+            if not partial:
+                return {'records': records, 'fetched_at': fetched_at, 'source': SHARED, 'partial': False}
+            logging.info(f"Shared scrape of {key} was stopped early, scraping again")
+
+        try:
+            records = fetch()
+            fetched_at = time.time()
+            partial = stopped() or (is_partial is not None and is_partial(records))
+            if not partial and should_store(records):
+                self.put(area_key, platform, records, fetched_at)
+            future.set_result((records, fetched_at, partial))
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return {'records': records, 'fetched_at': fetched_at, 'source': FRESH, 'partial': partial}
+
+
+def describe_freshness(result, now=None):
+    """Short label for the UI, e.g. 'fresh', 'partial' or 'cached (12 min old)'."""
+    if result.get('partial'):
+        return PARTIAL
+    if result['source'] != CACHED:
+        return FRESH
+    age = (time.time() if now is None else now) - result['fetched_at']
+    if age < 60:
+        return f"cached ({int(age)} s old)"
+    return f"cached ({int(age // 60)} min old)"
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_result_cache():
+    """Result cache shared by every session in this process."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResultCache()
+        return _cache
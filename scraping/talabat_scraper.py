@@ -1,108 +1,285 @@
 # scraping/talabat_scraper.py
 
-from selenium import webdriver
-from selenium.webdriver.firefox.service import Service as FirefoxService
-from webdriver_manager.firefox import GeckoDriverManager
 from bs4 import BeautifulSoup
-import time
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import json
 import logging
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
+from concurrent.futures import ThreadPoolExecutor
 from selenium.common.exceptions import TimeoutException
+from config.config import BROWSER_PROFILE
 from .area_data import get_area_info
+from .browser_profile import add_page_metrics, record_page_metrics
+from .driver_pool import get_driver_pool
+from .extraction import SELECTORS, extract_cards, parse_cards
+from .pagination import find_last_page, paginate, report_error
+from .readiness import PageReadiness
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
+TALABAT_BASE_URL = "https://www.talabat.com/uae/restaurants"
 
-def scrape_talabat(area, max_pages=26):
+HTTP_HEADERS = {
+    'User-Agent': (
+        'Mozilla/5.0 (X11; Linux x86_64; rv:128.0) Gecko/20100101 Firefox/128.0'
+    ),
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.9',
+}
+
+# Keys that may hold the promotion text of a vendor in the embedded page state
+OFFER_KEYS = ('offerText', 'offer', 'promotionText', 'discountText', 'deliveryOffer')
+
+
+def create_http_session(pool_size=10):
+    """
+    Create a pooled HTTP session for fetching Talabat listing pages.
+
+    Args:
+        pool_size (int): Maximum number of keep-alive connections per host.
+
+    Returns:
+        requests.Session: Session with retries and browser-like headers.
+    """
+    retry = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=('GET',)
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+
+    session = requests.Session()
+    session.headers.update(HTTP_HEADERS)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def _find_vendor_list(node):
+    """Recursively look for the first list of vendor dicts in the embedded page state."""
+    if isinstance(node, dict):
+        vendors = node.get('vendors')
+        if isinstance(vendors, list) and vendors and all(
+            isinstance(v, dict) and 'name' in v for v in vendors
+        ):
+            return vendors
+        for value in node.values():
+            found = _find_vendor_list(value)
+            if found is not None:
+                return found
+    elif isinstance(node, list):
+        for value in node:
+            found = _find_vendor_list(value)
+            if found is not None:
+                return found
+    return None
+
+
+def _vendor_offer(vendor):
+    for key in OFFER_KEYS:
+        value = vendor.get(key)
+        if isinstance(value, str) and value.strip():
+            return value.strip()
+    return "No Offer"
+
+
+def parse_talabat_page(html, page):
+    """
+    Extract vendor records from a server-rendered Talabat listing page.
+
+    The embedded ``__NEXT_DATA__`` JSON state is preferred; vendor cards in
+    the HTML are used when the state is missing or has no vendor list.
+
+    Args:
+        html (str): Page source.
+        page (int): Page number the source was fetched from.
+
+    Returns:
+        list: List of dictionaries with restaurant data.
+    """
+    soup = BeautifulSoup(html, 'html.parser')
+    restaurants = []
+
+    state_script = soup.find('script', id='__NEXT_DATA__')
+    if state_script and state_script.string:
+        try:
+            vendors = _find_vendor_list(json.loads(state_script.string))
+        except ValueError as e:
+            logging.warning(f"Could not decode page state on page {page}: {e}")
+            vendors = None
+
+        if vendors:
+            for vendor in vendors:
+                name = str(vendor['name']).strip()
+                if name:
+                    restaurants.append({
+                        'name': name,
+                        'offer': _vendor_offer(vendor),
+                        'platform': 'Talabat',
+                        'page': page
+                    })
+            return restaurants
+
+    return parse_cards(soup, 'talabat', page)
+
+
+def _fetch_page_http(session, base_url, page, timeout=20, stats=None):
+    """
+    Fetch one listing page over HTTP.
+
+    Returns ``(records, last_page)``; records is None when the page failed to
+    load, and last_page is only looked up on the first page.
+    """
+    current_url = f"{base_url}?page={page}"
+    logging.info(f"Fetching page {page}: {current_url}")
+
+    try:
+        response = session.get(current_url, timeout=timeout)
+        response.raise_for_status()
+    except requests.RequestException as e:
+        logging.error(f"Error on page {page}: {e}")
+        return None, None
+
+    add_page_metrics(stats, page, len(response.content), response.elapsed.total_seconds())
+    restaurants = parse_talabat_page(response.text, page)
+    last_page = find_last_page(response.text, len(restaurants)) if page == 1 else None
+    return restaurants, last_page
+
+
+def _fetch_page_selenium(driver, base_url, page, stats=None):
+    """Render one listing page in Firefox. Same return shape as ``_fetch_page_http``."""
+    current_url = f"{base_url}?page={page}"
+    logging.info(f"Scraping page {page}: {current_url}")
+
+    try:
+        driver.get(current_url)
+
+        # Wait for restaurants to load
+        PageReadiness(driver, stats).element_count_stable(
+            f'page_{page}_cards', SELECTORS['talabat']['card'], timeout=20
+        )
+
+        # Read every vendor card in one round trip
+        restaurants = extract_cards(driver, 'talabat', page)
+        record_page_metrics(driver, stats, page)
+
+    except TimeoutException:
+        # Pages past the end render no vendor cards at all
+        logging.info(f"No vendor cards appeared on page {page}")
+        return [], None
+    except Exception as e:
+        logging.error(f"Error on page {page}: {e}")
+        return None, None
+
+    last_page = find_last_page(driver.page_source, len(restaurants)) if page == 1 else None
+    return restaurants, last_page
+
+
+def _scrape_talabat_http(base_url, max_pages, concurrency=1, stats=None, should_stop=None, on_page=None,
+                         keep_records=True):
+    session = create_http_session(pool_size=max(concurrency, 1))
+
+    def fetch_page(page):
+        return _fetch_page_http(session, base_url, page, stats=stats)
+
+    try:
+        if concurrency > 1:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                return paginate(
+                    fetch_page, max_pages, concurrency, executor, stats, should_stop, on_page, keep_records
+                )
+        return paginate(
+            fetch_page, max_pages, stats=stats, should_stop=should_stop, on_page=on_page, keep_records=keep_records
+        )
+    finally:
+        session.close()
+
+
+def _scrape_talabat_selenium(base_url, max_pages, concurrency=1, stats=None, profile=BROWSER_PROFILE,
+                             should_stop=None, on_page=None, keep_records=True):
+    pool = get_driver_pool()
+
+    def fetch_page(page):
+        # Pages are independent, so each one checks a warm driver out of the pool
+        with pool.driver('firefox', profile=profile) as driver:
+            pool.note_pages(driver)
+            return _fetch_page_selenium(driver, base_url, page, stats)
+
+    if concurrency > 1:
+        with ThreadPoolExecutor(max_workers=min(concurrency, pool.max_browsers)) as executor:
+            return paginate(fetch_page, max_pages, concurrency, executor, stats, should_stop, on_page, keep_records)
+    return paginate(
+        fetch_page, max_pages, stats=stats, should_stop=should_stop, on_page=on_page, keep_records=keep_records
+    )
+
+
+def scrape_talabat(area, max_pages=26, engine='selenium', base_url=TALABAT_BASE_URL, concurrency=1,
+                   stats=None, profile=BROWSER_PROFILE, should_stop=None, on_page=None, keep_records=True):
     """
     Scrape restaurant names and offers from Talabat UAE based on the area.
 
     Args:
         area (str): The area name to search for (e.g., 'kalba').
         max_pages (int, optional): Maximum number of pages to scrape. If None, scrape all pages.
+        engine (str): 'selenium' to render pages in headless Firefox, or 'http'
+            to fetch the server-rendered pages over a pooled HTTP session.
+        base_url (str): Listing root, overridable to point at a local mirror.
+        concurrency (int): Number of pages fetched at once. Each worker checks
+            a Firefox driver out of the shared pool (selenium) or uses a pooled
+            connection (http).
+        stats (dict, optional): Filled with pagination stats ('last_page',
+            'pages_fetched', 'pages_skipped'), transfer size and load time
+            per page ('bytes_transferred', 'pages'), for the selenium
+            engine, per-step wait times ('waits') and, when the scrape
+            failed, why ('error').
+        profile (str): Firefox profile for the selenium engine: 'lean' skips
+            images, fonts and trackers, 'default' loads pages fully.
+        should_stop (callable, optional): Checked before every page; return
+            True to end the scrape early with the pages collected so far.
+        on_page (callable, optional): Called as ``on_page(page, records)``
+            with each page's records as soon as they are extracted.
+        keep_records (bool): Also collect and return all records; pass False
+            with ``on_page`` to stream pages without holding them.
 
     Returns:
-        list: List of dictionaries with restaurant data.
+        list: List of dictionaries with restaurant data, ordered by page.
     """
+    if engine not in ('selenium', 'http'):
+        raise ValueError(f"Unknown Talabat engine: {engine}")
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
     # Get area information
     area_info = get_area_info(area)
     
     if not area_info['is_valid']:
-        logging.error(f"Invalid area: {area}")
+        report_error(stats, f"Invalid area: {area}")
         return []
         
     area_code = area_info['talabat_code']
     if not area_code:
-        logging.error(f"No Talabat code found for area: {area}")
+        report_error(stats, f"No Talabat code found for area: {area}")
         return []
         
-    restaurants = []
-    base_url = f"https://www.talabat.com/uae/restaurants/{area_code}/{area_info['key']}"
-    
-    options = webdriver.FirefoxOptions()
-    options.add_argument('--headless')
-    options.add_argument('--no-sandbox')
-    options.add_argument('--disable-dev-shm-usage')
-    
+    base_url = f"{base_url}/{area_code}/{area_info['key']}"
+    concurrency = min(concurrency, max_pages)
+
     try:
-        driver = webdriver.Firefox(service=FirefoxService(GeckoDriverManager().install()), options=options)
-        wait = WebDriverWait(driver, 20)
-        
-        # Iterate through all pages directly
-        for page in range(1, max_pages + 1):
-            current_url = f"{base_url}?page={page}"
-            logging.info(f"Scraping page {page} of {max_pages}: {current_url}")
-            
-            driver.get(current_url)
-            time.sleep(3)  # Wait for page load
-            
-            try:
-                # Wait for restaurants to load
-                restaurant_selector = ".fFuryH .vendor-card"
-                wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, restaurant_selector)))
-                
-                # Get all restaurant elements
-                restaurant_elements = driver.find_elements(By.CSS_SELECTOR, restaurant_selector)
-                
-                # If no restaurants found, we might have reached the end
-                if not restaurant_elements:
-                    logging.info(f"No restaurants found on page {page}, might be the last page")
-                    break
-                
-                logging.info(f"Found {len(restaurant_elements)} restaurants on page {page}")
-                
-                for element in restaurant_elements:
-                    try:
-                        name = element.find_element(By.CSS_SELECTOR, ".content h2").text
-                        try:
-                            offer = element.find_element(By.CSS_SELECTOR, ".offer-text").text
-                        except:
-                            offer = "No Offer"
-                            
-                        restaurants.append({
-                            'name': name,
-                            'offer': offer,
-                            'platform': 'Talabat',
-                            'page': page
-                        })
-                        logging.info(f"Scraped restaurant: {name} with offer: {offer}")
-                        
-                    except Exception as e:
-                        logging.warning(f"Error processing restaurant: {e}")
-                        continue
-                
-            except Exception as e:
-                logging.error(f"Error on page {page}: {e}")
-                continue
-            
-        driver.quit()
-        logging.info(f"Total restaurants scraped: {len(restaurants)}")
-        
+        if engine == 'http':
+            restaurants = _scrape_talabat_http(
+                base_url, max_pages, concurrency, stats, should_stop, on_page, keep_records
+            )
+        else:
+            restaurants = _scrape_talabat_selenium(
+                base_url, max_pages, concurrency, stats, profile, should_stop, on_page, keep_records
+            )
     except Exception as e:
-        logging.error(f"Error scraping Talabat: {e}")
-        if 'driver' in locals():
-            driver.quit()
-    
+        report_error(stats, f"Error scraping Talabat: {e}")
+        return []
+
+    logging.info(f"Total restaurants scraped: {len(restaurants)}")
+    if stats is not None and 'bytes_transferred' in stats:
+        logging.info(f"Transferred {stats['bytes_transferred'] / 1024:.0f} KB over {len(stats['pages'])} page(s)")
     return restaurants
@@ -5,10 +5,19 @@ from scraping.noon_scraper import scrape_noon_food
 from scraping.talabat_scraper import scrape_talabat
 from scraping.area_data import get_all_uae_areas
 import logging
-import io
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from datetime import datetime
+from itertools import groupby
 import random
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 from scraping.area_mapping import AreaMapping
+from processing.comparator import compare_restaurants
+from exporting.file_exporter import EXTENSIONS, FORMATS, MIME_TYPES, export_bytes
+from config.config import JOB_POLL_SECONDS, LOG_MAX_ENTRIES, LOG_REFRESH_SECONDS
+from utils.jobs import FAILED, get_job_manager
+from scraping.result_cache import CACHED, FRESH, SHARED, describe_freshness, get_result_cache
 
 # Matrix-style CSS
 MATRIX_STYLE = """
@@ -100,17 +109,30 @@ MATRIX_RAIN_SCRIPT = """
 """
 
 class MatrixStreamlitHandler(logging.Handler):
-    def __init__(self, terminal_container):
+    """
+    Streams log records into the Matrix terminal.
+
+    Entries are formatted once and kept in a ring buffer of the last
+    ``max_entries``. The terminal is redrawn at most once per
+    ``refresh_interval`` seconds; records arriving in between are drawn by
+    the next emit or by ``flush()``.
+    """
+
+    def __init__(self, terminal_container, max_entries=LOG_MAX_ENTRIES, refresh_interval=LOG_REFRESH_SECONDS):
         super().__init__()
         self.terminal_container = terminal_container
-        self.logs = []
+        self.logs = deque(maxlen=max_entries)
+        self.refresh_interval = refresh_interval
         self.matrix_chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@#$%^&*"
+        self._render_lock = threading.Lock()
+        self._last_render = None
+        self._dirty = False
         
     def get_matrix_effect(self):
         return ''.join(random.choice(self.matrix_chars) for _ in range(4))
         
     def get_log_style(self, record):
-        if "Scraped restaurant:" in record.msg:
+        if "Scraped restaurant:" in record.getMessage():
             return "success"
         elif "ERROR" in record.levelname:
             return "error"
@@ -118,31 +140,55 @@ class MatrixStreamlitHandler(logging.Handler):
             return "warning"
         return ""
         
+    def format_entry(self, record):
+        """The terminal line for ``record``, as kept in the buffer."""
+        msg = self.format(record)
+        matrix_prefix = self.get_matrix_effect()
+        log_style = self.get_log_style(record)
+
+        return (
+            f'<div class="matrix-log {log_style}">'
+            f'<span class="matrix-glow">[{matrix_prefix}]</span> {msg}'
+            f'</div>'
+        )
+
+    def add_entries(self, entries):
+        """Append already formatted lines, redrawing if the refresh interval has passed."""
+        with self._render_lock:
+            self.logs.extend(entries)
+            self._dirty = True
+            if self._last_render is None or time.monotonic() - self._last_render >= self.refresh_interval:
+                self._render()
+
     def emit(self, record):
         try:
-            msg = self.format(record)
-            matrix_prefix = self.get_matrix_effect()
-            log_style = self.get_log_style(record)
-            
-            log_entry = (
-                f'<div class="matrix-log {log_style}">'
-                f'<span class="matrix-glow">[{matrix_prefix}]</span> {msg}'
-                f'</div>'
-            )
-            
-            self.logs.append(log_entry)
-            
-            log_html = f"""
+            self.add_entries([self.format_entry(record)])
+        except Exception:
+            self.handleError(record)
+
+    def _render(self):
+        # Called with _render_lock held
+        log_html = f"""
             <div class="matrix-terminal">
                 {''.join(self.logs)}
             </div>
             """
-            
-            self.terminal_container.markdown(log_html, unsafe_allow_html=True)
-            
-        except Exception as e:
-            print(f"Error in emit: {str(e)}")
-            self.handleError(record)
+        self.terminal_container.markdown(log_html, unsafe_allow_html=True)
+        self._last_render = time.monotonic()
+        self._dirty = False
+
+    def flush(self):
+        """Draw records still waiting for the next refresh."""
+        with self._render_lock:
+            if self._dirty:
+                self._render()
+
+    def clear(self):
+        """Drop all entries and empty the terminal."""
+        with self._render_lock:
+            self.logs.clear()
+            self._dirty = False
+            self.terminal_container.empty()
 
     def log_with_data(self, level, msg, data=None):
         record = logging.LogRecord(
@@ -158,13 +204,27 @@ class MatrixStreamlitHandler(logging.Handler):
             record.data = data
         return record
 
+def _session_key():
+    ctx = get_script_run_ctx()
+    return ctx.session_id if ctx is not None else 'local'
+
 def setup_logger(terminal_container):
-    logger = logging.getLogger('matrix_logger')
-    logger.setLevel(logging.INFO)
-    
-    # Clear any existing handlers
+    """
+    Return this session's terminal logger, writing to ``terminal_container``.
+
+    Each browser session gets its own unregistered logger, kept in
+    ``st.session_state``, so reruns of one session never touch another
+    session's handlers or terminal. Background jobs log through their own
+    queue (see ``utils.jobs``); the session that owns the job formats their
+    records once and keeps the lines for later reruns.
+    """
+    logger = st.session_state.get('matrix_logger')
+    if logger is None:
+        logger = logging.Logger(f'matrix_logger.{_session_key()}', logging.INFO)
+        st.session_state.matrix_logger = logger
+
+    # The terminal container is recreated on every rerun
     logger.handlers = []
-    
     matrix_handler = MatrixStreamlitHandler(terminal_container)
     formatter = logging.Formatter(
         fmt='%(asctime)s - %(levelname)s - %(message)s',
@@ -178,6 +238,18 @@ def setup_logger(terminal_container):
     
     return logger
 
+def get_matrix_handler(logger):
+    """The terminal handler behind ``logger``."""
+    for handler in logger.handlers:
+        if isinstance(handler, MatrixStreamlitHandler):
+            return handler
+    return None
+
+def flush_terminal(logger):
+    handler = get_matrix_handler(logger)
+    if handler is not None:
+        handler.flush()
+
 def matrix_loading_effect(message, duration=0.05):
     """Creates a Matrix-style loading effect"""
     chars = "ABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789@#$%^&*"
@@ -199,17 +271,74 @@ def matrix_loading_effect(message, duration=0.05):
     """, unsafe_allow_html=True)
     return msg_placeholder
 
-class ScrapingState:
-    def __init__(self):
-        self.is_running = False
-
-    def start(self):
-        self.is_running = True
+def _scrape_platform(platform, area_info, selected_area, logger, scraping_state,
+                     force_refresh=False, freshness=None):
+    def publish_page(page, records):
+        # Feeds the live results table while the scrape goes on
+        scraping_state.publish({'platform': platform, 'page': page, 'records': records})
 
-    def stop(self):
-        self.is_running = False
+    if platform == "Noon":
+        if not area_info['noon_name']:
+            logger.warning(f"Area '{selected_area}' not available on Noon")
+            return []
 
-def scraping_process(selected_area, platforms, logger, scraping_state):
+        logger_message = f"Starting Noon scraping for {area_info['noon_name']}..."
+        scrape = scrape_noon_food
+    else:
+        if not area_info['talabat_code']:
+            logger.warning(f"Area '{selected_area}' not available on Talabat")
+            return []
+
+        logger_message = f"Starting Talabat scraping for {area_info['noon_name']} ({area_info['talabat_code']})..."
+        scrape = scrape_talabat
+
+    stats = {}
+
+    def fetch():
+        logger.info(logger_message)
+        records = list(scrape(
+            area_info['key'], stats=stats, should_stop=scraping_state.should_stop, on_page=publish_page
+        ))
+        # The scrapers return [] on failure; tell that apart from an empty listing
+        if stats.get('error'):
+            raise RuntimeError(stats['error'])
+        return records
+
+    # Partial results, from a terminated scrape or one that skipped failed pages, are not cached
+    result = get_result_cache().get_or_fetch(
+        area_info['key'], platform, fetch, force=force_refresh, should_stop=scraping_state.should_stop,
+        is_partial=lambda records: stats.get('pages_failed', 0) > 0
+    )
+    label = describe_freshness(result)
+    if freshness is not None:
+        freshness[platform] = label
+    if result['source'] == CACHED:
+        logger.info(f"Using {label} {platform} results for {area_info['noon_name']}")
+    elif result['source'] == SHARED and not result['partial']:
+        logger.info(f"Joined a {platform} scrape already running for {area_info['noon_name']}")
+    if result['partial'] and stats.get('pages_failed'):
+        logger.warning(f"{platform} scrape for {area_info['noon_name']} skipped {stats['pages_failed']} "
+                       f"page(s) that failed to load; results are partial")
+    elif result['partial']:
+        logger.warning(f"{platform} scrape for {area_info['noon_name']} was stopped early; results are partial")
+    if result['source'] != FRESH:
+        for page, records in groupby(result['records'], key=lambda record: record.get('page')):
+            publish_page(page, list(records))
+    return result['records']
+
+def scraping_process(selected_area, platforms, logger, scraping_state, force_refresh=False, freshness=None):
+    """
+    Scrape the selected platforms at the same time and return their results.
+
+    Each platform runs in its own thread, so the total time is that of the
+    slower platform. A failure on one platform is logged and leaves the
+    other platform's results intact.
+
+    ``scraping_state`` is the running ``utils.jobs.Job``; its ``should_stop``
+    is checked by the scrapers before every page. Results come from the
+    shared result cache unless ``force_refresh``; ``freshness`` is filled
+    with a 'fresh' / 'cached (age)' label per platform.
+    """
     try:
         # Validate area first
         area_info = AreaMapping.get_area_info(selected_area)
@@ -220,57 +349,134 @@ def scraping_process(selected_area, platforms, logger, scraping_state):
                 logger.info(f"Did you mean one of these? {', '.join(suggestions)}")
             return [], []
 
-        noon_results = []
-        talabat_results = []
-
-        if "Noon" in platforms and scraping_state.is_running:
-            if area_info['noon_name']:
-                logger.info(f"Starting Noon scraping for {area_info['noon_name']}...")
-                noon_results = list(scrape_noon_food(area_info['noon_name']))
-            else:
-                logger.warning(f"Area '{selected_area}' not available on Noon")
-
-        if "Talabat" in platforms and scraping_state.is_running:
-            if area_info['talabat_code']:
-                logger.info(f"Starting Talabat scraping for {area_info['noon_name']}...")
-                talabat_results = list(scrape_talabat(area_info['talabat_code']))
-            else:
-                logger.warning(f"Area '{selected_area}' not available on Talabat")
+        selected = [p for p in ("Noon", "Talabat") if p in platforms]
+        if not selected or not scraping_state.is_running:
+            return [], []
 
-        return noon_results, talabat_results
+        results = {platform: [] for platform in selected}
+        with ThreadPoolExecutor(max_workers=len(selected), thread_name_prefix="scraper") as executor:
+            futures = {
+                executor.submit(
+                    _scrape_platform, platform, area_info, selected_area, logger, scraping_state,
+                    force_refresh, freshness
+                ): platform
+                for platform in selected
+            }
+            for future in as_completed(futures):
+                platform = futures[future]
+                try:
+                    results[platform] = future.result()
+                    logger.info(f"{platform} finished with {len(results[platform])} restaurants")
+                except Exception as e:
+                    logger.error(f"Error during {platform} scraping: {str(e)}")
+
+        return results.get("Noon", []), results.get("Talabat", [])
 
     except Exception as e:
         logger.error(f"Error during scraping: {str(e)}")
         return [], []
 
-def export_to_csv(noon_results, talabat_results):
-    # Create buffer
-    buffer = io.StringIO()
-    
-    # Convert results to dataframes
-    if noon_results:
-        noon_df = pd.DataFrame(noon_results)
-        noon_df['Source'] = 'Noon'
-    else:
-        noon_df = pd.DataFrame()
-        
-    if talabat_results:
-        talabat_df = pd.DataFrame(talabat_results)
-        talabat_df['Source'] = 'Talabat'
-    else:
-        talabat_df = pd.DataFrame()
+def run_scrape_job(job, selected_area, platforms, force_refresh=False):
+    """Job target: scrape in the background, logging to the job's progress queue."""
+    job.logger.info("Matrix connection established")
+    job.logger.info("Accessing restaurant database...")
+    job.logger.info(f"Selected area: {selected_area}")
+    job.logger.info(f"Selected platforms: {', '.join(platforms)}")
+    job.info['freshness'] = {}
+    return scraping_process(
+        selected_area, platforms, job.logger, job,
+        force_refresh=force_refresh, freshness=job.info['freshness']
+    )
+
+def show_job_progress(job, logger):
+    """Move the job's new log lines and scraped pages into the session."""
+    job_log = st.session_state.setdefault('job_log', deque(maxlen=LOG_MAX_ENTRIES))
+    matrix_handler = get_matrix_handler(logger)
+    entries = [matrix_handler.format_entry(record) for record in job.drain()]
+    job_log.extend(entries)
+    matrix_handler.add_entries(entries)
+
+    live_rows = st.session_state.setdefault('live_rows', [])
+    for update in job.drain_updates():
+        live_rows.extend(update['records'])
+
+def show_page_table(rows):
+    """Restaurants scraped so far, with counts per platform and page."""
+    if not rows:
+        st.info("Waiting for the first page...")
+        return
+    df = pd.DataFrame(rows)
+    counts = df.groupby(['platform', 'page']).size().unstack(fill_value=0)
+    counts['total'] = counts.sum(axis=1)
+    st.dataframe(counts)
+    st.dataframe(df)
+
+def _memoized(name, key, compute):
+    """``compute()`` once per ``key``; the last value is kept in the session under ``name``."""
+    if key is None:
+        return compute()
+    cached = st.session_state.get(name)
+    if cached is None or cached[0] != key:
+        cached = (key, compute())
+        st.session_state[name] = cached
+    return cached[1]
+
+def show_results(noon_results, talabat_results, logger, results_key=None):
+    """
+    Comparison, details and export tabs for a finished scrape.
+
+    The comparison and the export file are built once per ``results_key``
+    (the job id) and export format, not on every rerun of the page.
+    """
+    def compare():
+        logger.info("Processing results...")
+        return compare_restaurants(noon_results, talabat_results) if noon_results and talabat_results else None
+
+    comparison = _memoized('comparison', results_key, compare)
     
-    # Combine results
-    combined_df = pd.concat([noon_df, talabat_df], ignore_index=True)
+    # Create tabs for different views
+    tab1, tab2, tab3 = st.tabs(["Comparison Table", "Details", "Export"])
+
+    with tab1:
+        if comparison is None:
+            st.info("Scrape both platforms to compare them.")
+        elif comparison['matched'].empty:
+            st.info("No matched restaurants found.")
+        else:
+            st.dataframe(comparison['matched'])
+
+    with tab2:
+        show_page_table(noon_results + talabat_results)
     
-    # Save to buffer
-    combined_df.to_csv(buffer, index=False)
-    return buffer.getvalue()
+    with tab3:
+        st.subheader("📥 Export Data")
+        export_format = st.selectbox(
+            "Format", FORMATS,
+            format_func=lambda fmt: {'csv': 'CSV', 'parquet': 'Parquet', 'xlsx': 'Excel (one sheet per table)'}[fmt]
+        )
+        
+        # Build the file in the chosen format
+        try:
+            export_data = _memoized(
+                'export_data', (results_key, export_format),
+                lambda: export_bytes(export_format, noon_results, talabat_results, comparison)
+            )
+        except RuntimeError as e:
+            st.error(str(e))
+            return
+        
+        # Add download button
+        st.download_button(
+            label=f"⬇️ Download {export_format.upper()} Report",
+            data=export_data,
+            file_name=f"restaurant_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}{EXTENSIONS[export_format]}",
+            mime=MIME_TYPES[export_format]
+        )
+        
+        # Show success message
+        st.success(f"{export_format.upper()} file is ready for download!")
 
 def main():
-    if 'scraping_state' not in st.session_state:
-        st.session_state.scraping_state = ScrapingState()
-    
     st.set_page_config(page_title="UAE Restaurant Scraper", layout="wide")
     
     # Matrix-style title
@@ -288,6 +494,15 @@ def main():
     logger.info("Matrix terminal initialized")
     logger.info("System ready for scraping")
 
+    # Show the current job's log lines, then pick up its new progress
+    jobs = get_job_manager()
+    job = jobs.get(st.session_state.get('job_id'))
+    get_matrix_handler(logger).add_entries(st.session_state.get('job_log', ()))
+    if job is not None:
+        show_job_progress(job, logger)
+    flush_terminal(logger)
+    job_active = job is not None and not job.finished
+
     # Get all UAE areas
     all_areas = get_all_uae_areas()
     
@@ -314,83 +529,73 @@ def main():
             options=["Noon", "Talabat"],
             default=["Noon", "Talabat"]
         )
+        force_refresh = st.checkbox(
+            "Force refresh",
+            help="Scrape again even if recent results for this area are cached"
+        )
 
     # Create columns for Matrix-themed control buttons
     control_col1, control_col2, control_col3 = st.columns([1, 1, 2])
 
     with control_col1:
-        start_button = st.button("▶ INITIALIZE", type="primary", 
-                               disabled=st.session_state.scraping_state.is_running)
+        start_button = st.button("▶ INITIALIZE", type="primary", disabled=job_active)
 
     with control_col2:
         stop_button = st.button("⬛ TERMINATE", type="secondary",
-                              disabled=not st.session_state.scraping_state.is_running)
+                              disabled=not job_active or job.should_stop())
 
     with control_col3:
-        clear_button = st.button("⌧ CLEAR LOGS", type="secondary",
-                               disabled=st.session_state.scraping_state.is_running)
+        clear_button = st.button("⌧ CLEAR LOGS", type="secondary", disabled=job_active)
 
     if clear_button:
-        logger.handlers[0].logs = []
-        terminal_container.empty()
+        st.session_state.pop('job_log', None)
+        matrix_handler = get_matrix_handler(logger)
+        if matrix_handler is not None:
+            matrix_handler.clear()
 
     if stop_button:
         logger.warning("TERMINATING SCRAPING SEQUENCE...")
-        st.session_state.scraping_state.stop()
-        st.session_state.scraping_state = ScrapingState()  # Reset the state
-        time.sleep(1)
+        jobs.cancel(job.id)
         st.rerun()
 
     if start_button:
-        st.session_state.scraping_state.start()
         matrix_loading_effect("INITIALIZING SCRAPING SEQUENCE...")
-        
-        if not st.session_state.scraping_state.is_running:
-            return
-            
-        logger.info("Matrix connection established")
-        if not st.session_state.scraping_state.is_running:
-            return
-            
-        logger.info("Accessing restaurant database...")
-        logger.info(f"Selected area: {selected_area}")
-        logger.info(f"Selected platforms: {', '.join(platforms)}")
+        st.session_state.job_log = deque(maxlen=LOG_MAX_ENTRIES)
+        st.session_state.live_rows = []
+        job = jobs.submit(selected_area, run_scrape_job, selected_area, platforms, force_refresh)
+        st.session_state.job_id = job.id
+        st.rerun()
 
-        noon_results, talabat_results = scraping_process(
-            selected_area, platforms, logger, st.session_state.scraping_state
-        )
+    if job_active:
+        # Poll the job; only this session's script waits, and button clicks
+        # are picked up within one poll interval
+        status = "Stopping after the current page..." if job.should_stop() else f"Scraping {job.name}..."
+        st.caption(f"{status} (job {job.id})")
+        st.subheader("📡 Live Results")
+        show_page_table(st.session_state.get('live_rows', []))
+        time.sleep(JOB_POLL_SECONDS)
+        st.rerun()
 
-        if not noon_results and not talabat_results:
-            logger.warning("No results found or scraping was interrupted")
-            st.session_state.scraping_state.stop()
-            st.rerun()
-            return
+    if job is None:
+        return
+
+    if job.status == FAILED:
+        st.error(f"Scraping failed: {job.error}")
+        return
+
+    noon_results, talabat_results = job.result or ([], [])
+    if not noon_results and not talabat_results:
+        logger.warning("No results found or scraping was interrupted")
+        flush_terminal(logger)
+        return
+
+    freshness = job.info.get('freshness', {})
+    if freshness:
+        st.caption(" | ".join(f"{platform}: {label}" for platform, label in freshness.items()))
 
-        # Process results (rest of your existing results processing code)
-        if noon_results or talabat_results:
-            logger.info("Processing results...")
-            
-            # Create tabs for different views
-            tab1, tab2, tab3 = st.tabs(["Comparison Table", "Details", "Export"])
-            
-            with tab3:
-                st.subheader("📥 Export Data")
-                
-                # Create CSV file
-                csv_data = export_to_csv(noon_results, talabat_results)
-                
-                # Add download button
-                st.download_button(
-                    label="⬇️ Download CSV Report",
-                    data=csv_data,
-                    file_name=f"restaurant_data_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                    mime="text/csv"
-                )
-                
-                # Show success message
-                st.success("CSV file is ready for download!")
-
-        st.session_state.scraping_state.stop()
+    # Process results (rest of your existing results processing code)
+    show_results(noon_results, talabat_results, logger, results_key=job.id)
+    flush_terminal(logger)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
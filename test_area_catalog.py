@@ -0,0 +1,44 @@
+# test_area_catalog.py
+
+from scraping.area_catalog import AREAS, resolve_area
+from scraping.area_data import get_area_info
+from scraping.area_mapping import AreaMapping
+from scraping.area_suggest import AreaSuggester
+
+
+def test_every_alias_resolves_to_its_own_area():
+    for key, area in AREAS.items():
+        for alias in [key, area['noon_name'], area['talabat_code']] + area['aliases']:
+            assert resolve_area(alias)['key'] == key, alias
+
+
+def test_both_lookups_agree():
+    for area_input in ['Kalba', 'kalba-city', 'AL-FASEEL', 'alfaseel', '3866', 'Fujairah City', 'ام القيوين']:
+        talabat_side = get_area_info(area_input)
+        noon_side = AreaMapping.get_area_info(area_input)
+        assert talabat_side == noon_side
+        assert talabat_side['is_valid']
+        assert talabat_side['talabat_code'] == AreaMapping.TALABAT_CODES[talabat_side['key']]
+        assert talabat_side['noon_name'] == AreaMapping.NOON_NAMES[talabat_side['key']]
+
+    unknown = get_area_info('Dubai Marina')
+    assert not unknown['is_valid'] and unknown['talabat_code'] is None and unknown['noon_name'] is None
+
+
+def test_suggest_areas_ranks_prefixes_then_typos():
+    assert AreaMapping.suggest_areas('ras') == ['Ras Al Khaimah City', 'Al Rashidiya']
+    assert AreaMapping.suggest_areas('nahda') == ['Al Nahda Sharjah']
+    assert AreaMapping.suggest_areas('khorfakan') == ['Khorfakkan']
+    assert AreaMapping.suggest_areas('الفصيل') == ['Al Faseel']
+    assert len(AreaMapping.suggest_areas('al', limit=3)) == 3
+    assert AreaMapping.suggest_areas('') == []
+
+    areas = {f'area_{i}': {'noon_name': f'Area {i}', 'aliases': []} for i in range(2000)}
+    assert AreaSuggester(areas).suggest('area 1999') == ['Area 1999']
+
+
+if __name__ == "__main__":
+    test_every_alias_resolves_to_its_own_area()
+    test_both_lookups_agree()
+    test_suggest_areas_ranks_prefixes_then_typos()
+    print("Area catalogue tests passed.")
@@ -0,0 +1,40 @@
+# test_browser_profile.py
+
+from config.config import BROWSER_PROFILE
+from scraping.browser_profile import blocked_url_patterns, build_options
+
+
+def test_default_profile_loads_pages_fully():
+    assert BROWSER_PROFILE == 'default'
+
+    for browser in ('chrome', 'firefox'):
+        options = build_options(browser)
+        assert options.page_load_strategy == 'normal'
+        assert '--headless' in options.arguments
+    assert 'prefs' not in build_options('chrome').experimental_options
+    assert 'permissions.default.image' not in build_options('firefox').preferences
+
+
+def test_lean_profile_skips_heavy_resources():
+    chrome = build_options('chrome', 'lean')
+    assert chrome.page_load_strategy == 'eager'
+    prefs = chrome.experimental_options['prefs']
+    assert prefs['profile.managed_default_content_settings.images'] == 2
+    assert 'profile.managed_default_content_settings.stylesheets' not in prefs
+    assert 'profile.managed_default_content_settings.stylesheets' in (
+        build_options('chrome', 'lean', block_css=True).experimental_options['prefs']
+    )
+
+    firefox = build_options('firefox', 'lean')
+    assert firefox.page_load_strategy == 'eager'
+    assert firefox.preferences['permissions.default.image'] == 2
+    assert firefox.preferences['gfx.downloadable_fonts.enabled'] is False
+
+    assert '*.woff2' in blocked_url_patterns() and '*.css' not in blocked_url_patterns()
+    assert '*.css' in blocked_url_patterns(block_css=True)
+
+
+if __name__ == "__main__":
+    test_default_profile_loads_pages_fully()
+    test_lean_profile_skips_heavy_resources()
+    print("Browser profile tests passed.")
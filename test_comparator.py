@@ -0,0 +1,222 @@
+# test_comparator.py
+
+import os
+import random
+import string
+import tempfile
+
+from processing.blocking import blocking_recall
+from processing.comparator import compare_restaurants
+from processing.match_store import MatchStore
+from processing.normalization import normalization_cache_info, normalize_name
+from processing.streaming import StreamingComparator
+from utils.helpers import fuzzy_match
+
+NOON_DATA = [
+    {'name': 'KFC', 'offer': '20% off', 'platform': 'Noon', 'page': 1},
+    {'name': 'Pizza Hut', 'offer': 'No Offer', 'platform': 'Noon', 'page': 1},
+    {'name': 'Shawarma Station', 'offer': 'Free delivery', 'platform': 'Noon', 'page': 1},
+    {'name': 'Al Fanar Restaurant', 'offer': 'No Offer', 'platform': 'Noon', 'page': 2},
+    {'name': 'Burger Kingg', 'offer': 'AED 10 off', 'platform': 'Noon', 'page': 2},
+]
+
+TALABAT_DATA = [
+    {'name': 'Pizza Hut', 'offer': 'Free delivery', 'platform': 'Talabat', 'page': 1},
+    {'name': 'KFC', 'offer': 'No Offer', 'platform': 'Talabat', 'page': 1},
+    {'name': 'Burger King', 'offer': '30% off', 'platform': 'Talabat', 'page': 1},
+    {'name': 'Operation Falafel', 'offer': 'No Offer', 'platform': 'Talabat', 'page': 2},
+]
+
+
+def test_compare_restaurants_matches_per_row_fuzzy_match():
+    results = compare_restaurants(NOON_DATA, TALABAT_DATA, threshold=90, normalize=False)
+
+    talabat_names = [r['name'] for r in TALABAT_DATA]
+    expected = []
+    for restaurant in NOON_DATA:
+        match, score = fuzzy_match(restaurant['name'], talabat_names, 90)
+        if match:
+            expected.append((restaurant['name'], match, round(score, 3)))
+
+    matched = results['matched']
+    assert [
+        (row.name_noon, row.name_talabat, round(row.similarity, 3)) for row in matched.itertuples()
+    ] == expected
+    assert matched.loc[matched['name_noon'] == 'Burger Kingg', 'offer_talabat'].item() == '30% off'
+    assert results['noon_only']['name_noon'].tolist() == ['Shawarma Station', 'Al Fanar Restaurant']
+    assert results['talabat_only']['name_talabat'].tolist() == ['Operation Falafel']
+
+
+def test_compare_restaurants_with_empty_side():
+    results = compare_restaurants(NOON_DATA, [])
+
+    assert results['matched'].empty
+    assert len(results['noon_only']) == len(NOON_DATA)
+    assert results['talabat_only'].empty
+
+
+def test_compare_restaurants_assignment_is_one_to_one():
+    noon = [
+        {'name': 'KFC', 'offer': 'No Offer'},
+        {'name': 'KFC', 'offer': '20% off'},
+        {'name': 'Pizza Hutt', 'offer': 'No Offer'},
+        {'name': 'Pizza Hut', 'offer': 'Free delivery'},
+    ]
+    talabat = [
+        {'name': 'Pizza Hut', 'offer': 'No Offer'},
+        {'name': 'KFC', 'offer': 'A'},
+        {'name': 'KFC', 'offer': 'B'},
+    ]
+
+    greedy = compare_restaurants(noon, talabat, threshold=90)
+    assignment = compare_restaurants(noon, talabat, threshold=90, method='assignment')
+
+    # Greedy hands the first KFC and Pizza Hut to every similar Noon row
+    assert greedy['matched']['offer_talabat'].tolist() == ['A', 'A', 'No Offer', 'No Offer']
+    assert greedy['talabat_only'].empty
+
+    matched = assignment['matched']
+    assert sorted(matched['offer_talabat']) == ['A', 'B', 'No Offer']
+    # The exact name wins the single Pizza Hut over the typo
+    assert matched.loc[matched['name_talabat'] == 'Pizza Hut', 'offer_noon'].item() == 'Free delivery'
+    assert assignment['noon_only']['name_noon'].tolist() == ['Pizza Hutt']
+    assert assignment['talabat_only'].empty
+
+
+def test_blocking_matches_dense_comparison():
+    for method in ('greedy', 'assignment'):
+        dense = compare_restaurants(NOON_DATA, TALABAT_DATA, threshold=80, method=method)
+        stats = {}
+        blocked = compare_restaurants(NOON_DATA, TALABAT_DATA, threshold=80, method=method, blocking=True, stats=stats)
+
+        assert blocked['matched'].equals(dense['matched'])
+        assert blocked['noon_only'].equals(dense['noon_only'])
+        assert blocked['talabat_only'].equals(dense['talabat_only'])
+        assert 0 < stats['candidate_pairs'] < len(NOON_DATA) * len(TALABAT_DATA)
+
+    names = [r['name'] for r in NOON_DATA]
+    report = blocking_recall(names, [r['name'] for r in TALABAT_DATA], threshold=80)
+    assert report['recall'] == 1.0
+    assert report['pruning_ratio'] > 0
+
+
+def test_normalized_names_match_branches_and_spellings():
+    assert normalize_name('KFC - Kalba') == normalize_name('KFC (Al Majaz)') == 'kfc'
+    assert normalize_name('El-Fanar Restaurant & Cafe') == normalize_name('Al Fanar') == 'al fanar'
+    assert normalize_name('Café Nero') == normalize_name('CAFE NERO')
+
+    noon = [{'name': 'KFC - Kalba', 'offer': '20% off'}, {'name': 'Al Fanar Restaurant', 'offer': 'No Offer'}]
+    talabat = [{'name': 'KFC', 'offer': 'No Offer'}, {'name': 'El Fanar', 'offer': 'Free delivery'}]
+    hits = normalization_cache_info().hits
+
+    matched = compare_restaurants(noon, talabat)['matched']
+    # Output keeps display names; repeated runs reuse the cached keys
+    assert matched['name_talabat'].tolist() == ['KFC', 'El Fanar']
+    assert matched['similarity'].tolist() == [100.0, 100.0]
+    compare_restaurants(noon, talabat)
+    assert normalization_cache_info().hits >= hits + 4
+
+
+def test_match_store_reuses_scores_and_review_flags():
+    dense = compare_restaurants(NOON_DATA, TALABAT_DATA)
+
+    with tempfile.TemporaryDirectory() as tmp, MatchStore(os.path.join(tmp, 'matches.sqlite3')) as store:
+        first, second = {}, {}
+        cold = compare_restaurants(NOON_DATA, TALABAT_DATA, store=store, stats=first)
+        warm = compare_restaurants(NOON_DATA, TALABAT_DATA, store=store, stats=second)
+
+        assert first['scored_pairs'] == len(NOON_DATA) * len(TALABAT_DATA)
+        assert second == {'cached_pairs': first['scored_pairs'], 'scored_pairs': 0}
+        assert cold['matched'].equals(dense['matched']) and warm['matched'].equals(dense['matched'])
+
+        store.set_status('KFC', 'KFC', 'rejected')
+        store.set_status('Al Fanar Restaurant', 'Operation Falafel', 'confirmed')
+        reviewed = compare_restaurants(NOON_DATA, TALABAT_DATA, store=store)['matched']
+
+    pairs = list(zip(reviewed['name_noon'], reviewed['name_talabat']))
+    assert ('KFC', 'KFC') not in pairs
+    assert ('Al Fanar Restaurant', 'Operation Falafel') in pairs
+
+
+def test_match_store_stays_sparse_and_warm_runs_are_cheaper():
+    rng = random.Random(7)
+
+    def random_name():
+        return ' '.join(
+            ''.join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 8))) for _ in range(rng.randint(1, 3))
+        )
+
+    noon = [{'name': random_name(), 'offer': 'No Offer'} for _ in range(300)]
+    talabat = [{'name': r['name'] if rng.random() < 0.5 else random_name(), 'offer': 'No Offer'} for r in noon]
+    dense = compare_restaurants(noon, talabat)
+
+    with tempfile.TemporaryDirectory() as tmp, MatchStore(os.path.join(tmp, 'matches.sqlite3')) as store:
+        runs = []
+        for _ in range(3):
+            stats = {}
+            matched = compare_restaurants(noon, talabat, store=store, stats=stats)['matched']
+            runs.append(stats)
+            assert matched.equals(dense['matched'])
+
+        # Only likely matches are written, not all 90,000 pairs
+        assert len(store) < len(noon) * len(talabat) // 100
+        assert all(stats['scored_pairs'] == 0 for stats in runs[1:])
+
+        # A new name is scored against the Talabat side once, nothing else is
+        stats = {}
+        compare_restaurants(noon + [{'name': 'Brand New Grill', 'offer': 'No Offer'}], talabat, store=store,
+                            stats=stats)
+        assert stats['scored_pairs'] == len({r['name'] for r in talabat})
+
+
+def test_match_store_rescores_blocked_names_for_dense_runs():
+    pairs = len(NOON_DATA) * len(TALABAT_DATA)
+
+    with tempfile.TemporaryDirectory() as tmp, MatchStore(os.path.join(tmp, 'matches.sqlite3')) as store:
+        blocked, dense, again = {}, {}, {}
+        compare_restaurants(NOON_DATA, TALABAT_DATA, blocking=True, store=store, stats=blocked)
+        # Blocking skipped non-candidate pairs, so a dense run cannot trust those names
+        matched = compare_restaurants(NOON_DATA, TALABAT_DATA, store=store, stats=dense)['matched']
+        compare_restaurants(NOON_DATA, TALABAT_DATA, blocking=True, store=store, stats=again)
+
+    assert blocked['scored_pairs'] == pairs and dense == {'cached_pairs': 0, 'scored_pairs': pairs}
+    assert matched.equals(compare_restaurants(NOON_DATA, TALABAT_DATA)['matched'])
+    # Densely scored names are complete for blocked runs too
+    assert again == {'cached_pairs': pairs, 'scored_pairs': 0}
+
+
+def test_streaming_comparator_matches_pages_as_they_arrive():
+    comparator = StreamingComparator(threshold=90)
+
+    first = comparator.add('talabat', TALABAT_DATA[:2])
+    assert [update['type'] for update in first] == ['unmatched', 'unmatched']
+
+    updates = comparator.add('noon', NOON_DATA[:3])
+    assert [(u['noon']['name'], u['talabat']['name']) for u in updates if u['type'] == 'match'] == [
+        ('KFC', 'KFC'), ('Pizza Hut', 'Pizza Hut')
+    ]
+
+    comparator.add('noon', NOON_DATA[3:])
+    comparator.add('talabat', TALABAT_DATA[2:])
+
+    streamed = comparator.finalize()
+    batch = compare_restaurants(NOON_DATA, TALABAT_DATA, method='assignment')
+    key = ['name_noon', 'name_talabat']
+    assert streamed['matched'].sort_values(key).reset_index(drop=True).equals(
+        batch['matched'].sort_values(key).reset_index(drop=True)
+    )
+    assert sorted(streamed['noon_only']['name_noon']) == sorted(batch['noon_only']['name_noon'])
+    assert streamed['talabat_only']['name_talabat'].tolist() == ['Operation Falafel']
+
+
+if __name__ == "__main__":
+    test_compare_restaurants_matches_per_row_fuzzy_match()
+    test_compare_restaurants_with_empty_side()
+    test_compare_restaurants_assignment_is_one_to_one()
+    test_blocking_matches_dense_comparison()
+    test_normalized_names_match_branches_and_spellings()
+    test_match_store_reuses_scores_and_review_flags()
+    test_match_store_stays_sparse_and_warm_runs_are_cheaper()
+    test_match_store_rescores_blocked_names_for_dense_runs()
+    test_streaming_comparator_matches_pages_as_they_arrive()
+    print("Comparator tests passed.")
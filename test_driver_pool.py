@@ -0,0 +1,106 @@
+# test_driver_pool.py
+
+import threading
+import time
+
+from scraping.driver_pool import DriverPool
+
+
+class FakeDriver:
+    """Stands in for a WebDriver; records the calls the pool makes."""
+
+    def __init__(self, browser, profile):
+        self.browser = browser
+        self.profile = profile
+        self.healthy = True
+        self.quit_count = 0
+        self.cookies = {'location': 'kalba'}
+        self.local_storage = {'area': 'kalba'}
+        self.url = 'https://food.noon.com/search'
+
+    def execute_script(self, script, *args):
+        if not self.healthy:
+            raise RuntimeError("browser crashed")
+        if 'localStorage.clear' in script:
+            self.local_storage.clear()
+        return 1
+
+    def delete_all_cookies(self):
+        self.cookies.clear()
+
+    def get(self, url):
+        self.url = url
+
+    def quit(self):
+        self.quit_count += 1
+
+
+def fake_pool(**kwargs):
+    created = []
+
+    def factory(browser, profile):
+        driver = FakeDriver(browser, profile)
+        created.append(driver)
+        return driver
+
+    return DriverPool(factory=factory, **kwargs), created
+
+
+def test_released_drivers_are_reset_and_reused():
+    pool, created = fake_pool(max_browsers=2, max_pages=0)
+
+    first = pool.acquire('chrome')
+    pool.release(first)
+    assert first.cookies == {} and first.local_storage == {} and first.url == 'about:blank'
+
+    assert pool.acquire('chrome') is first
+    pool.release(first, discard=True)
+    assert first.quit_count == 1 and pool.size == 0
+
+    # An unhealthy idle driver is replaced, not handed out
+    second = pool.acquire('chrome')
+    pool.release(second)
+    second.healthy = False
+    third = pool.acquire('chrome')
+    assert third is not second and second.quit_count == 1
+    assert len(created) == 3 and pool.size == 1
+
+
+def test_pool_caps_browsers_evicts_and_recycles():
+    pool, created = fake_pool(max_browsers=1, max_pages=2)
+
+    chrome = pool.acquire('chrome')
+    try:
+        pool.acquire('chrome', timeout=0.05)
+        assert False, "expected the cap to block a second browser"
+    except TimeoutError:
+        pass
+
+    # A waiter gets the driver as soon as it is released
+    got = []
+    waiter = threading.Thread(target=lambda: got.append(pool.acquire('chrome', timeout=5)))
+    waiter.start()
+    time.sleep(0.05)
+    pool.release(chrome)
+    waiter.join()
+    assert got == [chrome]
+
+    # The idle Chrome driver makes room for a Firefox one
+    pool.release(chrome)
+    firefox = pool.acquire('firefox')
+    assert chrome.quit_count == 1 and pool.size == 1
+
+    # Reaching max_pages retires the driver on release
+    pool.note_pages(firefox, 2)
+    pool.release(firefox)
+    assert firefox.quit_count == 1 and pool.size == 0
+
+    pool.release(pool.acquire('chrome'))
+    pool.close()
+    assert all(driver.quit_count == 1 for driver in created)
+
+
+if __name__ == "__main__":
+    test_released_drivers_are_reset_and_reused()
+    test_pool_caps_browsers_evicts_and_recycles()
+    print("Driver pool tests passed.")
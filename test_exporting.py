@@ -0,0 +1,93 @@
+# test_exporting.py
+
+import io
+import os
+import tempfile
+
+import pandas as pd
+import pyarrow.parquet as pq
+from openpyxl import load_workbook
+
+from batch_scrape import canonical_areas, combine_results, write_results
+from exporting.file_exporter import (
+    EXTENSIONS, FORMATS, export_bytes, export_results, read_records, write_parquet, write_records
+)
+from processing.comparator import compare_restaurants
+
+NOON = [{'name': 'KFC', 'offer': '20% off', 'platform': 'Noon', 'page': 1},
+        {'name': 'Shawarma Station', 'offer': 'No Offer', 'platform': 'Noon', 'page': 2}]
+TALABAT = [{'name': 'KFC', 'offer': 'No Offer', 'platform': 'Talabat', 'page': 1}]
+
+
+def test_formats_round_trip_from_a_generator():
+    records = [{'name': f'Restaurant {i}', 'offer': 'No Offer', 'platform': 'Noon', 'page': i // 20 + 1}
+               for i in range(120)]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for fmt in FORMATS:
+            path = os.path.join(tmp, 'restaurants' + EXTENSIONS[fmt])
+            assert write_records((record for record in records), path, fmt) == 120
+            read_back = list(read_records(path))
+            assert [r['name'] for r in read_back] == [r['name'] for r in records]
+            assert int(read_back[-1]['page']) == 6
+
+
+def test_xlsx_export_has_one_sheet_per_table():
+    buffer = io.BytesIO()
+    counts = export_results(buffer, 'xlsx', NOON, TALABAT, compare_restaurants(NOON, TALABAT))
+
+    assert counts == {'Noon': 2, 'Talabat': 1, 'Matched': 1, 'Noon Only': 1, 'Talabat Only': 0}
+    workbook = load_workbook(io.BytesIO(buffer.getvalue()), read_only=True)
+    assert workbook.sheetnames == ['Noon', 'Talabat', 'Matched', 'Noon Only', 'Talabat Only']
+
+    text = io.StringIO()
+    assert export_results(text, 'csv', NOON, TALABAT) == 3
+    assert text.getvalue().splitlines()[0] == 'name,offer,platform,page,Source'
+
+
+def test_batch_results_combine_into_one_dump():
+    with tempfile.TemporaryDirectory() as tmp:
+        summaries = []
+        for platform, records in (('noon', NOON), ('talabat', TALABAT)):
+            path = os.path.join(tmp, platform, 'kalba.parquet')
+            write_results(records, path, 'parquet')
+            summaries.append({'area': 'kalba', 'platform': platform, 'path': path})
+        summaries.append({'area': 'dibba', 'platform': 'noon', 'path': None})
+
+        combined = combine_results(summaries, tmp, 'parquet')
+        assert combined.endswith('all_restaurants.parquet')
+        assert list(read_records(combined)) == NOON + TALABAT
+
+
+def test_batch_areas_resolve_to_one_key_each():
+    areas = canonical_areas(['Al Faseel', 'kalba', 'al_faseel', 'AL-FASEEL', 'Nowhere Town'])
+    assert areas == ['al_faseel', 'kalba', 'nowhere_town']
+
+
+def test_parquet_schema_survives_empty_first_chunk():
+    records = [{'name': 'KFC', 'offer': None, 'page': 1}] * 3 + [{'name': 'Pizza Hut', 'offer': '20% off', 'page': 2}]
+
+    buffer = io.BytesIO()
+    assert write_parquet(iter(records), buffer, chunk_size=2) == 4
+    assert pq.read_table(io.BytesIO(buffer.getvalue())).to_pylist()[-1] == records[-1]
+
+    # A DataFrame's dtypes give the schema up front
+    frame = pd.DataFrame(records).assign(similarity=95.5)
+    buffer = io.BytesIO()
+    write_parquet(frame, buffer, chunk_size=2)
+    table = pq.read_table(io.BytesIO(buffer.getvalue()))
+    assert str(table.schema.field('similarity').type) == 'double'
+    assert table.column('offer').to_pylist() == [None, None, None, '20% off']
+
+    assert export_bytes('csv', [{'name': 'Café Nero', 'offer': 'No Offer', 'platform': 'Noon', 'page': 1}], []) == (
+        'name,offer,platform,page,Source\r\nCafé Nero,No Offer,Noon,1,Noon\r\n'.encode('utf-8')
+    )
+
+
+if __name__ == "__main__":
+    test_formats_round_trip_from_a_generator()
+    test_xlsx_export_has_one_sheet_per_table()
+    test_batch_results_combine_into_one_dump()
+    test_batch_areas_resolve_to_one_key_each()
+    test_parquet_schema_survives_empty_first_chunk()
+    print("Exporter tests passed.")
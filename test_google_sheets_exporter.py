@@ -0,0 +1,86 @@
+# test_google_sheets_exporter.py
+
+import os
+import tempfile
+
+import pandas as pd
+
+from exporting.google_sheets_exporter import FakeSheetsBackend, export_sheets
+
+MATCHED = pd.DataFrame({
+    'name_noon': ['KFC', 'Pizza Hut', 'Burger Kingg'],
+    'name_talabat': ['KFC', 'Pizza Hut', 'Burger King'],
+    'similarity': [100.0, 100.0, 95.7],
+})
+NOON_ONLY = pd.DataFrame({'name_noon': ['Shawarma Station', 'Al Fanar'], 'offer_noon': ['Free delivery', None]})
+
+
+def test_sheets_are_written_in_one_batch_then_diffed():
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, 'manifest.json')
+        backend = FakeSheetsBackend()
+        sheets = {'Matched': MATCHED, 'Noon Only': NOON_ONLY, 'Talabat Only': pd.DataFrame()}
+
+        first = export_sheets(sheets, backend=backend, manifest_path=manifest)
+        # Metadata read, one update adding the sheets, one values update
+        assert first == {'requests': 3, 'rows_written': 5, 'rows_unchanged': 0, 'rows_cleared': 0}
+        assert backend.values('Noon Only') == [['name_noon', 'offer_noon'], ['Shawarma Station', 'Free delivery'],
+                                               ['Al Fanar', '']]
+
+        again = export_sheets(sheets, backend=backend, manifest_path=manifest)
+        assert again == {'requests': 0, 'rows_written': 0, 'rows_unchanged': 5, 'rows_cleared': 0}
+
+        changed = MATCHED.copy()
+        changed.loc[2, 'similarity'] = 91.0
+        sheets['Matched'] = changed
+        sheets['Noon Only'] = NOON_ONLY.head(1)
+        update = export_sheets(sheets, backend=backend, manifest_path=manifest)
+
+    assert update == {'requests': 3, 'rows_written': 1, 'rows_unchanged': 3, 'rows_cleared': 1}
+    assert backend.values('Matched')[3] == ['Burger Kingg', 'Burger King', 91.0]
+    assert backend.values('Noon Only') == [['name_noon', 'offer_noon'], ['Shawarma Station', 'Free delivery']]
+
+
+def test_large_sheets_are_split_across_requests():
+    df = pd.DataFrame({'name': [f'Restaurant {i}' for i in range(100)], 'offer': ['No Offer'] * 100})
+
+    with tempfile.TemporaryDirectory() as tmp:
+        backend = FakeSheetsBackend()
+        stats = export_sheets({'Noon': df}, backend=backend, manifest_path=os.path.join(tmp, 'm.json'),
+                              max_cells_per_request=50)
+
+    # Metadata read and sheet creation, plus 101 rows of 2 cells in pieces of 25 rows
+    assert stats['requests'] == 2 + 5
+    assert len(backend.values('Noon')) == 101
+    assert backend.values('Noon')[-1] == ['Restaurant 99', 'No Offer']
+
+
+def test_existing_sheets_are_grown_to_fit():
+    backend = FakeSheetsBackend()
+    backend.add_sheet('Matched')
+    wide = pd.DataFrame({f'column_{i}': range(1500) for i in range(30)})
+
+    try:
+        backend.batch_update([{'range': "'Matched'!A1", 'values': [list(wide.columns)]}])
+        assert False, "expected 30 columns to exceed the default 26-column grid"
+    except ValueError as e:
+        assert 'exceeds grid limits' in str(e)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manifest = os.path.join(tmp, 'manifest.json')
+        export_sheets({'Matched': wide}, backend=backend, manifest_path=manifest)
+        assert backend.grids['Matched'] == (1501, 30)
+        assert backend.values('Matched')[-1] == [1499] * 30
+
+        # Shrinking clears the old rows but keeps the grid
+        stats = export_sheets({'Matched': wide.head(10)}, backend=backend, manifest_path=manifest)
+
+    assert stats['rows_cleared'] == 1490 and stats['requests'] == 2
+    assert len(backend.values('Matched')) == 11 and backend.grids['Matched'] == (1501, 30)
+
+
+if __name__ == "__main__":
+    test_sheets_are_written_in_one_batch_then_diffed()
+    test_large_sheets_are_split_across_requests()
+    test_existing_sheets_are_grown_to_fit()
+    print("Google Sheets exporter tests passed.")
@@ -0,0 +1,54 @@
+# test_jobs.py
+
+import threading
+import time
+
+from utils.jobs import CANCELLED, DONE, FAILED, JobManager
+
+
+def _wait_finished(job, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished
+
+
+def test_jobs_report_progress_and_cancel_between_pages():
+    manager = JobManager(max_workers=2)
+    started = threading.Event()
+
+    def scrape(job, pages):
+        scraped = []
+        for page in range(1, pages + 1):
+            if job.should_stop():
+                break
+            job.logger.info(f"Scraped page {page}")
+            scraped.append(page)
+            started.set()
+            time.sleep(0.02)
+        return scraped
+
+    job = manager.submit('kalba', scrape, 1000)
+    assert manager.get(job.id) is job
+    assert started.wait(5)
+    assert manager.cancel(job.id)
+    _wait_finished(job)
+
+    assert job.status == CANCELLED
+    assert 0 < len(job.result) < 1000
+    messages = [record.getMessage() for record in job.drain()]
+    assert messages[0] == "Scraped page 1" and len(messages) == len(job.result)
+
+    finished = manager.submit('done', lambda job: 42)
+    failed = manager.submit('broken', lambda job: 1 / 0)
+    _wait_finished(finished)
+    _wait_finished(failed)
+    assert (finished.status, finished.result) == (DONE, 42)
+    assert failed.status == FAILED and 'division' in failed.error
+    assert manager.get('unknown') is None and not manager.cancel('unknown')
+    manager.shutdown()
+
+
+if __name__ == "__main__":
+    test_jobs_report_progress_and_cancel_between_pages()
+    print("Job runner tests passed.")
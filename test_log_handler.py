@@ -0,0 +1,112 @@
+# test_log_handler.py
+
+import logging
+
+from streamlit.testing.v1 import AppTest
+
+from streamlit_app import MatrixStreamlitHandler
+
+
+class FakeContainer:
+    def __init__(self):
+        self.renders = []
+
+    def markdown(self, html, unsafe_allow_html=False):
+        self.renders.append(html)
+
+    def empty(self):
+        self.renders.append('')
+
+
+def test_handler_keeps_a_bounded_buffer_and_throttles_redraws():
+    container = FakeContainer()
+    handler = MatrixStreamlitHandler(container, max_entries=50, refresh_interval=60)
+    logger = logging.getLogger('test_matrix_handler')
+    logger.propagate = False
+    logger.setLevel(logging.INFO)
+    logger.handlers = [handler]
+
+    for i in range(1000):
+        logger.info("Scraped restaurant: %s", f"Restaurant {i}")
+
+    # One draw for the first record, the rest wait for the refresh interval
+    assert len(container.renders) == 1
+    assert len(handler.logs) == 50
+    assert 'Restaurant 999' in handler.logs[-1] and 'success' in handler.logs[-1]
+
+    handler.flush()
+    assert len(container.renders) == 2
+    assert container.renders[-1].count('matrix-log') == 50
+    handler.flush()
+    assert len(container.renders) == 2
+
+    handler.clear()
+    assert len(handler.logs) == 0 and container.renders[-1] == ''
+
+
+def _session_script():
+    import streamlit as st
+    from streamlit_app import get_matrix_handler, setup_logger
+
+    logger = setup_logger(st.empty())
+    logger.info(f"hello from {st.session_state.label}")
+    st.session_state.entries = list(get_matrix_handler(logger).logs)
+
+
+def test_each_session_gets_its_own_terminal_logger():
+    first, second = AppTest.from_function(_session_script), AppTest.from_function(_session_script)
+    first.session_state.label, second.session_state.label = 'first', 'second'
+    first.run()
+    second.run()
+    # A rerun of one session must not take over the other's handlers
+    first.run()
+
+    assert not first.exception and not second.exception
+    assert first.session_state.matrix_logger is not second.session_state.matrix_logger
+    assert len(first.session_state.entries) == len(second.session_state.entries) == 1
+    assert 'hello from first' in first.session_state.entries[0]
+    assert 'hello from second' in second.session_state.entries[0]
+
+
+def _job_log_script():
+    import logging
+    import streamlit as st
+    from streamlit_app import get_matrix_handler, setup_logger, show_job_progress
+
+    class FakeJob:
+        def drain(self):
+            records = st.session_state.pending
+            st.session_state.pending = []
+            return [logging.makeLogRecord({'msg': msg, 'levelno': logging.INFO, 'levelname': 'INFO'})
+                    for msg in records]
+
+        def drain_updates(self):
+            return []
+
+    logger = setup_logger(st.empty())
+    handler = get_matrix_handler(logger)
+    handler.add_entries(st.session_state.get('job_log', ()))
+    show_job_progress(FakeJob(), logger)
+    st.session_state.entries = list(handler.logs)
+
+
+def test_job_log_lines_are_formatted_once():
+    app = AppTest.from_function(_job_log_script)
+    app.session_state.pending = ['page 1 done', 'page 2 done']
+    app.run()
+    first = app.session_state.entries
+    app.run()
+    app.session_state.pending = ['page 3 done']
+    app.run()
+
+    assert not app.exception and len(first) == 2
+    # Reruns show the stored lines, random prefixes and all, instead of formatting the records again
+    assert app.session_state.entries[:2] == first
+    assert 'page 3 done' in app.session_state.entries[2] and len(app.session_state.entries) == 3
+
+
+if __name__ == "__main__":
+    test_handler_keeps_a_bounded_buffer_and_throttles_redraws()
+    test_each_session_gets_its_own_terminal_logger()
+    test_job_log_lines_are_formatted_once()
+    print("Log handler tests passed.")
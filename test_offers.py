@@ -0,0 +1,58 @@
+# test_offers.py
+
+import math
+
+import pandas as pd
+
+from processing.comparator import compare_restaurants
+from processing import offers as offers_module
+from processing.offers import offer_gaps, parse_offers
+
+
+def test_parse_offers_extracts_typed_fields():
+    offers = pd.Series(
+        ['No Offer', '20% off', 'Free delivery', 'AED 10 off on orders above 50', '20% off', None, 'Buy 1 Get 1'],
+        index=[10, 11, 12, 13, 14, 15, 16]
+    )
+    parsed = parse_offers(offers)
+
+    assert parsed.index.tolist() == offers.index.tolist()
+    assert parsed['promo_type'].tolist() == [
+        'none', 'percentage', 'free_delivery', 'flat', 'percentage', 'none', 'bogo'
+    ]
+    assert parsed.loc[11, 'discount_pct'] == 20
+    assert parsed.loc[13, 'flat_amount'] == 10 and parsed.loc[13, 'min_order'] == 50
+    assert parsed['free_delivery'].tolist() == [False, False, True, False, False, False, False]
+    assert math.isnan(parsed.loc[10, 'discount_pct'])
+
+
+def test_offer_gaps_on_matched_restaurants():
+    noon = [{'name': 'KFC', 'offer': '30% off'}, {'name': 'Pizza Hut', 'offer': 'No Offer'}]
+    talabat = [{'name': 'KFC', 'offer': '20% off'}, {'name': 'Pizza Hut', 'offer': 'Free delivery'}]
+
+    gaps = offer_gaps(compare_restaurants(noon, talabat)['matched'])
+
+    assert gaps['discount_gap'].tolist() == [10.0, 0.0]
+    assert gaps['same_promo_type'].tolist() == [True, False]
+    assert offer_gaps(pd.DataFrame()).empty
+
+
+def test_parse_offers_survives_cache_overflow():
+    size = offers_module.OFFER_CACHE_SIZE
+    offers_module.OFFER_CACHE_SIZE = 3
+    try:
+        parse_offers(['20% off', 'No Offer'])
+        # Overflows the cache while '20% off' is still needed from it
+        parsed = parse_offers(['20% off', 'Free delivery', 'AED 10 off', 'Buy 1 Get 1'])
+        assert parsed['promo_type'].tolist() == ['percentage', 'free_delivery', 'flat', 'bogo']
+        assert len(offers_module._cache) <= 3
+        assert parse_offers(['No Offer', '20% off'])['promo_type'].tolist() == ['none', 'percentage']
+    finally:
+        offers_module.OFFER_CACHE_SIZE = size
+
+
+if __name__ == "__main__":
+    test_parse_offers_extracts_typed_fields()
+    test_offer_gaps_on_matched_restaurants()
+    test_parse_offers_survives_cache_overflow()
+    print("Offer parsing tests passed.")
@@ -0,0 +1,124 @@
+# test_result_cache.py
+
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from scraping.pagination import paginate
+from scraping.result_cache import CACHED, FRESH, PARTIAL, SHARED, ResultCache, describe_freshness
+
+RECORDS = [{'name': 'KFC', 'offer': '20% off', 'platform': 'Noon', 'page': 1}]
+
+
+def test_cache_hits_expires_evicts_and_persists():
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = ResultCache(ttl=60, max_entries=2, persist_dir=tmp)
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return RECORDS
+
+        assert cache.get_or_fetch('kalba', 'Noon', fetch)['source'] == FRESH
+        hit = cache.get_or_fetch('kalba', 'noon', fetch)
+        assert hit['source'] == CACHED and hit['records'] == RECORDS and len(calls) == 1
+        assert describe_freshness(hit, now=hit['fetched_at'] + 300) == "cached (5 min old)"
+        assert cache.get_or_fetch('kalba', 'noon', fetch, force=True)['source'] == FRESH
+
+        # Empty results are not cached
+        cache.get_or_fetch('dibba', 'noon', lambda: [])
+        assert cache.get('dibba', 'noon') is None
+
+        # A new process starts warm from disk; expired entries are ignored
+        assert ResultCache(ttl=60, persist_dir=tmp).get('kalba', 'noon')[0] == RECORDS
+        cache.put('mirbah', 'talabat', RECORDS, fetched_at=time.time() - 120)
+        assert cache.get('mirbah', 'talabat') is None
+
+        memory_only = ResultCache(max_entries=2, persist_dir=None)
+        for area in ('a', 'b', 'c'):
+            memory_only.put(area, 'noon', RECORDS)
+        assert memory_only.get('a', 'noon') is None and memory_only.get('c', 'noon') is not None
+
+
+def test_concurrent_requests_share_one_scrape():
+    cache = ResultCache(persist_dir=None)
+    release = threading.Event()
+    calls = []
+
+    def slow_fetch():
+        calls.append(1)
+        release.wait(5)
+        return RECORDS
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        futures = [executor.submit(cache.get_or_fetch, 'kalba', 'talabat', slow_fetch) for _ in range(4)]
+        time.sleep(0.1)
+        release.set()
+        sources = sorted(future.result()['source'] for future in futures)
+
+    assert len(calls) == 1
+    assert sources == [FRESH] + [SHARED] * 3
+
+
+def test_stopped_scrapes_are_partial_and_not_shared():
+    cache = ResultCache(persist_dir=None)
+    started, release = threading.Event(), threading.Event()
+    leader_stop, follower_stop = threading.Event(), threading.Event()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        if len(calls) == 1:
+            started.set()
+            release.wait(5)
+            return [{'name': 'Only page 1 so far', 'offer': 'No Offer', 'platform': 'Noon', 'page': 1}]
+        return RECORDS
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        leader = executor.submit(cache.get_or_fetch, 'kalba', 'noon', fetch, should_stop=leader_stop.is_set)
+        started.wait(5)
+        follower = executor.submit(cache.get_or_fetch, 'kalba', 'noon', fetch, poll_interval=0.01)
+        quitter = executor.submit(
+            cache.get_or_fetch, 'kalba', 'noon', fetch, should_stop=follower_stop.is_set, poll_interval=0.01
+        )
+
+        # A waiting caller honours its own stop request while the leader keeps going
+        follower_stop.set()
+        assert quitter.result(timeout=2) == {'records': [], 'fetched_at': None, 'source': SHARED, 'partial': True}
+
+        leader_stop.set()
+        release.set()
+        stopped = leader.result(timeout=5)
+        assert stopped['partial'] and describe_freshness(stopped) == PARTIAL
+
+        # The other waiter does not inherit the partial records; it scrapes again
+        result = follower.result(timeout=5)
+        assert result['records'] == RECORDS and result['source'] == FRESH and not result['partial']
+
+    assert len(calls) == 2
+    assert cache.get('kalba', 'noon')[0] == RECORDS
+
+
+def test_scrapes_with_failed_pages_are_not_cached():
+    cache = ResultCache(persist_dir=None)
+    listing = {1: RECORDS, 2: None, 3: [{'name': 'Pizza Hut', 'offer': 'No Offer', 'platform': 'Noon', 'page': 3}]}
+    stats = {}
+
+    def fetch():
+        # Page 2 fails to load and is skipped; the walk goes on to page 3
+        return paginate(lambda page: (listing.get(page, []), None), max_pages=26, stats=stats)
+
+    result = cache.get_or_fetch('kalba', 'noon', fetch, is_partial=lambda records: stats['pages_failed'] > 0)
+
+    assert stats['pages_failed'] == 1 and len(result['records']) == 2
+    assert result['partial'] and describe_freshness(result) == PARTIAL
+    assert cache.get('kalba', 'noon') is None
+
+
+if __name__ == "__main__":
+    test_cache_hits_expires_evicts_and_persists()
+    test_concurrent_requests_share_one_scrape()
+    test_stopped_scrapes_are_partial_and_not_shared()
+    test_scrapes_with_failed_pages_are_not_cached()
+    print("Result cache tests passed.")
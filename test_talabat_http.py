@@ -0,0 +1,176 @@
+# test_talabat_http.py
+
+import os
+import threading
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+from concurrent.futures import ThreadPoolExecutor
+
+from scraping.pagination import find_last_page, iter_pages, paginate
+from scraping.talabat_scraper import scrape_talabat
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'talabat')
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Serve saved Talabat listing pages, one fixture per ?page=N."""
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        page = parse_qs(url.query).get('page', ['1'])[0]
+        path = os.path.join(FIXTURES_DIR, f"page_{page}.html")
+        if not os.path.exists(path):
+            path = os.path.join(FIXTURES_DIR, 'empty.html')
+
+        with open(path, 'rb') as f:
+            body = f.read()
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve_fixtures():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_scrape_talabat_http():
+    server = serve_fixtures()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}/uae/restaurants"
+        stats = {}
+        restaurants = scrape_talabat(
+            'al_faseel', max_pages=5, engine='http', base_url=base_url, stats=stats
+        )
+    finally:
+        server.shutdown()
+
+    # The pagination control on page 1 reports 2 pages; the empty page 3 ends the walk
+    assert stats['last_page'] == 2
+    assert stats['pages_fetched'] == 3
+    assert stats['pages_skipped'] == 2
+    assert [p['page'] for p in stats['pages']] == [1, 2, 3]
+    assert stats['bytes_transferred'] == sum(p['bytes'] for p in stats['pages']) > 0
+    assert [r['name'] for r in restaurants] == [
+        'KFC', 'Al Fanar Restaurant & Cafe', 'Pizza Hut', 'Shawarma Station', 'Burger King'
+    ]
+    assert restaurants[0] == {
+        'name': 'KFC', 'offer': '20% off selected items', 'platform': 'Talabat', 'page': 1
+    }
+    assert restaurants[1]['offer'] == 'No Offer'
+    assert restaurants[3]['offer'] == 'AED 10 off on orders above 50'
+    assert restaurants[4]['offer'] == 'No Offer'
+    assert {r['page'] for r in restaurants} == {1, 2}
+
+
+def test_scrape_talabat_http_concurrent_keeps_page_order():
+    server = serve_fixtures()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}/uae/restaurants"
+        sequential = scrape_talabat('al_faseel', max_pages=5, engine='http', base_url=base_url)
+        concurrent = scrape_talabat(
+            'al_faseel', max_pages=5, engine='http', base_url=base_url, concurrency=3
+        )
+    finally:
+        server.shutdown()
+
+    assert concurrent == sequential
+
+
+def test_scrape_talabat_streams_pages():
+    server = serve_fixtures()
+    try:
+        base_url = f"http://127.0.0.1:{server.server_port}/uae/restaurants"
+        expected = scrape_talabat('al_faseel', max_pages=5, engine='http', base_url=base_url)
+
+        seen = []
+        returned = scrape_talabat(
+            'al_faseel', max_pages=5, engine='http', base_url=base_url,
+            on_page=lambda page, records: seen.append((page, len(records))), keep_records=False
+        )
+        streamed = list(iter_pages(scrape_talabat, 'al_faseel', max_pages=5, engine='http', base_url=base_url))
+    finally:
+        server.shutdown()
+
+    assert returned == []
+    assert seen == [(1, 3), (2, 2)]
+    assert [page for page, _ in streamed] == [1, 2]
+    assert [record for _, records in streamed for record in records] == expected
+
+
+def test_paginate_stops_on_repeated_page():
+    listing = {
+        1: [{'name': 'KFC', 'offer': 'No Offer'}],
+        2: [{'name': 'Pizza Hut', 'offer': 'No Offer'}],
+    }
+    requested = []
+
+    def fetch_page(page):
+        requested.append(page)
+        # Past the end, the site keeps serving its last page
+        return listing.get(page, listing[2]), None
+
+    stats = {}
+    restaurants = paginate(fetch_page, max_pages=26, stats=stats)
+
+    assert [r['name'] for r in restaurants] == ['KFC', 'Pizza Hut']
+    assert requested == [1, 2, 3]
+    assert stats['pages_skipped'] == 23
+
+
+def test_page_count_is_a_hint_not_a_limit():
+    windowed = """
+        <a href="/offers?page=40">Offers</a>
+        <nav aria-label="Pagination"><a href="?page=1">1</a><a href="?page=2">2</a><a href="?page=3">3</a></nav>
+        <script id="__NEXT_DATA__" type="application/json">
+            {"props": {"vendors": [{"name": "KFC", "totalCount": 900}]}}
+        </script>
+    """
+    # Links outside the pager and counts outside the paging object are ignored
+    assert find_last_page(windowed, page_size=10) == 3
+    paged = '<script id="__NEXT_DATA__">{"props": {"pagination": {"totalVendors": 45}}}</script>'
+    assert find_last_page(paged, page_size=10) == 5
+
+    listing = {page: [{'name': f'Restaurant {page}', 'offer': 'No Offer'}] for page in range(1, 6)}
+    requested = []
+
+    def fetch_page(page):
+        requested.append(page)
+        # The windowed pager only shows 3 of the 5 pages
+        return listing.get(page, []), 3 if page == 1 else None
+
+    for executor in (None, ThreadPoolExecutor(max_workers=2)):
+        requested.clear()
+        restaurants = paginate(fetch_page, max_pages=26, concurrency=2, executor=executor)
+        assert len(restaurants) == 5
+        assert sorted(requested) == [1, 2, 3, 4, 5, 6]
+
+
+def test_failed_scrapes_are_reported_not_streamed_as_empty():
+    stats = {}
+    assert scrape_talabat('atlantis', engine='http', stats=stats) == []
+    assert stats['error'] == "Invalid area: atlantis"
+
+    try:
+        list(iter_pages(scrape_talabat, 'atlantis', engine='http'))
+        assert False, "expected the failed scrape to raise"
+    except RuntimeError as e:
+        assert str(e) == "Invalid area: atlantis"
+
+
+if __name__ == "__main__":
+    test_scrape_talabat_http()
+    test_scrape_talabat_http_concurrent_keeps_page_order()
+    test_scrape_talabat_streams_pages()
+    test_paginate_stops_on_repeated_page()
+    test_page_count_is_a_hint_not_a_limit()
+    test_failed_scrapes_are_reported_not_streamed_as_empty()
+    print("Talabat HTTP engine test passed.")
@@ -0,0 +1,175 @@
+# utils/jobs.py
+
+import atexit
+import logging
+import queue
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from logging.handlers import QueueHandler
+
+from config.config import JOB_MAX_WORKERS, JOB_RETENTION_SECONDS
+
+PENDING = 'pending'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED = (DONE, FAILED, CANCELLED)
+
+
+class Job:
+    """
+    A unit of background work with a status, a result and a cancel flag.
+
+    The target reports progress through ``job.logger``; its records land on
+    the thread-safe ``progress`` queue for the UI to ``drain``. Partial
+    results go through ``publish`` / ``drain_updates`` the same way. Cancellation
+    is cooperative: the target passes ``job.should_stop`` down to the
+    scrapers, which check it before every page.
+    """
+
+    def __init__(self, name):
+        self.id = uuid.uuid4().hex[:12]
+        self.name = name
+        self.status = PENDING
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        # Extra details the target wants to show next to the result
+        self.info = {}
+        self.progress = queue.SimpleQueue()
+        self.updates = queue.SimpleQueue()
+        self._cancel = threading.Event()
+
+        # Not registered with logging.getLogger, so finished jobs are not kept alive
+        self.logger = logging.Logger(f"jobs.{self.id}", logging.INFO)
+        self.logger.addHandler(QueueHandler(self.progress))
+
+    @property
+    def finished(self):
+        return self.status in FINISHED
+
+    @property
+    def is_running(self):
+        return not self.finished and not self._cancel.is_set()
+
+    def should_stop(self):
+        return self._cancel.is_set()
+
+    def cancel(self):
+        self._cancel.set()
+
+    def publish(self, update):
+        """Hand a partial result (e.g. one scraped page) to the UI."""
+        self.updates.put(update)
+
+    def drain(self, max_items=1000):
+        """Take up to ``max_items`` progress records without blocking."""
+        return _drain(self.progress, max_items)
+
+    def drain_updates(self, max_items=1000):
+        """Take up to ``max_items`` published updates without blocking."""
+        return _drain(self.updates, max_items)
+
+
+def _drain(items, max_items):
+    drained = []
+    while len(drained) < max_items:
+        try:
+            drained.append(items.get_nowait())
+        except queue.Empty:
+            break
+    return drained
+
+
+class JobManager:
+    """
+    Runs jobs on a shared thread pool and looks them up by id.
+
+    Finished jobs are kept for ``retention`` seconds so a session that
+    reruns later can still collect the result.
+    """
+
+    def __init__(self, max_workers=JOB_MAX_WORKERS, retention=JOB_RETENTION_SECONDS):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, name, target, *args, **kwargs):
+        """
+        Start ``target(job, *args, **kwargs)`` in the background.
+
+        Returns:
+            Job: The new job; keep ``job.id`` to look it up later.
+        """
+        job = Job(name)
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        self._executor.submit(self._run, job, target, args, kwargs)
+        return job
+
+    def _run(self, job, target, args, kwargs):
+        if job.should_stop():
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            return
+
+        job.status = RUNNING
+        try:
+            job.result = target(job, *args, **kwargs)
+            job.status = CANCELLED if job.should_stop() else DONE
+        except Exception as e:
+            job.error = str(e)
+            job.status = FAILED
+            job.logger.error(f"Job {job.name} failed: {e}")
+            logging.exception(f"Job {job.id} ({job.name}) failed")
+        finally:
+            job.finished_at = time.time()
+
+    def _prune(self):
+        # Called with _lock held
+        cutoff = time.time() - self.retention
+        expired = [job_id for job_id, job in self._jobs.items() if job.finished and job.finished_at < cutoff]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        """The job with this id, or None if unknown or expired."""
+        if job_id is None:
+            return None
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        """Ask a job to stop at its next check; returns False for unknown jobs."""
+        job = self.get(job_id)
+        if job is None:
+            return False
+        job.cancel()
+        return True
+
+    def shutdown(self):
+        with self._lock:
+            jobs = list(self._jobs.values())
+        for job in jobs:
+            job.cancel()
+        self._executor.shutdown(wait=False)
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Process-wide job manager, shared by all Streamlit sessions."""
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = JobManager()
+            atexit.register(_manager.shutdown)
+        return _manager